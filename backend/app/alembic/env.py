@@ -22,6 +22,15 @@ from backend.app.models import SQLModel
 
 target_metadata = SQLModel.metadata # 수정
 
+
+def include_object(object, name, type_, reflected, compare_to):
+    # 모델 밖(DDL 이벤트)에서 만드는 전문 검색 인덱스/FTS5 테이블은 autogenerate 비교에서 뺀다
+    if type_ == "table" and name.startswith("audio_fts"):
+        return False
+    if type_ == "index" and name == "ix_audio_text_fulltext":
+        return False
+    return True
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -44,6 +53,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +77,7 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata, include_object=include_object
         )
 
         with context.begin_transaction():
@@ -0,0 +1,28 @@
+"""add audio status
+
+Revision ID: 5c1e8f2a9d47
+Revises: 037335864013
+Create Date: 2026-10-18 10:12:41.208113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f2a9d47'
+down_revision: Union[str, None] = '037335864013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 행은 모두 처리 완료된 상태
+    op.add_column('audio', sa.Column('status', sqlmodel.sql.sqltypes.AutoString(length=16), nullable=False, server_default='done'))
+
+
+def downgrade() -> None:
+    op.drop_column('audio', 'status')
@@ -0,0 +1,27 @@
+"""add audio owner_id, id index
+
+Revision ID: 9b3f6d0c2e18
+Revises: 5c1e8f2a9d47
+Create Date: 2026-10-18 11:03:27.551920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b3f6d0c2e18'
+down_revision: Union[str, None] = '5c1e8f2a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audio_owner_id_id', 'audio', ['owner_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audio_owner_id_id', table_name='audio')
@@ -0,0 +1,47 @@
+"""add audio text fulltext index
+
+Revision ID: a3f9c61d2b74
+Revises: e7c2a4b18f53
+Create Date: 2026-10-18 15:40:12.204731
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3f9c61d2b74'
+down_revision: Union[str, None] = 'e7c2a4b18f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        # 한국어 검색: ngram parser (기존 행도 인덱스 생성 시 함께 색인된다)
+        op.execute("CREATE FULLTEXT INDEX ix_audio_text_fulltext ON audio (text) WITH PARSER ngram")
+    elif dialect == 'sqlite':
+        op.execute("CREATE VIRTUAL TABLE audio_fts USING fts5(text, content='audio', content_rowid='id', tokenize='trigram')")
+        op.execute("CREATE TRIGGER audio_fts_ai AFTER INSERT ON audio BEGIN "
+                   "INSERT INTO audio_fts(rowid, text) VALUES (new.id, new.text); END")
+        op.execute("CREATE TRIGGER audio_fts_ad AFTER DELETE ON audio BEGIN "
+                   "INSERT INTO audio_fts(audio_fts, rowid, text) VALUES ('delete', old.id, old.text); END")
+        op.execute("CREATE TRIGGER audio_fts_au AFTER UPDATE OF text ON audio BEGIN "
+                   "INSERT INTO audio_fts(audio_fts, rowid, text) VALUES ('delete', old.id, old.text); "
+                   "INSERT INTO audio_fts(rowid, text) VALUES (new.id, new.text); END")
+        op.execute("INSERT INTO audio_fts(audio_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'mysql':
+        op.drop_index('ix_audio_text_fulltext', table_name='audio')
+    elif dialect == 'sqlite':
+        op.execute("DROP TRIGGER IF EXISTS audio_fts_au")
+        op.execute("DROP TRIGGER IF EXISTS audio_fts_ad")
+        op.execute("DROP TRIGGER IF EXISTS audio_fts_ai")
+        op.execute("DROP TABLE IF EXISTS audio_fts")
@@ -0,0 +1,30 @@
+"""add audio recorded
+
+Revision ID: c58e0b7a3d91
+Revises: a3f9c61d2b74
+Create Date: 2026-10-18 16:12:40.518264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c58e0b7a3d91'
+down_revision: Union[str, None] = 'a3f9c61d2b74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 기존 행은 녹음 여부를 알 수 없으므로 False (ref 음성 조회는 최신 몇 개 행의 파일을 확인하는 방식으로 대체)
+    op.add_column('audio', sa.Column('recorded', sa.Boolean(), nullable=False, server_default=sa.false()))
+    op.create_index('ix_audio_owner_id_recorded_id', 'audio', ['owner_id', 'recorded', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audio_owner_id_recorded_id', table_name='audio')
+    op.drop_column('audio', 'recorded')
@@ -0,0 +1,27 @@
+"""add audio owner_id, create_date, id index
+
+Revision ID: d41a7e95b630
+Revises: 9b3f6d0c2e18
+Create Date: 2026-10-18 13:40:09.734152
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd41a7e95b630'
+down_revision: Union[str, None] = '9b3f6d0c2e18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audio_owner_id_create_date_id', 'audio', ['owner_id', 'create_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audio_owner_id_create_date_id', table_name='audio')
@@ -0,0 +1,27 @@
+"""add audio processed_filepath index
+
+Revision ID: e7c2a4b18f53
+Revises: d41a7e95b630
+Create Date: 2026-10-18 15:05:41.318907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel # 추가
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7c2a4b18f53'
+down_revision: Union[str, None] = 'd41a7e95b630'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_audio_processed_filepath', 'audio', ['processed_filepath'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_audio_processed_filepath', table_name='audio')
@@ -1,11 +1,12 @@
+import time
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Query
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
+from jose import jwt, JWTError
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.orm import Session, sessionmaker, make_transient_to_detached
 from starlette import status
 from sqlmodel import Session as SQLModelSession
 
@@ -37,13 +38,26 @@ TokenDep = Annotated[str, Depends(reusable_oauth2)]
 OptionalTokenDep = Annotated[str, Depends(optional_reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def resolve_user(session: Session, token: str) -> User:
+    """
+    access token -> User. 최근에 확인한 토큰이면 DB 조회 없이 캐시된 스냅샷을 세션에 붙여 반환한다.
+    스냅샷에는 hashed_password를 넣지 않는다(필요한 곳에서 읽으면 그때 DB에서 불러온다).
+    캐시는 워커별이므로 다른 워커에서 비밀번호 변경/탈퇴한 경우 최대 AUTH_CACHE_TTL 동안 이전 상태가 보일 수 있다.
+    """
+    cached = security.user_cache.get(token)
+    if cached is not None and cached[0] > time.time():
+        # 조회 없이 persistent 상태로 만들어 두면 수정/삭제도 그대로 동작한다(스냅샷에 없는 속성은 expired 상태)
+        user = User(**cached[1])
+        make_transient_to_detached(user)
+        session.add(user)
+        return user
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+    except (InvalidTokenError, ValidationError, JWTError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
@@ -51,29 +65,21 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
     user = session.get(User, token_data.sub)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    security.user_cache.set(token, (payload["exp"], user.model_dump(exclude={"hashed_password"})))
     return user
 
 
+def get_current_user(session: SessionDep, token: TokenDep) -> User:
+    return resolve_user(session, token)
+
+
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
 def get_current_user_or_none(session: SessionDep, token: OptionalTokenDep) -> User | None:
     if token:
-        try:
-            payload = jwt.decode(
-                token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-            )
-            token_data = TokenPayload(**payload)
-        except (InvalidTokenError, ValidationError):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Could not validate credentials",
-            )
-        user = session.get(User, token_data.sub)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        return user
+        return resolve_user(session, token)
     return None
 
 
-OptionalCurrentUser = Annotated[User | None, Depends(get_current_user_or_none)]
\ No newline at end of file
+OptionalCurrentUser = Annotated[User | None, Depends(get_current_user_or_none)]
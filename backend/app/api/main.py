@@ -1,12 +1,13 @@
 from fastapi import APIRouter
 
 from backend.app.api.routes import audio
-from backend.app.api.routes import users, login
+from backend.app.api.routes import users, login, metrics
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(audio.router, tags=["audio"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["metrics"])
 
 
 # from sqlmodel import SQLModel
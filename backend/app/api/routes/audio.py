@@ -1,18 +1,43 @@
+import asyncio
+import json
+import mimetypes
 import os
+from contextlib import AsyncExitStack
 from datetime import datetime
-from typing import Any, Annotated
+from functools import partial
+from pathlib import Path
+from typing import Any, Annotated, AsyncIterator, Literal
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, Form
-from sqlmodel import select, col
-from starlette.responses import FileResponse
+import anyio
+import soundfile as sf
+from fastapi import (
+    APIRouter, UploadFile, File, HTTPException, Form, Query, Request, Response, WebSocket, WebSocketDisconnect
+)
+from sqlmodel import Session
+from starlette import status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import FileResponse, StreamingResponse
 
-from backend.app.api.dependencies import SessionDep, OptionalCurrentUser
+from backend.app import crud
+from backend.app.api.dependencies import SessionDep, CurrentUser, OptionalCurrentUser, SessionLocal, resolve_user
 from backend.app.core.config import settings
-from backend.app.models import AudioPublic, Audio
+from backend.app.core.metrics import span
+from backend.app.models import AudioPublic, Audio, AudioBatchCreate, AudioStatus, User
 from backend.app.utils import utils
-from backend.app.utils.api_client import send_tts_request, send_stt_tts_request
+from backend.app.utils.api_client import AIServerUnavailable, ai_client, send_tts_request, send_stt_tts_request
+from backend.app.utils.jobs import audio_jobs
+from backend.app.utils.media import file_response
+from backend.app.utils.normalize import audio_normalizer
+from backend.app.utils.rate_limit import audio_rate_limiter
+from backend.app.utils.ref_audio import RefAudio, get_user_ref_audio, invalidate_user_ref_audio
+from backend.app.utils.speech_stream import SpeechSegmenter, write_pcm_wav, concat_wav, fix_wav_header
+from backend.app.utils.storage import storage, schedule_persist
+from backend.app.utils.transcode import FORMATS, transcoder, schedule_preencode
+from backend.app.utils.tts_cache import tts_cache
+from backend.app.utils.voice_registry import voice_registry
 
 router = APIRouter()
+logger = utils.get_logger(__name__)
 
 
 @router.get("/")
@@ -20,83 +45,667 @@ def index():
     return FileResponse("frontend/build/index.html")
 
 
+def resolve_ref_audio(session: Session, user: User) -> RefAudio:
+    """
+    current_user의 가장 최근 음성을 ref로 쓴다. 만약 없다면 기본 ref
+    """
+    with span("ref_lookup"):
+        ref_audio = get_user_ref_audio(session, user.id)
+        if ref_audio is None:
+            ref_audio = utils.get_default_ref_audio(user)
+    return ref_audio
+
+
+async def synthesize_with_ref(ref_audio: RefAudio, input_text: str, processed_file_path: str) -> str:
+    """
+    주어진 ref 음성으로 TTS 요청, 처리된 파일 경로 반환
+    """
+    # 같은 텍스트 + 같은 ref 음성으로 합성한 적이 있으면 그 결과를 재사용
+    cache_key = tts_cache.make_key(input_text, ref_audio.digest) if settings.TTS_CACHE_ENABLED else None
+    if cache_key:
+        cached_file_path = tts_cache.get(cache_key)
+        if cached_file_path:
+            return cached_file_path
+
+    # AI 모델 서버로 TTS API 요청 보내기 (등록된 ref면 파일 대신 voice_id만 보낸다)
+    data = {'text': input_text, 'output_path': processed_file_path}
+    with span("ai_call"):
+        result = await voice_registry.send(ref_audio, lambda file, ref_data: send_tts_request(
+            settings.AI_REQUEST_URL, file, {**data, **ref_data}))
+    # fallback(기본 음성) 결과는 캐시하지 않는다
+    if cache_key and not result.get("fallback"):
+        tts_cache.put(cache_key, result["file_path"])
+    return result["file_path"]
+
+
+async def synthesize_text(session: Session, user: User, input_text: str, processed_file_path: str) -> str:
+    """
+    text input: user의 음성을 ref로 TTS 요청, 처리된 파일 경로 반환
+    """
+    ref_audio = await run_in_threadpool(resolve_ref_audio, session, user)
+    return await synthesize_with_ref(ref_audio, input_text, processed_file_path)
+
+
+async def transcribe_and_synthesize(original_file_path: str, filename: str, content_type: str,
+                                    processed_file_path: str) -> tuple[str, str]:
+    """
+    audio input: STT + TTS 요청, (인식된 텍스트, 처리된 파일 경로) 반환
+    저장된 원본 파일을 multipart body로 청크 단위 스트리밍한다.
+    """
+    audio_file = await run_in_threadpool(open, original_file_path, "rb")
+    with audio_file:
+        files = {'file': (filename, audio_file, content_type)}
+        data = {'output_path': processed_file_path}
+        with span("ai_call"):
+            result = await send_stt_tts_request(settings.AI_REQUEST_URL, files, data)
+    return result["stt_result"]["text"], result["tts_result"]["file_path"]
+
+
+async def _read_file_chunks(path: str) -> AsyncIterator[bytes]:
+    with await run_in_threadpool(open, path, "rb") as f:
+        while chunk := await run_in_threadpool(f.read, settings.MEDIA_STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+async def synthesize_chunks(ref_audio: RefAudio, input_text: str, processed_file_path: str,
+                            result: dict) -> AsyncIterator[bytes]:
+    """
+    TTS 결과를 AI 서버가 만들어 내는 대로 내보내면서 processed 파일에도 쓴다(tee).
+    캐시 결과, AI 서버가 스트리밍을 지원하지 않는 경우(JSON 응답), fallback 결과는 완성된 파일을 읽어 내보낸다.
+    끝까지 내보내면 result["file_path"]에 최종 파일 경로를 넣는다.
+    """
+    cache_key = tts_cache.make_key(input_text, ref_audio.digest) if settings.TTS_CACHE_ENABLED else None
+    file_path = tts_cache.get(cache_key) if cache_key else None
+
+    if file_path is None:
+        data = {'text': input_text, 'output_path': processed_file_path, 'stream': 'true'}
+        try:
+            async with AsyncExitStack() as stack:
+                response = await voice_registry.send(ref_audio, lambda file, ref_data: stack.enter_async_context(
+                    ai_client.stream(f"{settings.AI_REQUEST_URL}/tts", files=file, data={**data, **ref_data})))
+                if response.headers.get("content-type", "").startswith("application/json"):
+                    file_path = json.loads(await response.aread())["file_path"]
+                    if cache_key:
+                        tts_cache.put(cache_key, file_path)
+                else:
+                    # 다 받기 전에는 임시 파일에 쓰고, 끝나면 헤더 크기를 고쳐 rename
+                    tmp_path = f"{processed_file_path}.{utils.generate_uuid()[:8]}.tmp"
+                    try:
+                        with await run_in_threadpool(open, tmp_path, "wb") as f:
+                            async for chunk in response.aiter_bytes():
+                                await run_in_threadpool(f.write, chunk)
+                                yield chunk
+                        await run_in_threadpool(fix_wav_header, tmp_path)
+                        await run_in_threadpool(os.replace, tmp_path, processed_file_path)
+                    finally:
+                        if os.path.exists(tmp_path):
+                            os.remove(tmp_path)
+                    if cache_key:
+                        tts_cache.put(cache_key, processed_file_path)
+                    result["file_path"] = processed_file_path
+                    return
+        except AIServerUnavailable:
+            if not settings.AI_FALLBACK_ENABLED:
+                raise
+            file_path = await synthesize_with_ref(ref_audio, input_text, processed_file_path)
+
+    async for chunk in _read_file_chunks(file_path):
+        yield chunk
+    result["file_path"] = file_path
+
+
+async def stream_synthesized_audio(session: Session, user: User, input_text: str, audio_row: Audio) -> Response:
+    """
+    POST /audio?stream=true: 합성된 음성을 chunked 응답으로 바로 보낸다.
+    Audio 행은 running으로 먼저 저장하고(identifier는 X-Audio-Identifier 헤더), 전송이 끝나면 done / failed로 갱신한다.
+    """
+    ref_audio = await run_in_threadpool(resolve_ref_audio, session, user)
+    await run_in_threadpool(_save_audio, session, audio_row)
+    crud.invalidate_audio_count(audio_row.owner_id)
+
+    result = {}
+    chunks = synthesize_chunks(ref_audio, input_text, audio_row.processed_filepath, result)
+    try:
+        # 첫 청크까지 받아 본 뒤 응답을 시작한다: AI 서버 장애는 일반 오류 응답(503 등)으로 보낸다
+        first_chunk = await anext(chunks)
+    except Exception as e:
+        await chunks.aclose()
+        await run_in_threadpool(_save_batch_results, [{
+            "identifier": audio_row.identifier, "status": AudioStatus.failed,
+            "processed_filepath": audio_row.processed_filepath}])
+        if isinstance(e, HTTPException):
+            raise
+        raise HTTPException(status_code=500, detail=f"audio processing failed: {str(e)}")
+
+    async def body():
+        # 응답 스트리밍 중에는 요청 세션이 이미 닫혀 있으므로 DB 작업은 별도 세션으로
+        try:
+            yield first_chunk
+            async for chunk in chunks:
+                yield chunk
+        finally:
+            await chunks.aclose()
+            status = AudioStatus.done if "file_path" in result else AudioStatus.failed
+            processed_file_path = result.get("file_path", audio_row.processed_filepath)
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(_save_batch_results, [{
+                    "identifier": audio_row.identifier, "status": status,
+                    "processed_filepath": processed_file_path}])
+            if status == AudioStatus.done:
+                on_audio_done(audio_row.original_filepath, processed_file_path)
+
+    return StreamingResponse(body(), media_type="audio/wav", headers={"X-Audio-Identifier": audio_row.identifier})
+
+
+def _save_audio(session: Session, audio: Audio) -> None:
+    # commit 후 refresh까지 스레드에서 끝내서 이벤트 루프에서 속성을 읽을 때 lazy load(DB 조회)가 없게 한다
+    session.add(audio)
+    session.commit()
+    session.refresh(audio)
+
+
+def _remove_temp_file(path: str) -> None:
+    # 저장소에 올리지 않는 작업용 파일(로컬에만 있음)
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def on_audio_done(original_file_path: str, processed_file_path: str) -> None:
+    # 처리가 끝난 파일: 저장소 업로드 + 압축 포맷 미리 변환 (둘 다 백그라운드)
+    schedule_persist(original_file_path, processed_file_path)
+    schedule_preencode(processed_file_path)
+
+
+async def process_audio_job(audio_id: int, filename: str | None, content_type: str | None,
+                            input_file_path: str | None = None) -> None:
+    """
+    백그라운드 워커에서 실행: 대기 중인 Audio 행을 처리하고 상태를 갱신한다.
+    input_file_path: AI 서버로 보낼 전처리된 음성(임시 파일, 처리 후 삭제). 없으면 원본을 보낸다.
+    """
+    with SessionLocal() as session:
+        audio = await run_in_threadpool(session.get, Audio, audio_id)
+        audio.status = AudioStatus.running
+        await run_in_threadpool(_save_audio, session, audio)
+
+        try:
+            if filename is not None:
+                audio.text, audio.processed_filepath = await transcribe_and_synthesize(
+                    input_file_path or audio.original_filepath, filename, content_type, audio.processed_filepath)
+            elif audio.owner_id is not None:
+                owner = await run_in_threadpool(session.get, User, audio.owner_id)
+                audio.processed_filepath = await synthesize_text(
+                    session, owner, audio.text, audio.processed_filepath)
+            audio.status = AudioStatus.done
+            crud.invalidate_audio_count(audio.owner_id)
+            if filename is not None:
+                invalidate_user_ref_audio(audio.owner_id)
+            on_audio_done(audio.original_filepath, audio.processed_filepath)
+        except (Exception, asyncio.CancelledError):
+            # 서버 종료로 취소된 경우도 failed로 남겨서 클라이언트가 running을 계속 기다리지 않게 한다
+            audio.status = AudioStatus.failed
+            raise
+        finally:
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(_save_audio, session, audio)
+                if input_file_path:
+                    await run_in_threadpool(_remove_temp_file, input_file_path)
+
+
+async def cancel_audio_job(audio_id: int, input_file_path: str | None = None) -> None:
+    """
+    서버 종료로 시작하지 못한 작업: queued 행을 failed로 바꾸고 임시 파일을 지운다.
+    """
+    with SessionLocal() as session:
+        await run_in_threadpool(crud.fail_unfinished_audio, session=session, audio_id=audio_id)
+    if input_file_path:
+        await run_in_threadpool(_remove_temp_file, input_file_path)
+
+
+async def normalize_upload(original_file_path: str, filename: str | None,
+                           content_type: str | None) -> tuple[str | None, str | None, str | None]:
+    """
+    업로드 음성을 AI 모델 입력 형식(mono, AUDIO_TARGET_SAMPLE_RATE wav, 앞뒤 무음 제거)으로 바꾼 임시 파일을 만들고
+    AI 서버로 보낼 (임시 파일 경로, 파일 이름, content type)을 반환한다. 말소리가 없거나 너무 길면 400.
+    원본은 사용자의 녹음(다음 TTS의 ref 음성)이므로 그대로 둔다.
+    soundfile로 읽을 수 없는 형식은 임시 파일 없이(None) 원본을 그대로 보낸다.
+    """
+    input_file_path = f"{original_file_path.removesuffix('_original.wav')}_input.wav"
+    result = await audio_normalizer.normalize(original_file_path, input_file_path)
+    if result.status == "unsupported":
+        logger.info(f"normalize skipped (unsupported format): {content_type}")
+        return None, filename, content_type
+    if result.status == "empty":
+        await storage.delete(original_file_path)
+        raise HTTPException(status_code=400, detail="음성이 감지되지 않았습니다.")
+    if result.status == "too_long":
+        await storage.delete(original_file_path)
+        raise HTTPException(status_code=400, detail=f"음성은 최대 {settings.AUDIO_MAX_SECONDS:g}초까지 가능합니다.")
+    return input_file_path, f"{os.path.splitext(filename or 'audio')[0]}.wav", "audio/wav"
+
+
 @router.post("/audio", response_model=AudioPublic)
 async def create_audio(
     *,
     session:        SessionDep,
     current_user:   OptionalCurrentUser,
+    request:        Request,
+    response:       Response,
     input_text:     Annotated[str | None, Form()] = None,
-    audio:          Annotated[UploadFile | None, File()] = None
+    audio:          Annotated[UploadFile | None, File()] = None,
+    background:     Annotated[bool, Query()] = False,
+    stream:         Annotated[bool, Query()] = False
 ) -> Any:
     """
     Create new audio.
+
+    background=true 이면 업로드만 저장하고 바로 identifier를 반환한다(202).
+    처리 상태는 GET /audio/{identifier}의 status로 확인한다.
+    stream=true 이면(로그인 사용자의 텍스트 입력만) 합성된 wav를 만들어지는 대로 chunked 응답으로 보낸다.
     """
     if not input_text and not audio:
         raise HTTPException(status_code=400, detail="텍스트 혹은 음성 둘 중 하나를 입력해주세요.")
     if input_text and audio:
         raise HTTPException(status_code=400, detail="텍스트 혹은 음성 둘 중 하나만 입력해주세요.")
+    if stream and (audio or not current_user or background):
+        raise HTTPException(status_code=400, detail="stream은 로그인 사용자의 텍스트 입력에서만 사용할 수 있습니다.")
+
+    # 사용자/IP별 한도, AI 서버 대기열이 가득 찼으면 파일 저장 전에 429
+    await audio_rate_limiter.check(request, current_user)
+    if not background:
+        ai_client.admit()
 
     create_date = datetime.now()
-    file_paths = utils.create_file_path(create_date)
-    original_file_path = str(file_paths["original_file_path"])
-    processed_file_path = str(file_paths["processed_file_path"])
-
-    if input_text and current_user:
-        # text input: ref 음성 추출
-        # current_user의 가장 최근 음성을 ref로 쓴다. 만약 없다면 기본 ref
-        statement = select(Audio).where(Audio.owner_id == current_user.id).order_by(col(Audio.id).desc())
-        ref_audio_path = session.exec(statement).first()
-        if ref_audio_path:
-            with open(ref_audio_path, "rb") as file:
-                ref_audio = file.read()
-        else:
-            ref_audio = utils.get_default_ref_audio(current_user)
-
-        # text input: AI 모델 서버로 TTS API 요청 보내기
-        try:
-            file = {'file': (audio.filename, ref_audio, audio.content_type)}
-            data = {'text': input_text, 'output_path': processed_file_path}
-            result = send_tts_request(settings.AI_REQUEST_URL, file, data)
-            processed_file_path = result["file_path"]
+    identifier = utils.generate_uuid()
+    original_file_path, processed_file_path = await run_in_threadpool(storage.allocate, identifier)
+
+    if stream:
+        return await stream_synthesized_audio(session, current_user, input_text, Audio.model_validate({
+            "text":                 input_text,
+            "original_filepath":    original_file_path,
+            "processed_filepath":   processed_file_path,
+            "create_date":          create_date,
+            "identifier":           identifier,
+            "status":               AudioStatus.running
+        }, update={"owner_id": current_user.id}))
 
+    filename, content_type = (audio.filename, audio.content_type) if audio else (None, None)
+    input_file_path = None  # AI 서버로 보낼 전처리된 음성 (임시 파일)
+    if audio:
+        try:
+            # audio input: 원본 wav 저장 (청크 단위 스트리밍)
+            with span("file_save"):
+                await storage.save_upload(audio, original_file_path)
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"audio processing failed: {str(e)}")
 
-    if audio:
+        if settings.AUDIO_NORMALIZE_ENABLED:
+            input_file_path, filename, content_type = await normalize_upload(
+                original_file_path, filename, content_type)
+
+    if background:
+        audio_row = Audio.model_validate({
+            "text":                 input_text or "",
+            "original_filepath":    original_file_path,
+            "processed_filepath":   processed_file_path,
+            "create_date":          create_date,
+            "identifier":           identifier,
+            "status":               AudioStatus.queued,
+            "recorded":             audio is not None
+        }, update={"owner_id": current_user.id if current_user else None})
+        await run_in_threadpool(_save_audio, session, audio_row)
+        crud.invalidate_audio_count(audio_row.owner_id)
+
+        job = partial(process_audio_job, audio_row.id, filename, content_type, input_file_path)
         try:
-            # audio input: 원본 wav 저장
-            audio_data = await audio.read()
-            with open(original_file_path, "wb") as f:
-                f.write(audio_data)
+            audio_jobs.submit(job, on_cancel=partial(cancel_audio_job, audio_row.id, input_file_path))
+        except asyncio.QueueFull:
+            if input_file_path:
+                await run_in_threadpool(_remove_temp_file, input_file_path)
+            audio_row.status = AudioStatus.failed
+            await run_in_threadpool(_save_audio, session, audio_row)
+            raise HTTPException(status_code=503, detail="요청이 많아 잠시 후 다시 시도해주세요.",
+                                headers={"Retry-After": "5"})
+        response.status_code = 202
+        return audio_row
 
+    try:
+        if input_text and current_user:
+            # text input: ref 음성으로 TTS
+            processed_file_path = await synthesize_text(session, current_user, input_text, processed_file_path)
+
+        if audio:
             # audio input: AI 모델 서버로 STT + TTS 요청 보내기
-            files = {'file': (audio.filename, audio_data, audio.content_type)}
-            data = {'output_path': processed_file_path}
-            result = send_stt_tts_request(settings.AI_REQUEST_URL, files, data)
-            input_text = result["stt_result"]["text"]
-            processed_file_path = result["tts_result"]["file_path"]
+            input_text, processed_file_path = await transcribe_and_synthesize(
+                input_file_path or original_file_path, filename, content_type, processed_file_path)
 
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"audio processing failed: {str(e)}")
+    except HTTPException:
+        # AI 서버 장애(503/504 + Retry-After)는 그대로 전달
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"audio processing failed: {str(e)}")
+    finally:
+        if input_file_path:
+            await run_in_threadpool(_remove_temp_file, input_file_path)
 
     audio_data = Audio.model_validate({
         "text":                 input_text,
         "original_filepath":    original_file_path,
         "processed_filepath":   processed_file_path,
         "create_date":          create_date,
-        "identifier":           utils.generate_uuid()
+        "identifier":           identifier,
+        "recorded":             audio is not None
     }, update={"owner_id": current_user.id if current_user else None})
-    session.add(audio_data)
-    session.commit()
-    session.refresh(audio_data)
+    with span("db_commit"):
+        await run_in_threadpool(_save_audio, session, audio_data)
+    crud.invalidate_audio_count(audio_data.owner_id)
+    if audio:
+        # 새 녹음이 다음 TTS의 ref가 된다
+        invalidate_user_ref_audio(audio_data.owner_id)
+    on_audio_done(audio_data.original_filepath, audio_data.processed_filepath)
     return audio_data
 
 
+@router.post("/audio/batch")
+async def create_audio_batch(
+    *,
+    session:        SessionDep,
+    current_user:   CurrentUser,
+    request:        Request,
+    batch:          AudioBatchCreate
+) -> Any:
+    """
+    Create audios from multiple texts.
+
+    ref 음성은 한 번만 조회하고, 모든 행을 한 번에 INSERT(status=queued)한 뒤
+    AI 서버 요청은 배치당 AUDIO_BATCH_CONCURRENCY개씩 동시에 보낸다.
+    응답은 NDJSON 스트림으로, 끝나는 순서대로 {"index", "identifier", "status"}를 한 줄씩 내보낸다.
+    """
+    texts = [text.strip() for text in batch.texts]
+    # 요청 제한을 켜면 burst를 넘는 배치는 기다려도 통과할 수 없으므로 최대 개수를 burst로 맞춘다
+    max_items = settings.AUDIO_BATCH_MAX_ITEMS
+    burst = audio_rate_limiter.max_cost(request, current_user)
+    if burst is not None:
+        max_items = min(max_items, burst)
+    if len(texts) > max_items:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {max_items}개까지 요청할 수 있습니다.")
+    if not all(texts):
+        raise HTTPException(status_code=400, detail="빈 텍스트는 요청할 수 없습니다.")
+
+    await audio_rate_limiter.check(request, current_user, cost=len(texts))
+    ai_client.admit()
+
+    ref_audio = await run_in_threadpool(resolve_ref_audio, session, current_user)
+
+    create_date = datetime.now()
+    identifiers = [utils.generate_uuid() for _ in texts]
+    all_file_paths = await run_in_threadpool(lambda: [storage.allocate(identifier) for identifier in identifiers])
+    rows = []
+    for text, identifier, file_paths in zip(texts, identifiers, all_file_paths):
+        rows.append({
+            "text":                 text,
+            "original_filepath":    file_paths.original,
+            "processed_filepath":   file_paths.processed,
+            "create_date":          create_date,
+            "identifier":           identifier,
+            "status":               AudioStatus.queued,
+            "owner_id":             current_user.id
+        })
+    with span("db_commit"):
+        await run_in_threadpool(crud.bulk_create_audios, session=session, rows=rows)
+    crud.invalidate_audio_count(current_user.id)
+
+    semaphore = asyncio.Semaphore(settings.AUDIO_BATCH_CONCURRENCY)
+
+    async def run_item(index: int, row: dict) -> tuple[int, str, str]:
+        async with semaphore:
+            try:
+                return index, AudioStatus.done, await synthesize_with_ref(
+                    ref_audio, row["text"], row["processed_filepath"])
+            except Exception:
+                logger.exception(f"batch item failed: {row['identifier']}")
+                return index, AudioStatus.failed, row["processed_filepath"]
+
+    async def stream_results():
+        # 응답 스트리밍 중에는 요청 세션이 이미 닫혀 있으므로 DB 작업은 별도 세션으로
+        results = {}
+        tasks = [asyncio.create_task(run_item(index, row)) for index, row in enumerate(rows)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, status, processed_file_path = await next_done
+                results[index] = (status, processed_file_path)
+                if status == AudioStatus.done:
+                    on_audio_done(rows[index]["original_filepath"], processed_file_path)
+                yield json.dumps({"index": index, "identifier": rows[index]["identifier"], "status": status}) + "\n"
+        finally:
+            # 클라이언트 연결이 끊기면 남은 요청은 취소하고 failed로 기록
+            for task in tasks:
+                task.cancel()
+            updates = []
+            for index, row in enumerate(rows):
+                status, processed_file_path = results.get(index, (AudioStatus.failed, row["processed_filepath"]))
+                updates.append({"identifier": row["identifier"], "status": status,
+                                "processed_filepath": processed_file_path})
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(_save_batch_results, updates)
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
+def _save_batch_results(updates: list[dict]) -> None:
+    with SessionLocal() as session, span("db_commit"):
+        crud.bulk_update_audio_results(session=session, results=updates)
+
+
+def _websocket_user(token: str | None) -> User | None:
+    # 브라우저 WebSocket은 Authorization 헤더를 보낼 수 없으므로 access token을 query로 받는다
+    if not token:
+        return None
+    with SessionLocal() as session:
+        return resolve_user(session, token)
+
+
+def _save_stream_result(audio: Audio, segment_files: list[str], temp_files: list[str]) -> None:
+    if audio.status == AudioStatus.done:
+        concat_wav(segment_files, audio.processed_filepath)
+    with SessionLocal() as session, span("db_commit"):
+        _save_audio(session, audio)
+    for path in temp_files:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@router.websocket("/audio/ws")
+async def speech_to_speech_stream(
+    websocket:      WebSocket,
+    token:          Annotated[str | None, Query()] = None,
+    sample_rate:    Annotated[int, Query(ge=8000, le=48000)] = 16000
+) -> None:
+    """
+    실시간 음성 변환.
+
+    클라이언트는 PCM16 mono(little endian, sample_rate Hz) 청크를 binary 메시지로 보내고,
+    다 말했으면 {"type": "end"}를 보낸다(그냥 연결을 끊어도 된다).
+    서버는 말이 끊긴 곳마다 구간을 잘라 STT + TTS를 요청하고, 구간마다
+    {"type": "transcript", "segment", "text", "transcript"}와 합성된 wav(binary)를 보낸다.
+    끝나면 전체 녹음과 합성 결과를 Audio 행 하나로 저장하고 {"type": "done", "identifier"}를 보낸다.
+    """
+    try:
+        current_user = await run_in_threadpool(_websocket_user, token)
+        await audio_rate_limiter.check(websocket, current_user)
+        ai_client.admit()
+    except HTTPException as e:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=str(e.detail))
+        return
+    await websocket.accept()
+
+    create_date = datetime.now()
+    identifier = utils.generate_uuid()
+    original_file_path, processed_file_path = await run_in_threadpool(storage.allocate, identifier)
+    segment_prefix = processed_file_path.removesuffix("_processed.wav")
+    segmenter = SpeechSegmenter(
+        sample_rate,
+        min_seconds=settings.STREAM_SEGMENT_MIN_SECONDS,
+        max_seconds=settings.STREAM_SEGMENT_MAX_SECONDS,
+        silence_seconds=settings.STREAM_SILENCE_SECONDS,
+        silence_threshold=settings.STREAM_SILENCE_THRESHOLD,
+    )
+    max_bytes = int(settings.STREAM_MAX_SESSION_SECONDS * sample_rate) * 2
+    segments: asyncio.Queue[bytes | None] = asyncio.Queue()
+    texts, segment_files, temp_files = [], [], []
+    connected = True
+
+    async def send(message: dict | bytes) -> None:
+        # 클라이언트가 먼저 끊어도 남은 구간은 끝까지 처리해서 저장한다
+        nonlocal connected
+        if not connected:
+            return
+        try:
+            if isinstance(message, bytes):
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_json(message)
+        except (WebSocketDisconnect, RuntimeError):
+            connected = False
+
+    async def synthesize_segments() -> None:
+        # 구간은 받은 순서대로 하나씩 처리한다(응답 순서 = 말한 순서)
+        index = 0
+        while (pcm := await segments.get()) is not None:
+            segment_path = f"{segment_prefix}_seg{index:03d}.wav"
+            segment_output_path = f"{segment_prefix}_seg{index:03d}_processed.wav"
+            temp_files.extend((segment_path, segment_output_path))
+            try:
+                await run_in_threadpool(write_pcm_wav, segment_path, pcm, sample_rate)
+                text, output_path = await transcribe_and_synthesize(
+                    segment_path, os.path.basename(segment_path), "audio/wav", segment_output_path)
+                audio_bytes = await run_in_threadpool(Path(output_path).read_bytes)
+            except Exception as e:
+                logger.warning(f"stream segment failed: {identifier} #{index}: {e!r}")
+                detail = e.detail if isinstance(e, HTTPException) else "audio processing failed"
+                await send({"type": "error", "segment": index, "detail": detail})
+            else:
+                texts.append(text)
+                segment_files.append(output_path)
+                await send({"type": "transcript", "segment": index, "text": text, "transcript": " ".join(texts)})
+                await send(audio_bytes)
+            index += 1
+
+    worker = asyncio.create_task(synthesize_segments())
+    original_file = await run_in_threadpool(sf.SoundFile, original_file_path, "w", samplerate=sample_rate,
+                                            channels=1, format="WAV", subtype="PCM_16")
+    received = 0
+    odd_byte = b""  # 프레임이 홀수 바이트로 끝나면 남은 1바이트(샘플 앞쪽)를 다음 프레임 앞에 붙인다
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                connected = False
+                break
+            if message.get("bytes"):
+                chunk = message["bytes"][:max_bytes - received]
+                received += len(chunk)
+                data = odd_byte + chunk
+                even = len(data) // 2 * 2
+                odd_byte = data[even:]
+                if even:
+                    await run_in_threadpool(original_file.buffer_write, data[:even], "int16")
+                for segment in segmenter.feed(chunk):
+                    segments.put_nowait(segment)
+                if received >= max_bytes:
+                    await send({"type": "error", "detail": "최대 녹음 길이를 넘었습니다."})
+                    break
+            elif message.get("text") and json.loads(message["text"]).get("type") == "end":
+                break
+    except (ValueError, AttributeError):
+        await send({"type": "error", "detail": "잘못된 메시지입니다."})
+    finally:
+        last_segment = segmenter.flush()
+        if last_segment is not None:
+            segments.put_nowait(last_segment)
+        segments.put_nowait(None)
+        with anyio.CancelScope(shield=True):
+            await worker
+            await run_in_threadpool(original_file.close)
+            if received == 0:
+                # 아무것도 받지 못했으면 행을 만들지 않는다
+                await storage.delete(original_file_path)
+                audio_row = None
+            else:
+                audio_row = Audio.model_validate({
+                    "text":                 " ".join(texts),
+                    "original_filepath":    original_file_path,
+                    "processed_filepath":   processed_file_path,
+                    "create_date":          create_date,
+                    "identifier":           identifier,
+                    "status":               AudioStatus.done if segment_files else AudioStatus.failed,
+                    "recorded":             True
+                }, update={"owner_id": current_user.id if current_user else None})
+                await run_in_threadpool(_save_stream_result, audio_row, segment_files, temp_files)
+                crud.invalidate_audio_count(audio_row.owner_id)
+                if audio_row.status == AudioStatus.done:
+                    invalidate_user_ref_audio(audio_row.owner_id)
+                    on_audio_done(original_file_path, processed_file_path)
+
+    if audio_row is not None:
+        await send({"type": "done", "identifier": identifier, "status": audio_row.status})
+    if connected:
+        await websocket.close()
+
+
+@router.api_route("/media/{file_path:path}", methods=["GET", "HEAD"])
+async def read_media_file(request: Request, file_path: str) -> Any:
+    """
+    /media/{file_path} 파일 전송. nginx가 로컬 디스크에서 찾지 못한 파일(S3 저장소에서 로컬 사본이 지워진 경우)을 넘긴다.
+    """
+    path = storage.media_path(file_path)
+    if path is None:
+        raise HTTPException(status_code=404, detail="File not found")
+    try:
+        local_path = await storage.ensure_local(path)
+        media_type = mimetypes.guess_type(local_path)[0] or "application/octet-stream"
+        return await file_response(request, local_path, media_type=media_type)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="File not found")
+
+
 @router.get("/audio/{identifier}", response_model=AudioPublic)
-async def get_file_info(session: SessionDep, identifier: str) -> Any:
+def get_file_info(session: SessionDep, identifier: str) -> Any:
     '''
-    식별자로 파일 정보 가져오기
+    식별자로 파일 정보 가져오기 (백그라운드 처리 중이면 status로 진행 상태 확인)
     '''
-    statement = select(Audio).where(Audio.identifier == identifier)
-    audio = session.exec(statement).first()
-    return audio
\ No newline at end of file
+    audio = crud.get_audio_by_identifier(session=session, identifier=identifier)
+    if not audio:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    return audio
+
+
+@router.api_route("/audio/{identifier}/stream", methods=["GET", "HEAD"])
+async def stream_processed_audio(
+    session:    SessionDep,
+    request:    Request,
+    identifier: str,
+    format:     Annotated[Literal["wav", "opus", "mp3"], Query()] = "wav"
+) -> Any:
+    """
+    처리된 음성 파일 전송: Range(이어 받기, 탐색), ETag / 304, Cache-Control 지원
+    format=opus|mp3 이면 압축 파일로 변환해서 보낸다(변환 결과는 캐시).
+    """
+    audio = await run_in_threadpool(crud.get_audio_by_identifier, session=session, identifier=identifier)
+    if not audio:
+        raise HTTPException(status_code=404, detail="Audio not found")
+    if audio.status != AudioStatus.done:
+        raise HTTPException(status_code=409, detail="아직 처리 중이거나 처리에 실패한 음성입니다.")
+    try:
+        # S3 저장소면 로컬 캐시에 없을 때 내려받는다
+        processed_file_path = await storage.ensure_local(audio.processed_filepath)
+        if format == "wav":
+            return await file_response(request, processed_file_path, media_type="audio/wav")
+        variant_file_path = await transcoder.get_variant(processed_file_path, format)
+        return await file_response(request, variant_file_path, media_type=FORMATS[format].media_type)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    except (RuntimeError, OSError) as e:
+        # soundfile 변환 실패
+        raise HTTPException(status_code=500, detail=f"audio transcoding failed: {str(e)}")
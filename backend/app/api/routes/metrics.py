@@ -0,0 +1,93 @@
+import secrets
+from typing import Any
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from starlette import status
+from starlette.responses import PlainTextResponse
+
+from backend.app import crud
+from backend.app.core import security
+from backend.app.core.config import settings
+from backend.app.core.database import get_pool_metrics
+from backend.app.core.metrics import REGISTRY
+from backend.app.utils.api_client import CircuitBreaker, ai_client
+from backend.app.utils.jobs import audio_jobs
+from backend.app.utils.media import etag_cache
+from backend.app.utils.ref_audio import user_ref_audio_cache
+from backend.app.utils.transcode import transcoder
+from backend.app.utils.tts_cache import tts_cache
+from backend.app.utils.voice_registry import voice_registry
+
+
+def verify_metrics_token(request: Request) -> None:
+    if not settings.METRICS_TOKEN:
+        return
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Could not validate credentials")
+
+
+router = APIRouter(dependencies=[Depends(verify_metrics_token)])
+
+
+def collect_db_pool():
+    pool = get_pool_metrics()
+    yield ("eartalk_db_pool_checkouts_total", "counter", "DB connection checkouts", (), {(): pool["checkouts"]})
+    yield ("eartalk_db_pool_timeouts_total", "counter", "DB connection checkout timeouts", (), {(): pool["timeouts"]})
+    yield ("eartalk_db_pool_wait_seconds_total", "counter", "Time spent waiting for a DB connection", (),
+           {(): pool["wait_seconds_total"]})
+    if "checked_out" in pool:
+        yield ("eartalk_db_pool_connections", "gauge", "DB pool connections by state", ("state",),
+               {("checked_out",): pool["checked_out"], ("checked_in",): pool["checked_in"],
+                ("overflow",): pool["overflow"]})
+
+
+def collect_caches():
+    caches = {
+        "tts": tts_cache.stats(),
+        "auth": security.user_cache.stats(),
+        "ref_audio": user_ref_audio_cache.stats(),
+        "audio_count": crud.audio_count_cache.stats(),
+        "media_etag": etag_cache.stats(),
+        "transcode": transcoder.cache.stats(),
+        "voice": voice_registry.stats(),
+    }
+    for result in ("hits", "misses"):
+        yield (f"eartalk_cache_{result}_total", "counter", f"Cache {result}", ("cache",),
+               {(name,): stats[result] for name, stats in caches.items()})
+    yield ("eartalk_cache_entries", "gauge", "Cache entries", ("cache",),
+           {(name,): stats["entries"] for name, stats in caches.items()})
+    yield ("eartalk_voice_reregistrations_total", "counter", "Reference voices re-registered after AI server eviction",
+           (), {(): voice_registry.reregistrations})
+
+
+def collect_jobs():
+    yield ("eartalk_audio_jobs_queued", "gauge", "Background audio jobs waiting in the queue", (),
+           {(): audio_jobs.qsize()})
+    yield ("eartalk_ai_requests_active", "gauge", "AI server requests in flight or waiting for a slot", (),
+           {(): ai_client.active})
+    if ai_client.breaker is not None:
+        yield ("eartalk_ai_circuit_state", "gauge", "AI server circuit breaker state (1 for the current state)",
+               ("state",), {(state,): int(ai_client.breaker.state == state)
+                            for state in (CircuitBreaker.CLOSED, CircuitBreaker.HALF_OPEN, CircuitBreaker.OPEN)})
+
+
+REGISTRY.register_collector(collect_db_pool)
+REGISTRY.register_collector(collect_caches)
+REGISTRY.register_collector(collect_jobs)
+
+
+@router.get("", response_class=PlainTextResponse)
+def read_metrics() -> Any:
+    """
+    Prometheus text format (워커 프로세스별 값)
+    """
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/db-pool")
+def read_db_pool_metrics() -> Any:
+    """
+    DB 커넥션 풀 상태 (checkout 수, 대기 시간, 타임아웃, 현재 사용 중인 커넥션)
+    """
+    return get_pool_metrics()
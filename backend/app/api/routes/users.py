@@ -1,13 +1,18 @@
-from typing import Any
+from datetime import datetime
+from typing import Any, Annotated
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import func
-from sqlmodel import select
+import anyio
+from fastapi import APIRouter, HTTPException, Query
 
 from backend.app import crud
 from backend.app.api.dependencies import SessionDep, CurrentUser
-from backend.app.core.security import verify_password
-from backend.app.models import UserCreate, UserRegister, UserPublic, Message, UpdatePassword, AudiosPublic, Audio
+from backend.app.core.config import settings
+from backend.app.core.security import verify_password, invalidate_user_cache
+from backend.app.models import (
+    UserCreate, UserRegister, UserPublic, Message, UpdatePassword, AudiosPublic, AudioSearchPublic
+)
+from backend.app.utils.ref_audio import invalidate_user_ref_audio
+from backend.app.utils.sweeper import remove_unreferenced_files
 
 router = APIRouter()
 
@@ -62,14 +67,51 @@ def read_user_me(current_user: CurrentUser) -> Any:
 
 
 @router.get("/me/audios", response_model=AudiosPublic)
-def read_audio_list(session: SessionDep, current_user: CurrentUser) -> Any:
+def read_audio_list(
+        session: SessionDep,
+        current_user: CurrentUser,
+        cursor: str | None = None,
+        limit: Annotated[int, Query(ge=1, le=settings.AUDIO_PAGE_SIZE_MAX)] = settings.AUDIO_PAGE_SIZE,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        q: str | None = None,
+) -> Any:
+    """
+    current_user의 녹음 내역 (최신순, cursor 기반 페이지네이션)
+
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 요청한다.
+    start_date/end_date로 기간, q로 텍스트를 필터링할 수 있다.
     """
-    current_user의 모든 녹음 내역
+    try:
+        audios, next_cursor = crud.get_audio_page(
+            session=session, owner_id=current_user.id, limit=limit, cursor=cursor,
+            start_date=start_date, end_date=end_date, q=q
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    count = crud.count_audios(
+        session=session, owner_id=current_user.id, start_date=start_date, end_date=end_date, q=q
+    )
+    return AudiosPublic(data=audios, count=count, next_cursor=next_cursor)
+
+
+@router.get("/me/audios/search", response_model=AudioSearchPublic)
+def search_audio_list(
+        session: SessionDep,
+        current_user: CurrentUser,
+        q: Annotated[str, Query(min_length=1, max_length=100)],
+        limit: Annotated[int, Query(ge=1, le=settings.AUDIO_PAGE_SIZE_MAX)] = settings.AUDIO_PAGE_SIZE,
+        offset: Annotated[int, Query(ge=0, le=settings.AUDIO_SEARCH_MAX_OFFSET)] = 0,
+) -> Any:
+    """
+    current_user의 녹음 내역 텍스트 검색 (관련도순, offset 기반 페이지네이션)
+
+    q의 모든 단어를 포함하는 녹음을 찾는다. 다음 페이지는 응답의 next_offset을 offset으로 넘겨 요청한다.
     """
-    statement = select(Audio).where(Audio.owner_id == current_user.id)
-    audios = session.exec(statement).all()
-    count = session.exec(select(func.count()).select_from(statement.subquery())).one()
-    return AudiosPublic(data=audios, count=count)
+    audios, next_offset = crud.search_audios(
+        session=session, owner_id=current_user.id, q=q, limit=limit, offset=offset
+    )
+    return AudioSearchPublic(data=audios, next_offset=next_offset)
 
 
 @router.delete("/me", response_model=Message)
@@ -77,6 +119,12 @@ def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Any:
     """
     Delete own user.
     """
+    user_id = current_user.id
+    file_paths = crud.delete_user_audios(session=session, owner_id=user_id, batch_size=settings.SWEEP_BATCH_SIZE)
     session.delete(current_user)
     session.commit()
+    invalidate_user_cache(user_id)
+    invalidate_user_ref_audio(user_id)
+    # 다른 행이 공유하지 않는 파일만 삭제 (TTS 캐시로 같은 처리 파일을 쓰는 행이 있을 수 있음)
+    anyio.from_thread.run(remove_unreferenced_files, file_paths)
     return Message(message="성공적으로 탈퇴가 완료되었습니다.")
\ No newline at end of file
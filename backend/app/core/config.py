@@ -11,9 +11,32 @@ load_dotenv()
 class Settings(BaseSettings):
     SQLALCHEMY_DATABASE_URL: str = os.getenv('SQLALCHEMY_DATABASE_URL')
 
+    # DB 커넥션 풀 (SQLite 제외)
+    # gunicorn 워커 수 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) 가 DB의 max_connections 보다 작아야 한다
+    DB_POOL_SIZE:           int = 5
+    DB_MAX_OVERFLOW:        int = 10
+    DB_POOL_TIMEOUT:        float = 10.0    # seconds, 커넥션을 얻기까지 기다리는 최대 시간
+    DB_POOL_RECYCLE:        int = 1800      # seconds, MySQL wait_timeout 보다 짧게
+    DB_POOL_PRE_PING:       bool = True
+    DB_STATEMENT_TIMEOUT_MS: int = 30000    # 0이면 제한 없음
+
+    # 동기 작업(DB 세션, 파일 I/O, def 라우트/의존성)을 실행하는 스레드풀 크기 (anyio 기본값 40)
+    # async 라우트는 이벤트 루프를 막지 않도록 동기 작업을 모두 run_in_threadpool로 넘긴다
+    THREADPOOL_SIZE:        int = 40
+
     # 60 minutes * 24 hours * 365 days = 365 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 365
     SECRET_KEY: str = os.getenv('SECRET_KEY')
+    # seconds, 토큰 -> User 캐시. 워커별 캐시라 다른 워커의 비밀번호 변경/탈퇴는 이 시간만큼 늦게 반영된다
+    AUTH_CACHE_TTL:         float = 10.0
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+
+    # 비밀번호 해시(bcrypt)
+    BCRYPT_ROUNDS:                      int = 12
+    PASSWORD_HASH_WORKERS:              int = 2     # 해시 전용 프로세스 수, 0이면 요청 스레드에서 바로 실행
+    PASSWORD_HASH_MAX_PENDING:          int = 16    # 동시에 대기/실행 가능한 해시 작업 수
+    PASSWORD_HASH_ADMISSION_TIMEOUT:    float = 2.0 # 이 시간 안에 자리가 안 나면 503
+    PASSWORD_REHASH_ON_LOGIN:           bool = True # 로그인 시 해시 설정이 바뀌었으면 새 해시로 교체
 
     SMTP_SSL_PORT:          int = 465  # SSL connection
     SMTP_SERVER:            str = os.getenv('SMTP_SERVER')
@@ -23,10 +46,126 @@ class Settings(BaseSettings):
     AI_REQUEST_URL:         str = os.getenv('AI_REQUEST_URL')
     MEDIA_URL:              str = os.getenv('MEDIA_URL')
 
+    # AI 모델 서버 클라이언트
+    AI_REQUEST_TIMEOUT:             float = 60.0    # seconds, 요청별 read/write 타임아웃
+    AI_CONNECT_TIMEOUT:             float = 5.0
+    AI_MAX_CONNECTIONS:             int = 20
+    AI_MAX_KEEPALIVE_CONNECTIONS:   int = 10
+    AI_MAX_CONCURRENCY:             int = 8     # AI 서버로 동시에 보낼 수 있는 최대 요청 수
+    AI_MAX_QUEUED:                  int = 16    # 그 외에 대기할 수 있는 요청 수, 넘으면 새 요청은 429
+    AI_MAX_RETRIES:                 int = 2
+    AI_RETRY_BACKOFF:               float = 0.2
+    # circuit breaker: 최근 WINDOW번 중 실패(5xx, 타임아웃) 또는 느린 호출 비율이 기준을 넘으면 OPEN_SECONDS 동안 바로 503
+    AI_BREAKER_WINDOW:              int = 20
+    AI_BREAKER_MIN_CALLS:           int = 10
+    AI_BREAKER_FAILURE_RATE:        float = 0.5
+    AI_BREAKER_SLOW_CALL_SECONDS:   float = 30.0
+    AI_BREAKER_SLOW_CALL_RATE:      float = 0.8
+    AI_BREAKER_OPEN_SECONDS:        float = 30.0
+    AI_FALLBACK_ENABLED:            bool = False    # AI 서버 장애 시 gTTS / Google STT로 대체 (목소리 복제 없음)
+
+    # 백그라운드 음성 처리
+    AUDIO_JOB_WORKERS:      int = 4     # 워커 수
+    AUDIO_JOB_QUEUE_SIZE:   int = 100   # 대기 가능한 최대 작업 수, 초과 시 503
+
+    # 미디어 저장소: local(MEDIA_DIR) 또는 s3(S3 호환, MEDIA_DIR은 로컬 작업/캐시 디렉토리)
+    MEDIA_STORAGE:          str = "local"
+    S3_ENDPOINT_URL:        str | None = None   # 예: http://minio:9000
+    S3_BUCKET:              str | None = None
+    S3_ACCESS_KEY:          str | None = None
+    S3_SECRET_KEY:          str | None = None
+    S3_REGION:              str = "us-east-1"
+    S3_TIMEOUT:             float = 30.0
+    S3_LOCAL_CACHE_MAX_BYTES:   int = 1024 * 1024 * 1024    # 1GB, 워커별로 남겨 둘 업로드된 파일의 로컬 사본(LRU), 0이면 가장 최근 하나만 남긴다
+
+    # 음성 파일 전송 (GET /audio/{identifier}/stream)
+    MEDIA_CACHE_MAX_AGE:            int = 86400     # seconds, identifier별 파일 내용은 바뀌지 않는다
+    MEDIA_ETAG_CACHE_MAX_ENTRIES:   int = 4096
+    MEDIA_STREAM_CHUNK_SIZE:        int = 64 * 1024
+    MEDIA_ACCEL_REDIRECT_PREFIX:    str | None = None   # 예: /protected-media (nginx internal location), 설정 시 전송은 nginx가 담당
+
+    # 압축 포맷 변환 (?format=opus|mp3), 변환 파일은 원본 옆에 저장
+    TRANSCODE_WORKERS:              int = 2     # 0이면 스레드풀에서 변환
+    TRANSCODE_CACHE_MAX_ENTRIES:    int = 8192
+    TRANSCODE_CACHE_MAX_BYTES:      int = 512 * 1024 * 1024     # 512MB, 넘으면 오래된 변환 파일부터 삭제
+    TRANSCODE_PREENCODE_FORMATS:    list[str] = []  # 생성 직후 미리 변환할 포맷, 예: ["opus"]
+
+    # 미디어 / Audio 행 정리 (python -m backend.app.utils.sweeper --dry-run 으로 대상 확인)
+    SWEEP_INTERVAL:                 float = 3600.0  # seconds, 0이면 서버에서 주기 실행하지 않음 (워커마다 돌지만 잠금을 잡은 하나만 실행)
+    SWEEP_BATCH_SIZE:               int = 500
+    SWEEP_MAX_BATCHES:              int = 20        # 실행당 단계별 최대 배치 수, 나머지는 다음 실행에서 이어서
+    SWEEP_GRACE_PERIOD:             float = 3600.0  # seconds, 이보다 최근에 쓰인 파일은 처리 중일 수 있으므로 건너뜀
+    SWEEP_STALE_JOB_AGE:            float = 6 * 3600.0  # seconds, 이보다 오래 queued/running이면 failed 처리
+    ANONYMOUS_AUDIO_RETENTION_DAYS: int = 7         # 익명 음성 보관 기간, 0이면 삭제하지 않음
+
+    # 모니터링 (GET /metrics, /metrics/db-pool): 설정하면 Authorization: Bearer <METRICS_TOKEN> 필요
+    # nginx는 외부에서 /api/metrics를 막으므로 토큰 없이도 docker 네트워크 안에서만 접근할 수 있다
+    METRICS_TOKEN:          str | None = None
+
+    # 요청 제한 (POST /audio, /audio/batch): 토큰 버킷, RATE는 초당 충전 토큰 수, BURST는 최대 토큰 수
+    RATE_LIMIT_ENABLED:     bool = True
+    RATE_LIMIT_USER_RATE:   float = 0.5     # 로그인 사용자별
+    RATE_LIMIT_USER_BURST:  int = 10
+    RATE_LIMIT_ANON_RATE:   float = 0.1     # 비로그인, IP별
+    RATE_LIMIT_ANON_BURST:  int = 3
+    RATE_LIMIT_IP_RATE:     float = 1.0     # IP별 전체 (계정을 여러 개 쓰는 경우)
+    RATE_LIMIT_IP_BURST:    int = 30
+    RATE_LIMIT_MAX_KEYS:    int = 100000    # 메모리 저장소에 보관할 최대 버킷 수
+    RATE_LIMIT_REDIS_URL:   str | None = None   # 설정 시 Redis 호환 서버에서 워커 간 카운터 공유 (redis 패키지 필요)
+    RATE_LIMIT_TRUST_PROXY: bool = False    # nginx 뒤에서만 접근 가능할 때 켜서 X-Real-IP를 클라이언트 IP로 사용 (docker-compose에서 켬)
+
+    # 일괄 TTS (POST /audio/batch)
+    AUDIO_BATCH_MAX_ITEMS:      int = 10    # 한 번에 요청할 수 있는 최대 텍스트 수 (요청 제한을 켜면 적용되는 RATE_LIMIT_*_BURST 중 가장 작은 값으로 줄어듦)
+    AUDIO_BATCH_CONCURRENCY:    int = 4     # 배치 하나가 AI 서버로 동시에 보내는 요청 수
+
+    # 업로드 음성 전처리 (AI 서버로 보내기 전): mono 변환, 앞뒤 무음 제거, 리샘플, 너무 짧거나 긴 음성 거절
+    AUDIO_NORMALIZE_ENABLED:        bool = True
+    AUDIO_NORMALIZE_WORKERS:        int = 2         # 0이면 스레드풀에서 실행
+    AUDIO_TARGET_SAMPLE_RATE:       int = 16000     # AI 모델 입력 샘플레이트
+    AUDIO_SILENCE_THRESHOLD:        float = 0.01    # RMS (최대 1.0), 이보다 작은 20ms 구간은 무음
+    AUDIO_TRIM_PADDING_SECONDS:     float = 0.1     # 말소리 앞뒤로 남겨 둘 길이
+    AUDIO_MIN_SECONDS:              float = 0.3     # 말소리가 이보다 짧으면 400
+    AUDIO_MAX_SECONDS:              float = 60.0    # 무음 제거 후 이보다 길면 400
+
+    # 실시간 음성 변환 (WebSocket /audio/ws): PCM16 mono 청크를 말이 끊긴 곳에서 잘라 구간별로 STT + TTS
+    STREAM_SEGMENT_MIN_SECONDS:     float = 0.8
+    STREAM_SEGMENT_MAX_SECONDS:     float = 4.0
+    STREAM_SILENCE_SECONDS:         float = 0.3
+    STREAM_SILENCE_THRESHOLD:       float = 0.01    # RMS (최대 1.0), 이보다 작으면 무음
+    STREAM_MAX_SESSION_SECONDS:     float = 300.0
+
+    # 업로드
+    MAX_UPLOAD_BYTES:       int = 20 * 1024 * 1024  # 20MB, nginx client_max_body_size와 맞출 것
+    UPLOAD_CHUNK_SIZE:      int = 1024 * 1024
+
+    # 녹음 내역 목록
+    AUDIO_PAGE_SIZE:        int = 20
+    AUDIO_PAGE_SIZE_MAX:    int = 100
+    AUDIO_COUNT_CACHE_TTL:  float = 60.0    # seconds
+    AUDIO_SEARCH_MAX_OFFSET:    int = 1000  # 관련도순 검색은 offset 페이지네이션이므로 깊은 페이지는 막는다
+
+    # TTS 결과 캐시 ((텍스트, ref 음성) -> processed wav)
+    TTS_CACHE_ENABLED:      bool = True
+    TTS_CACHE_MAX_ENTRIES:  int = 4096
+    TTS_CACHE_MAX_BYTES:    int = 1024 * 1024 * 1024    # 1GB
+
     MEDIA_DIR:              str = os.getenv('MEDIA_DIR')
     # AUDIO_ROOT:             str = os.getenv('AUDIO_ROOT')
     LOGFILE_ROOT:           str = os.getenv('LOGFILE_ROOT')
     DEFAULT_REF_AUDIO_DIR:  str = os.getenv('DEFAULT_REF_AUDIO_DIR')
+    DEFAULT_REF_AUDIO_WATCH: bool = True    # 기본 ref 음성 디렉토리 변경 시 자동으로 다시 로드
+
+    # 사용자 ref 음성(가장 최근 녹음) 조회
+    REF_AUDIO_LOOKUP_LIMIT:         int = 10        # recorded 컬럼 추가 전 행: 최신 몇 개의 행에서 녹음 파일을 찾을지
+    REF_AUDIO_CACHE_MAX_ENTRIES:    int = 256
+    REF_AUDIO_CACHE_MAX_BYTES:      int = 64 * 1024 * 1024  # 워커별 캐시에 보관할 녹음 파일 크기 합
+    REF_AUDIO_CACHE_TTL:            float = 300.0   # seconds
+
+    # ref 음성 등록 (AI 서버 POST /voices): 한 번 올린 ref는 이후 voice_id(내용 sha256)만 보낸다
+    # AI 서버가 /voices를 지원하지 않으면 지금처럼 매번 파일을 보낸다
+    VOICE_REGISTRY_ENABLED:         bool = True
+    VOICE_REGISTRY_MAX_ENTRIES:     int = 4096
+    VOICE_REGISTRY_RETRY_SECONDS:   float = 300.0   # /voices가 404/405/501이면 이 시간 동안 파일을 보내고 다시 시도
 
 
 settings = Settings()  # type: ignore
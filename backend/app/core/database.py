@@ -1,9 +1,100 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, Session, select
 from .config import settings
 
-engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+class PoolMetrics:
+    """
+    커넥션 풀 checkout 횟수/대기 시간/타임아웃 집계. 풀 크기를 gunicorn 워커 수에 맞춰 조정할 때 참고.
+    """
+
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, wait_seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += wait_seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+
+    def snapshot(self, pool) -> dict:
+        with self._lock:
+            data = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+            }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": pool.overflow(),
+            })
+        return data
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            # 풀 고갈: pool_timeout 동안 커넥션을 얻지 못함
+            timed_out = True
+            raise
+        finally:
+            pool_metrics.observe(time.perf_counter() - start, timed_out)
+
+
+def engine_options(database_url: str) -> dict:
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        # SQLite 전용 옵션
+        return {"connect_args": {"check_same_thread": False}}
+
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        if url.get_backend_name() == "mysql":
+            # SELECT 실행 시간 제한 + 응답이 없는 커넥션 읽기 제한(여유를 두고 2배)
+            options["connect_args"] = {
+                "init_command": f"SET SESSION max_execution_time={settings.DB_STATEMENT_TIMEOUT_MS}",
+                "read_timeout": max(1, settings.DB_STATEMENT_TIMEOUT_MS // 1000 * 2),
+            }
+        elif url.get_backend_name() == "postgresql":
+            options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, **engine_options(settings.SQLALCHEMY_DATABASE_URL))
+
+
+def get_pool_metrics() -> dict:
+    return pool_metrics.snapshot(engine.pool)
 
 
 # def init_db(session: Session) -> None:
@@ -17,4 +108,4 @@ engine = create_engine(
 #             password=settings.FIRST_SUPERUSER_PASSWORD,
 #             is_superuser=True,
 #         )
-#         user = crud.create_user(session=session, user_create=user_in)
\ No newline at end of file
+#         user = crud.create_user(session=session, user_create=user_in)
@@ -0,0 +1,87 @@
+import time
+import uuid
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.app.core.metrics import (
+    http_requests_total, http_request_duration_seconds, http_requests_in_flight
+)
+from backend.app.utils.utils import get_logger, request_id_var
+
+
+class MetricsMiddleware:
+    """
+    라우트별 지연 시간 / 상태 코드 / 처리 중인 요청 수를 기록하는 ASGI 미들웨어.
+    본문을 버퍼링하지 않으므로 스트리밍 응답에도 영향이 없다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            # 라우터가 매칭한 경로 템플릿(/api/audio/{identifier})을 라벨로 써서 cardinality를 제한
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            http_request_duration_seconds.observe(time.perf_counter() - start, method, route_path)
+            http_requests_total.inc(method, route_path, status_code)
+
+
+class RequestIDMiddleware:
+    """
+    요청마다 X-Request-ID를 부여(클라이언트가 보낸 값이 있으면 사용)하고 접근 로그를 남긴다.
+    로그 기록은 큐에 넣기만 하므로 디스크 지연이 응답 시간에 더해지지 않는다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.logger = get_logger("access")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for key, value in scope["headers"]:
+            if key == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self.logger.info(f"{scope['method']} {scope['path']} {status_code} "
+                             f"{(time.perf_counter() - start) * 1000:.1f}ms")
+            request_id_var.reset(token)
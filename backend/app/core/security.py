@@ -1,15 +1,28 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Any
 
+from fastapi import HTTPException
 from jose import jwt
 from passlib.context import CryptContext
 
 from backend.app.core.config import settings
+from backend.app.utils.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 ALGORITHM = "HS256"
 
+# access token -> (만료 시각, User 스냅샷). 인증된 요청마다 DB 조회를 하지 않기 위한 캐시
+user_cache = TTLCache(maxsize=settings.AUTH_CACHE_MAX_ENTRIES, ttl=settings.AUTH_CACHE_TTL)
+
+# bcrypt는 CPU만 쓰는 작업이므로 별도 프로세스 풀에서 실행하고, 대기 중인 작업 수를 제한한다
+_password_executor: ProcessPoolExecutor | None = None
+_password_executor_lock = threading.Lock()
+_password_admission = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
 
 def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     expire = datetime.utcnow() + expires_delta
@@ -18,9 +31,81 @@ def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
     return encoded_jwt
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+def invalidate_user_cache(user_id: int) -> None:
+    # 비밀번호 변경, 탈퇴 시 해당 user의 캐시된 토큰을 모두 지운다
+    user_cache.invalidate_where(lambda _, value: value[1]["id"] == user_id)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password):
+def _verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
+
+
+def _get_password_executor() -> ProcessPoolExecutor:
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is None:
+            # fork 대신 spawn: 스레드가 도는 워커 프로세스를 그대로 복제하지 않는다
+            _password_executor = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _password_executor
+
+
+def _warm_up() -> None:
+    return None
+
+
+def start_password_executor() -> None:
+    """
+    해시 워커 프로세스를 미리 띄운다(spawn + passlib import). lifespan에서 호출
+    """
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return
+    executor = _get_password_executor()
+    for future in [executor.submit(_warm_up) for _ in range(settings.PASSWORD_HASH_WORKERS)]:
+        future.result()
+
+
+def _run_password_task(fn, *args):
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+
+    if not _password_admission.acquire(timeout=settings.PASSWORD_HASH_ADMISSION_TIMEOUT):
+        raise HTTPException(status_code=503, detail="요청이 많아 잠시 후 다시 시도해주세요.",
+                            headers={"Retry-After": "1"})
+    try:
+        return _get_password_executor().submit(fn, *args).result()
+    finally:
+        _password_admission.release()
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    with _password_executor_lock:
+        if _password_executor is not None:
+            _password_executor.shutdown(cancel_futures=True)
+            _password_executor = None
+
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _run_password_task(_verify, plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    비밀번호 확인 + 해시 설정(rounds 등)이 바뀌었으면 새 해시 반환
+    """
+    return _run_password_task(_verify_and_update, plain_password, hashed_password)
+
+
+def get_password_hash(password):
+    return _run_password_task(_hash, password)
@@ -1,7 +1,14 @@
-from sqlmodel import Session, select
+import base64
+from datetime import datetime
 
-from backend.app.core.security import get_password_hash, verify_password
-from backend.app.models import User, UserCreate
+from sqlalchemy import func, or_, and_, insert, update, delete, bindparam, column, literal_column, table, text
+from sqlalchemy.dialects.mysql import match
+from sqlmodel import Session, select, col
+
+from backend.app.core.config import settings
+from backend.app.core.security import get_password_hash, verify_and_update_password, invalidate_user_cache
+from backend.app.models import User, UserCreate, Audio, AudioStatus, AUDIO_FTS_TABLE
+from backend.app.utils.cache import TTLCache
 
 
 def create_user(*, session: Session, user_create: UserCreate) -> User:
@@ -25,12 +32,188 @@ def update_password(*, session: Session, current_user: User, new_password: str)
     current_user.hashed_password = hashed_password
     session.add(current_user)
     session.commit()
+    invalidate_user_cache(current_user.id)
 
 
 def authenticate(*, session: Session, email: str, password: str) -> User | None:
     db_user = get_user_by_email(session=session, email=email)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    verified, new_hash = verify_and_update_password(password, db_user.hashed_password)
+    if not verified:
         return None
-    return db_user
\ No newline at end of file
+    if new_hash and settings.PASSWORD_REHASH_ON_LOGIN:
+        # cost 등 해시 설정이 바뀐 경우 로그인하면서 새 해시로 교체
+        db_user.hashed_password = new_hash
+        session.add(db_user)
+        session.commit()
+    return db_user
+
+
+# (owner_id, start_date, end_date, q) -> count
+audio_count_cache = TTLCache(maxsize=1024, ttl=settings.AUDIO_COUNT_CACHE_TTL)
+
+
+def encode_audio_cursor(audio: Audio) -> str:
+    raw = f"{audio.create_date.isoformat()}|{audio.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_audio_cursor(cursor: str) -> tuple[datetime, int]:
+    # 잘못된 cursor면 ValueError
+    try:
+        create_date, audio_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(create_date), int(audio_id)
+    except Exception as e:
+        raise ValueError("invalid cursor") from e
+
+
+def _audio_filters(owner_id: int, start_date: datetime | None, end_date: datetime | None, q: str | None) -> list:
+    filters = [Audio.owner_id == owner_id]
+    if start_date:
+        filters.append(Audio.create_date >= start_date)
+    if end_date:
+        filters.append(Audio.create_date < end_date)
+    if q:
+        filters.append(col(Audio.text).contains(q, autoescape=True))
+    return filters
+
+
+def get_audio_page(
+        *, session: Session, owner_id: int, limit: int, cursor: str | None = None,
+        start_date: datetime | None = None, end_date: datetime | None = None, q: str | None = None
+) -> tuple[list[Audio], str | None]:
+    """
+    (create_date, id) 내림차순 keyset 페이지네이션. (목록, 다음 페이지 cursor) 반환
+    """
+    filters = _audio_filters(owner_id, start_date, end_date, q)
+    if cursor:
+        cursor_date, cursor_id = decode_audio_cursor(cursor)
+        filters.append(or_(
+            Audio.create_date < cursor_date,
+            and_(Audio.create_date == cursor_date, Audio.id < cursor_id),
+        ))
+
+    statement = (select(Audio).where(*filters)
+                 .order_by(col(Audio.create_date).desc(), col(Audio.id).desc()))
+    # 한 개 더 읽어서 다음 페이지가 있는지 확인
+    audios = list(session.exec(statement.limit(limit + 1)).all())
+    next_cursor = encode_audio_cursor(audios[limit - 1]) if len(audios) > limit else None
+    return audios[:limit], next_cursor
+
+
+def count_audios(
+        *, session: Session, owner_id: int,
+        start_date: datetime | None = None, end_date: datetime | None = None, q: str | None = None
+) -> int:
+    # 페이지마다 다시 세지 않도록 캐시
+    key = (owner_id, start_date, end_date, q)
+    count = audio_count_cache.get(key)
+    if count is None:
+        statement = select(func.count()).select_from(Audio).where(*_audio_filters(owner_id, start_date, end_date, q))
+        count = session.exec(statement).one()
+        audio_count_cache.set(key, count)
+    return count
+
+
+# 전문 검색 인덱스의 토큰 길이(MySQL ngram_token_size 기본값, SQLite trigram). 이보다 짧은 단어는 LIKE로 찾는다
+SEARCH_MIN_TERM_LENGTH = {"mysql": 2, "sqlite": 3}
+
+
+def search_audios(
+        *, session: Session, owner_id: int, q: str, limit: int, offset: int = 0
+) -> tuple[list[Audio], int | None]:
+    """
+    q의 모든 단어(공백 구분)를 포함하는 행을 관련도순(같으면 최신순)으로. (목록, 다음 페이지 offset) 반환
+    MySQL은 FULLTEXT, SQLite는 FTS5 인덱스를 쓰고, 그 밖의 DB는 LIKE로 찾는다(관련도 없이 최신순).
+    """
+    terms = q.replace('"', " ").split()
+    if not terms:
+        return [], None
+    dialect = session.get_bind().dialect.name
+    min_length = SEARCH_MIN_TERM_LENGTH.get(dialect)
+    indexed = [term for term in terms if min_length and len(term) >= min_length]
+
+    statement = select(Audio).where(Audio.owner_id == owner_id)
+    rank = []
+    if indexed and dialect == "mysql":
+        relevance = match(Audio.text, against=" ".join(f'+"{term}"' for term in indexed)).in_boolean_mode()
+        statement = statement.where(relevance)
+        rank.append(relevance.desc())
+    elif indexed and dialect == "sqlite":
+        fts = table(AUDIO_FTS_TABLE, column("rowid"))
+        statement = (statement.join(fts, fts.c.rowid == Audio.id)
+                     .where(text(f"{AUDIO_FTS_TABLE} MATCH :query")
+                            .bindparams(query=" ".join(f'"{term}"' for term in indexed))))
+        rank.append(func.bm25(literal_column(AUDIO_FTS_TABLE)))     # 작을수록 관련도가 높다
+    for term in terms:
+        if term not in indexed:
+            statement = statement.where(col(Audio.text).contains(term, autoescape=True))
+
+    # 한 개 더 읽어서 다음 페이지가 있는지 확인
+    statement = (statement.order_by(*rank, col(Audio.create_date).desc(), col(Audio.id).desc())
+                 .offset(offset).limit(limit + 1))
+    audios = list(session.exec(statement).all())
+    next_offset = offset + limit if len(audios) > limit else None
+    return audios[:limit], next_offset
+
+
+def get_audio_by_identifier(*, session: Session, identifier: str) -> Audio | None:
+    statement = select(Audio).where(Audio.identifier == identifier)
+    return session.exec(statement).first()
+
+
+def invalidate_audio_count(owner_id: int | None) -> None:
+    if owner_id is not None:
+        audio_count_cache.invalidate_where(lambda key, _: key[0] == owner_id)
+
+
+def bulk_create_audios(*, session: Session, rows: list[dict]) -> None:
+    """
+    Audio 행 여러 개를 한 번의 INSERT(executemany)로 저장. PK는 돌려받지 않으므로 identifier로 구분한다.
+    """
+    session.execute(insert(Audio), rows)
+    session.commit()
+
+
+def bulk_update_audio_results(*, session: Session, results: list[dict]) -> None:
+    """
+    identifier 기준으로 처리 결과(status, processed_filepath)를 한 번에 갱신
+    """
+    table = Audio.__table__
+    statement = (update(table)
+                 .where(table.c.identifier == bindparam("b_identifier"))
+                 .values(status=bindparam("b_status"), processed_filepath=bindparam("b_processed_filepath")))
+    session.connection().execute(statement, [
+        {"b_identifier": result["identifier"], "b_status": result["status"],
+         "b_processed_filepath": result["processed_filepath"]}
+        for result in results
+    ])
+    session.commit()
+
+
+def fail_unfinished_audio(*, session: Session, audio_id: int) -> None:
+    """
+    아직 queued / running 인 Audio 행을 failed로 (이미 끝난 행은 그대로)
+    """
+    session.execute(update(Audio)
+                    .where(Audio.id == audio_id, col(Audio.status).in_([AudioStatus.queued, AudioStatus.running]))
+                    .values(status=AudioStatus.failed))
+    session.commit()
+
+
+def delete_user_audios(*, session: Session, owner_id: int, batch_size: int) -> list[str]:
+    """
+    사용자의 Audio 행을 배치 단위(짧은 트랜잭션)로 삭제하고, 지운 행의 파일 경로를 반환
+    """
+    file_paths = []
+    while True:
+        rows = session.exec(select(Audio.id, Audio.original_filepath, Audio.processed_filepath)
+                            .where(Audio.owner_id == owner_id).limit(batch_size)).all()
+        if not rows:
+            break
+        session.execute(delete(Audio).where(col(Audio.id).in_([row[0] for row in rows])))
+        session.commit()
+        file_paths.extend(path for row in rows for path in row[1:])
+    invalidate_audio_count(owner_id)
+    return file_paths
@@ -1,24 +1,84 @@
-from datetime import datetime
+import asyncio
+import gc
+import os
+from contextlib import asynccontextmanager
 
+import anyio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from starlette.concurrency import iterate_in_threadpool
+from fastapi.responses import JSONResponse
+from sqlalchemy import exc
+from starlette.concurrency import run_in_threadpool
 from starlette.staticfiles import StaticFiles
 
 from backend.app.api.main import api_router
 from backend.app.core.config import settings
-from backend.app.utils.utils import get_logger
+from backend.app.core.middleware import MetricsMiddleware, RequestIDMiddleware
+from backend.app.core.security import start_password_executor, shutdown_password_executor
+from backend.app.utils.api_client import ai_client
+from backend.app.utils.jobs import audio_jobs
+from backend.app.utils.normalize import audio_normalizer
+from backend.app.utils.ref_audio import default_ref_audio
+from backend.app.utils.storage import storage, wait_pending_uploads
+from backend.app.utils.sweeper import media_sweeper
+from backend.app.utils.transcode import transcoder
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background_tasks = []
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREADPOOL_SIZE
+
+    # 기본 ref 음성 메모리 로드 + 디렉토리 변경 감시
+    default_ref_audio.load()
+    if settings.DEFAULT_REF_AUDIO_WATCH and os.path.isdir(settings.DEFAULT_REF_AUDIO_DIR):
+        background_tasks.append(asyncio.create_task(default_ref_audio.watch()))
+
+    if settings.SWEEP_INTERVAL > 0:
+        background_tasks.append(asyncio.create_task(media_sweeper.run_forever(settings.SWEEP_INTERVAL)))
+
+    # 프로세스 풀과 HTTP 클라이언트를 미리 만든다: 첫 요청에서 만들면 그동안 이벤트 루프와 다른 요청이 밀린다
+    await asyncio.gather(*(run_in_threadpool(start) for start in (
+        start_password_executor, transcoder.start, audio_normalizer.start, ai_client.start, storage.start)))
+
+    audio_jobs.start()
+    # import / 시작 때 만든 객체(모듈, 스키마 등)는 계속 살아 있다: 세대 2 GC가 매번 훑으며 루프를 멈추지 않게 제외
+    gc.collect()
+    gc.freeze()
+    yield
+    await audio_jobs.stop()
+    await wait_pending_uploads()
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await ai_client.aclose()
+    await storage.aclose()
+    shutdown_password_executor()
+    transcoder.shutdown()
+    audio_normalizer.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 app.include_router(api_router, prefix='/api')
 app.mount("/static", StaticFiles(directory="frontend/build/static"))
 app.mount("/media", StaticFiles(directory=settings.MEDIA_DIR), name="media")
 # app.mount(f'/{settings.AUDIO_DIR}', StaticFiles(directory=), name=settings.)
 
+
+@app.exception_handler(exc.TimeoutError)
+async def db_pool_timeout_handler(request: Request, e: exc.TimeoutError):
+    # DB 커넥션 풀 고갈은 500 대신 503으로 알린다
+    return JSONResponse(status_code=503, content={"detail": "요청이 많아 잠시 후 다시 시도해주세요."},
+                        headers={"Retry-After": "1"})
+
+
 origins = [
     "*",
 ]
 
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIDMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -26,49 +86,3 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
-
-
-# 로깅 미들웨어
-# @app.middleware("http")
-# async def log_request(request: Request, call_next):
-#     logger = get_logger()
-#
-#     # 유입 시간
-#     start_time = datetime.utcnow()
-#
-#     # 요청 로깅
-#     logger.info(f"Request: {request.method} {request.url}")
-#     body = await request.body()
-#
-#     # UTF-8로 디코딩할 수 없는 경우에 대비하여 예외 처리
-#     try:
-#         # 본문이 텍스트일 경우에만 UTF-8로 디코딩
-#         logger.info(f"Request Body: {body.decode('utf-8')}")
-#     except UnicodeDecodeError:
-#         # 디코딩할 수 없는 경우 바이너리 데이터를 기록하거나 생략
-#         logger.info("Request Body contains non-text data.")
-#
-#     response = await call_next(request)
-#
-#     # 응답 로깅
-#     logger.info(f"Response: {response.status_code}")
-#
-#     # 응답 본문 읽기 및 로그 기록
-#     response_body = [chunk async for chunk in response.body_iterator]
-#
-#     if response_body:  # 응답 본문이 비어있지 않은 경우에만 처리
-#         try:
-#             logger.info(f"Response Body: {response_body[0].decode()}")
-#         except UnicodeDecodeError:
-#             logger.info("Response Body contains non-text data.")
-#     else:
-#         logger.info("Response Body is empty.")
-#
-#     # 응답 본문 다시 설정 (원래 상태로 돌려놓기)
-#     response.body_iterator = iterate_in_threadpool(iter(response_body))
-#
-#     # 작업 시간 로깅
-#     process_time = (datetime.utcnow() - start_time).total_seconds()
-#     logger.info(f"Process-Time: {'{:.3f}'.format(process_time)}")
-#
-#     return response
\ No newline at end of file
@@ -1,8 +1,10 @@
 from datetime import datetime
+from enum import Enum
 from typing import List
 
 from fastapi import UploadFile
 from pydantic import EmailStr
+from sqlalchemy import DDL, Index, event
 from sqlmodel import Field, Relationship, SQLModel
 
 
@@ -52,20 +54,71 @@ class AudioCreate(SQLModel):
     audio:  UploadFile | None = Field(default=None)
 
 
+class AudioBatchCreate(SQLModel):
+    texts: List[str] = Field(min_length=1)
+
+
+class AudioStatus(str, Enum):
+    queued  = "queued"
+    running = "running"
+    done    = "done"
+    failed  = "failed"
+
+
 class Audio(AudioBase, table=True):
+    __table_args__ = (
+        Index("ix_audio_owner_id_id", "owner_id", "id"),    # 사용자별 최신 음성 조회
+        Index("ix_audio_owner_id_create_date_id", "owner_id", "create_date", "id"),  # 목록 keyset 페이지네이션
+        Index("ix_audio_processed_filepath", "processed_filepath"),     # TTS 캐시로 공유된 파일의 참조 확인
+        Index("ix_audio_owner_id_recorded_id", "owner_id", "recorded", "id"),  # 사용자별 최신 녹음(ref 음성) 조회
+    )
+
     id:             int | None = Field(default=None, primary_key=True)
     owner_id:       int | None = Field(default=None, foreign_key="user.id")
     owner:          User | None = Relationship(back_populates="audios")
     create_date:    datetime
+    status:         str = Field(default=AudioStatus.done, max_length=16)
+    recorded:       bool = Field(default=False)     # 사용자가 녹음을 올린 행(음성 입력): original 파일이 있음
+
+
+# Audio.text 전문 검색 인덱스 (GET /users/me/audios/search). 행이 추가/삭제될 때 DB가 함께 갱신한다.
+# MySQL: ngram parser FULLTEXT (한국어는 공백으로 단어가 나뉘지 않으므로 2글자 단위)
+# SQLite: trigram FTS5 external content 테이블 + 트리거 (개발/테스트용)
+AUDIO_FTS_TABLE = "audio_fts"
+AUDIO_FULLTEXT_INDEX = "ix_audio_text_fulltext"
+
+for ddl in (
+    f"CREATE VIRTUAL TABLE {AUDIO_FTS_TABLE} USING fts5(text, content='audio', content_rowid='id', tokenize='trigram')",
+    f"CREATE TRIGGER {AUDIO_FTS_TABLE}_ai AFTER INSERT ON audio BEGIN "
+    f"INSERT INTO {AUDIO_FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+    f"CREATE TRIGGER {AUDIO_FTS_TABLE}_ad AFTER DELETE ON audio BEGIN "
+    f"INSERT INTO {AUDIO_FTS_TABLE}({AUDIO_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); END",
+    f"CREATE TRIGGER {AUDIO_FTS_TABLE}_au AFTER UPDATE OF text ON audio BEGIN "
+    f"INSERT INTO {AUDIO_FTS_TABLE}({AUDIO_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text); "
+    f"INSERT INTO {AUDIO_FTS_TABLE}(rowid, text) VALUES (new.id, new.text); END",
+):
+    event.listen(Audio.__table__, "after_create", DDL(ddl).execute_if(dialect="sqlite"))
+event.listen(Audio.__table__, "after_drop",
+             DDL(f"DROP TABLE IF EXISTS {AUDIO_FTS_TABLE}").execute_if(dialect="sqlite"))
+event.listen(Audio.__table__, "after_create",
+             DDL(f"CREATE FULLTEXT INDEX {AUDIO_FULLTEXT_INDEX} ON audio (text) WITH PARSER ngram")
+             .execute_if(dialect="mysql"))
 
 
 class AudioPublic(AudioBase):
     id:         int
+    status:     str
 
 
 class AudiosPublic(SQLModel):
     data: List[AudioPublic] | None
     count: int
+    next_cursor: str | None = None  # 다음 페이지 요청 시 cursor로 전달, 마지막 페이지면 None
+
+
+class AudioSearchPublic(SQLModel):
+    data: List[AudioPublic]
+    next_offset: int | None = None  # 다음 페이지 요청 시 offset으로 전달, 마지막 페이지면 None
 
 
 class Message(SQLModel):
@@ -0,0 +1,18 @@
+import os
+import tempfile
+
+# settings는 import 시점에 환경 변수를 읽으므로 app 모듈보다 먼저 채운다
+_root = tempfile.mkdtemp(prefix="eartalk-test-")
+for key, value in {
+    "SQLALCHEMY_DATABASE_URL": f"sqlite:///{os.path.join(_root, 'app.db')}",
+    "SECRET_KEY": "test",
+    "SMTP_SERVER": "localhost",
+    "SENDER_EMAIL": "test@example.com",
+    "SENDER_PASSWORD": "test",
+    "AI_REQUEST_URL": "http://127.0.0.1:9",
+    "MEDIA_URL": "/media",
+    "MEDIA_DIR": os.path.join(_root, "media"),
+    "LOGFILE_ROOT": os.path.join(_root, "logs"),
+    "DEFAULT_REF_AUDIO_DIR": os.path.join(_root, "ref"),
+}.items():
+    os.environ.setdefault(key, value)
@@ -0,0 +1,93 @@
+import pytest
+
+from backend.app.utils import api_client
+from backend.app.utils.api_client import AIServerUnavailable, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(api_client.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_breaker() -> CircuitBreaker:
+    return CircuitBreaker(window=4, min_calls=4, failure_rate=0.5, slow_call_seconds=10.0,
+                          slow_call_rate=0.75, open_seconds=30.0)
+
+
+def call(breaker: CircuitBreaker, failed: bool = False, duration: float = 0.1) -> None:
+    breaker.before_call()
+    breaker.record(failed, duration)
+
+
+def test_circuit_opens_on_failure_rate(clock):
+    breaker = make_breaker()
+
+    # min_calls 전에는 모두 실패해도 닫혀 있다
+    for _ in range(3):
+        call(breaker, failed=True)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    call(breaker)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(AIServerUnavailable) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "30"
+
+
+def test_circuit_stays_closed_below_thresholds(clock):
+    breaker = make_breaker()
+
+    for failed in (True, False, False, False, True, False, False, False):
+        call(breaker, failed=failed)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_circuit_opens_on_slow_calls(clock):
+    breaker = make_breaker()
+
+    for duration in (10.0, 10.0, 10.0, 0.1):
+        call(breaker, duration=duration)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def open_breaker(clock) -> CircuitBreaker:
+    breaker = make_breaker()
+    for _ in range(4):
+        call(breaker, failed=True)
+    assert breaker.state == CircuitBreaker.OPEN
+    clock[0] += 30.0
+    return breaker
+
+
+def test_half_open_probe_success_closes(clock):
+    breaker = open_breaker(clock)
+
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 호출은 한 번만
+    with pytest.raises(AIServerUnavailable):
+        breaker.before_call()
+
+    breaker.record(False, 0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+    # 이전 실패 기록은 지워진다
+    call(breaker, failed=True)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+@pytest.mark.parametrize("failed, duration", [(True, 0.1), (False, 10.0)])
+def test_half_open_probe_failure_reopens(clock, failed, duration):
+    breaker = open_breaker(clock)
+
+    breaker.before_call()
+    breaker.record(failed, duration)
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(AIServerUnavailable):
+        breaker.before_call()
+
+    clock[0] += 30.0
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
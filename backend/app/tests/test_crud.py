@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+
+from backend.app import crud
+from backend.app.models import Audio, User
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def add_user(session: Session, email: str) -> User:
+    user = User(email=email, birthyear="2000", sex=True, hashed_password="x")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+    return user
+
+
+def add_audios(session: Session, owner: User, create_dates: list[datetime]) -> None:
+    for i, create_date in enumerate(create_dates):
+        session.add(Audio(owner_id=owner.id, create_date=create_date, text=f"text {i}",
+                          original_filepath="", processed_filepath="", identifier=f"{owner.id}-{i}"))
+    session.commit()
+
+
+def read_all_pages(session: Session, owner_id: int, limit: int, **filters) -> list[list[Audio]]:
+    pages, cursor = [], None
+    while True:
+        audios, cursor = crud.get_audio_page(session=session, owner_id=owner_id, limit=limit, cursor=cursor, **filters)
+        pages.append(audios)
+        if cursor is None:
+            return pages
+
+
+def test_audio_page_cursor_round_trip(session):
+    user = add_user(session, "a@example.com")
+    other = add_user(session, "b@example.com")
+    base = datetime(2024, 1, 1)
+    # 같은 create_date가 페이지 경계에 걸쳐도 id로 이어서 읽어야 한다
+    add_audios(session, user, [base + timedelta(minutes=i // 3) for i in range(25)])
+    add_audios(session, other, [base] * 5)
+
+    pages = read_all_pages(session, user.id, limit=10)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    audios = [audio for page in pages for audio in page]
+    assert len({audio.id for audio in audios}) == 25
+    assert all(audio.owner_id == user.id for audio in audios)
+    keys = [(audio.create_date, audio.id) for audio in audios]
+    assert keys == sorted(keys, reverse=True)
+
+
+def test_audio_page_exact_multiple_has_no_empty_page(session):
+    user = add_user(session, "a@example.com")
+    add_audios(session, user, [datetime(2024, 1, 1) + timedelta(seconds=i) for i in range(20)])
+
+    assert [len(page) for page in read_all_pages(session, user.id, limit=10)] == [10, 10]
+
+
+def test_audio_page_cursor_keeps_filters(session):
+    user = add_user(session, "a@example.com")
+    base = datetime(2024, 1, 1)
+    add_audios(session, user, [base + timedelta(days=i) for i in range(10)])
+
+    pages = read_all_pages(session, user.id, limit=3, start_date=base + timedelta(days=2),
+                           end_date=base + timedelta(days=9))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    dates = [audio.create_date for page in pages for audio in page]
+    assert dates == [base + timedelta(days=i) for i in range(8, 1, -1)]
+
+
+def test_audio_cursor_encoding():
+    audio = Audio(id=42, create_date=datetime(2024, 5, 6, 7, 8, 9, 123456), text="", original_filepath="",
+                  processed_filepath="", identifier="x")
+
+    assert crud.decode_audio_cursor(crud.encode_audio_cursor(audio)) == (audio.create_date, 42)
+    with pytest.raises(ValueError):
+        crud.decode_audio_cursor("not a cursor")
@@ -0,0 +1,76 @@
+import pytest
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from backend.app.utils.media import RangeFileResponse, RangeNotSatisfiable, etag_matches, parse_range
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("bytes=0-99", (0, 99)),
+    ("bytes=10-", (10, 999)),
+    ("bytes=900-5000", (900, 999)),
+    ("bytes=-100", (900, 999)),
+    ("bytes=-5000", (0, 999)),
+    ("bytes=0-0", (0, 0)),
+    ("bytes=0-1,5-6", None),     # 여러 구간은 전체 전송
+    ("items=0-1", None),
+    ("bytes=a-b", None),
+])
+def test_parse_range(header, expected):
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=1000-", "bytes=1000-1001", "bytes=20-10", "bytes=-0"])
+def test_parse_range_not_satisfiable(header):
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 1000)
+
+
+def test_etag_matches():
+    assert etag_matches('"a", W/"b"', '"b"')
+    assert etag_matches("*", '"a"')
+    assert not etag_matches('"a"', '"b"')
+
+
+@pytest.fixture
+def client(tmp_path):
+    content = bytes(range(256)) * 4
+    path = tmp_path / "audio.wav"
+    path.write_bytes(content)
+
+    async def endpoint(request):
+        size = len(content)
+        byte_range = parse_range(request.headers.get("range"), size)
+        if byte_range is None:
+            return RangeFileResponse(str(path), 0, size - 1, size)
+        return RangeFileResponse(str(path), *byte_range, size, status_code=206)
+
+    app = Starlette(routes=[Route("/audio", endpoint, methods=["GET", "HEAD"])])
+    with TestClient(app) as client:
+        yield client, content
+
+
+def test_range_file_response(client):
+    client, content = client
+
+    response = client.get("/audio")
+    assert response.status_code == 200
+    assert response.content == content
+    assert response.headers["content-length"] == str(len(content))
+
+    response = client.get("/audio", headers={"range": "bytes=100-299"})
+    assert response.status_code == 206
+    assert response.content == content[100:300]
+    assert response.headers["content-range"] == f"bytes 100-299/{len(content)}"
+    assert response.headers["content-length"] == "200"
+
+    response = client.get("/audio", headers={"range": "bytes=-10"})
+    assert response.content == content[-10:]
+
+    response = client.head("/audio", headers={"range": "bytes=0-9"})
+    assert response.status_code == 206
+    assert response.content == b""
+    assert response.headers["content-length"] == "10"
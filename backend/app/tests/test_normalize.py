@@ -0,0 +1,39 @@
+import numpy as np
+import pytest
+
+from backend.app.utils.normalize import resample_fft
+
+RATE = 16000
+
+
+@pytest.mark.parametrize("samples, rate, target_rate, expected", [
+    (48000, 48000, 16000, 16000),
+    (44100, 44100, 16000, 16000),
+    (16000, 16000, 48000, 48000),
+    (1001, 44100, 16000, 363),
+    (1, 48000, 16000, 1),
+])
+def test_resample_fft_length(samples, rate, target_rate, expected):
+    assert resample_fft(np.zeros(samples), rate, target_rate).shape == (expected,)
+
+
+def test_resample_fft_stereo():
+    data = np.zeros((4410, 2))
+    data[:, 1] = 0.5
+
+    resampled = resample_fft(data, 44100, 16000)
+
+    assert resampled.shape == (1600, 2)
+    # 채널별로 처리하고 크기(DC)를 유지한다
+    assert np.allclose(resampled[:, 0], 0)
+    assert np.allclose(resampled[:, 1], 0.5)
+
+
+def test_resample_fft_keeps_tone():
+    # 1초에 정수 주기인 톤은 FFT 리샘플링 후에도 그대로 남는다
+    tone = np.sin(2 * np.pi * 440 * np.arange(RATE * 3) / (RATE * 3))
+
+    resampled = resample_fft(tone, RATE * 3, RATE)
+
+    expected = np.sin(2 * np.pi * 440 * np.arange(RATE) / RATE)
+    assert np.max(np.abs(resampled - expected)) < 1e-6
@@ -0,0 +1,105 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from backend.app.core.config import settings
+from backend.app.models import User
+from backend.app.utils import rate_limit
+from backend.app.utils.rate_limit import MemoryBucketStore, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def take(store: MemoryBucketStore, key: str, cost: float = 1, rate: float = 2.0, capacity: float = 3) -> float:
+    return asyncio.run(store.take(key, rate, capacity, cost))
+
+
+def test_token_bucket_burst_then_refill(clock):
+    store = MemoryBucketStore(max_keys=10)
+
+    assert [take(store, "a") for _ in range(3)] == [0.0, 0.0, 0.0]
+    # 비었으면 토큰 하나가 찰 때까지(1 / rate) 기다려야 한다
+    assert take(store, "a") == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert take(store, "a") == 0.0
+    assert take(store, "a") == pytest.approx(0.5)
+
+    # 오래 지나도 capacity 이상 쌓이지 않는다
+    clock.now += 100
+    assert take(store, "a", cost=3) == 0.0
+    assert take(store, "a") == pytest.approx(0.5)
+
+
+def test_token_bucket_cost_and_keys(clock):
+    store = MemoryBucketStore(max_keys=2)
+
+    assert take(store, "a", cost=2) == 0.0
+    assert take(store, "a", cost=2) == pytest.approx(0.5)
+    assert take(store, "b", cost=3) == 0.0
+
+    # max_keys를 넘으면 가장 오래 쓰지 않은 key부터 버린다(다시 가득 찬 버킷으로 시작)
+    take(store, "c")
+    assert set(store._buckets) == {"b", "c"}
+    assert take(store, "a", cost=3) == 0.0
+
+
+def make_request(ip: str = "10.0.0.1") -> Request:
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": [], "client": (ip, 1234)})
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUST_PROXY", False)
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_RATE", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_BURST", 2)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ANON_RATE", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ANON_BURST", 1)
+    monkeypatch.setattr(settings, "RATE_LIMIT_IP_RATE", 1.0)
+    monkeypatch.setattr(settings, "RATE_LIMIT_IP_BURST", 5)
+
+
+def test_rate_limiter_check(clock, limits):
+    limiter = RateLimiter(MemoryBucketStore(max_keys=100))
+    user = User(id=1, email="a@example.com", birthyear="2000", sex=True, hashed_password="x")
+    request = make_request()
+
+    asyncio.run(limiter.check(request, user, cost=2))
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(limiter.check(request, user))
+    assert exc_info.value.status_code == 429
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    # burst보다 큰 요청은 기다려도 통과할 수 없다
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(limiter.check(request, user, cost=3))
+    assert exc_info.value.status_code == 413
+
+    clock.now += 1
+    asyncio.run(limiter.check(request, user))
+
+
+def test_rate_limiter_max_cost(limits, monkeypatch):
+    limiter = RateLimiter(MemoryBucketStore(max_keys=100))
+    user = User(id=1, email="a@example.com", birthyear="2000", sex=True, hashed_password="x")
+
+    assert limiter.max_cost(make_request(), user) == 2
+    assert limiter.max_cost(make_request(), None) == 1
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", False)
+    assert limiter.max_cost(make_request(), user) is None
@@ -0,0 +1,73 @@
+import numpy as np
+
+from backend.app.utils.speech_stream import SpeechSegmenter
+
+RATE = 16000
+
+
+def pcm(seconds: float, amplitude: float = 0.5) -> bytes:
+    t = np.arange(int(seconds * RATE)) / RATE
+    return (np.sin(2 * np.pi * 300 * t) * amplitude * 32767).astype("<i2").tobytes()
+
+
+def silence(seconds: float) -> bytes:
+    return bytes(int(seconds * RATE) * 2)
+
+
+def make_segmenter() -> SpeechSegmenter:
+    return SpeechSegmenter(RATE, min_seconds=1.0, max_seconds=3.0, silence_seconds=0.2, silence_threshold=0.01)
+
+
+def feed_in_chunks(segmenter: SpeechSegmenter, data: bytes, chunk_size: int = 1001) -> list[bytes]:
+    # 홀수 크기 청크로 나눠 넣어도 샘플 경계가 어긋나지 않아야 한다
+    segments = []
+    for i in range(0, len(data), chunk_size):
+        segments += segmenter.feed(data[i:i + chunk_size])
+    return segments
+
+
+def test_segmenter_cuts_at_silence():
+    segmenter = make_segmenter()
+    data = pcm(1.2) + silence(0.2) + pcm(0.5)
+
+    segments = feed_in_chunks(segmenter, data)
+    last = segmenter.flush()
+
+    assert [len(segment) for segment in segments] == [len(pcm(1.2) + silence(0.2))]
+    assert last == pcm(0.5)
+    assert b"".join(segments) + last == data
+
+
+def test_segmenter_short_pause_does_not_cut_before_min_seconds():
+    segmenter = make_segmenter()
+    data = pcm(0.5) + silence(0.2) + pcm(0.5)
+
+    assert feed_in_chunks(segmenter, data) == []
+    assert segmenter.flush() == data
+
+
+def test_segmenter_cuts_at_max_seconds():
+    segmenter = make_segmenter()
+    data = pcm(7.0)
+
+    segments = feed_in_chunks(segmenter, data)
+    last = segmenter.flush()
+
+    assert [len(segment) for segment in segments] == [3 * RATE * 2, 3 * RATE * 2]
+    assert len(last) == RATE * 2
+    assert b"".join(segments) + last == data
+
+
+def test_segmenter_drops_silent_segments():
+    segmenter = make_segmenter()
+
+    assert feed_in_chunks(segmenter, silence(4.0)) == []
+    assert segmenter.flush() is None
+
+
+def test_segmenter_flush_drops_odd_byte():
+    segmenter = make_segmenter()
+    data = pcm(0.5)
+
+    assert segmenter.feed(data + b"\x01") == []
+    assert segmenter.flush() == data
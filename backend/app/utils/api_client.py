@@ -1,24 +1,333 @@
-import requests
+import asyncio
+import io
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+import soundfile as sf
 from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import REGISTRY, Counter
+from backend.app.utils import utils
+
+
+# 일시적인 장애로 보고 재시도할 응답 코드 / 예외
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+RETRYABLE_EXCEPTIONS = (
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    httpx.RemoteProtocolError,
+)
+
+
+class ThreadedStream(httpx.AsyncByteStream):
+    """
+    multipart 본문(httpx가 파일을 동기 read로 읽으며 만든다)을 청크마다 스레드풀에서 읽는 스트림.
+    파일 읽기가 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, stream: httpx.SyncByteStream):
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        iterator = iter(self._stream)
+        while (chunk := await run_in_threadpool(next, iterator, None)) is not None:
+            yield chunk
+
+
+def build_post(client: httpx.AsyncClient, url: str, *, files, data, timeout: httpx.Timeout) -> httpx.Request:
+    request = client.build_request("POST", url, files=files, data=data, timeout=timeout)
+    if files:
+        request.stream = ThreadedStream(request.stream)
+    return request
+
+
+ai_fallback_total = REGISTRY.register(Counter(
+    "eartalk_ai_fallback_total", "Requests served by the in-process fallback instead of the AI server", ("kind",)))
+
+
+class AIServerUnavailable(HTTPException):
+    """
+    AI 서버 장애(circuit open, 연결 실패, 5xx, 타임아웃). fallback 대상
+    """
+
+
+class CircuitBreaker:
+    """
+    최근 window번의 호출 중 실패 비율 또는 느린 호출 비율이 기준을 넘으면 open.
+    open 동안은 AI 서버에 보내지 않고 바로 실패하며, open_seconds가 지나면 half-open으로 한 번만 시험 호출한다.
+    시험 호출이 성공하면 closed, 실패하면 다시 open.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+
+    def __init__(self, *, window: int, min_calls: int, failure_rate: float, slow_call_seconds: float,
+                 slow_call_rate: float, open_seconds: float):
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._calls: deque[tuple[bool, bool]] = deque(maxlen=window)    # (실패, 느림)
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            remaining = self._opened_at + self.open_seconds - time.monotonic()
+            if remaining > 0:
+                raise AIServerUnavailable(status_code=503, detail="AI server is unavailable (circuit open)",
+                                          headers={"Retry-After": str(max(1, round(remaining)))})
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                raise AIServerUnavailable(status_code=503, detail="AI server is unavailable (circuit half-open)",
+                                          headers={"Retry-After": "1"})
+            self._probing = True
+
+    def record(self, failed: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        if self.state == self.HALF_OPEN:
+            self._probing = False
+            if failed or slow:
+                self._open()
+            else:
+                self.state = self.CLOSED
+                self._calls.clear()
+            return
+
+        self._calls.append((failed, slow))
+        if len(self._calls) < self.min_calls:
+            return
+        failures = sum(failed for failed, _ in self._calls) / len(self._calls)
+        slow_calls = sum(slow for _, slow in self._calls) / len(self._calls)
+        if failures >= self.failure_rate or slow_calls >= self.slow_call_rate:
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._calls.clear()
+
+
+class AIClient:
+    """
+    AI 모델 서버용 비동기 클라이언트.
+    keep-alive 커넥션 풀을 공유하고, 동시 요청 수를 제한하며, 일시적 장애는 backoff 후 재시도한다.
+    동시 요청 + 대기 요청이 max_concurrency + max_queued를 넘으면 admit()에서 새 요청을 거절한다.
+    """
+
+    def __init__(
+        self,
+        *,
+        timeout: float,
+        connect_timeout: float,
+        max_connections: int,
+        max_keepalive_connections: int,
+        max_concurrency: int,
+        max_queued: int,
+        max_retries: int,
+        backoff: float,
+        breaker: CircuitBreaker | None = None,
+    ):
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+        self.active = 0     # 처리 중 + 대기 중인 요청 수
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker = breaker
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # 이벤트 루프 안에서 처음 사용할 때 생성
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    def start(self) -> None:
+        # lifespan에서 스레드로 호출: SSL 컨텍스트(인증서 파일 로드)를 포함한 클라이언트 생성이 첫 요청의 이벤트 루프를 막지 않게
+        self.client
+
+    def admit(self) -> None:
+        """
+        AI 서버 쪽 대기열이 이미 가득 차 있으면 작업을 시작하기 전에 429로 거절한다.
+        """
+        if self.active >= self.max_concurrency + self.max_queued:
+            raise HTTPException(status_code=429, detail="요청이 많아 잠시 후 다시 시도해주세요.",
+                                headers={"Retry-After": "2"})
+
+    async def post(self, url: str, *, files=None, data=None, timeout: float | None = None) -> dict:
+        if self.breaker is not None:
+            self.breaker.before_call()
+        self.active += 1
+        start = time.monotonic()
+        failed = True
+        try:
+            result = await self._post(url, files=files, data=data, timeout=timeout)
+            failed = False
+            return result
+        except HTTPException as e:
+            # 4xx는 요청 문제이므로 장애로 세지 않는다
+            failed = e.status_code >= 500
+            raise
+        finally:
+            self.active -= 1
+            if self.breaker is not None:
+                self.breaker.record(failed, time.monotonic() - start)
+
+    async def _post(self, url: str, *, files=None, data=None, timeout: float | None = None) -> dict:
+        client = self.client
+        request_timeout = httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout)
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._semaphore:
+                    response = await client.send(
+                        build_post(client, url, files=files, data=data, timeout=request_timeout))
+            except RETRYABLE_EXCEPTIONS as e:
+                if attempt == self.max_retries:
+                    raise AIServerUnavailable(status_code=503, detail=f"External API call failed: {str(e)}")
+            except httpx.TimeoutException as e:
+                raise AIServerUnavailable(status_code=504, detail=f"External API call timed out: {str(e)}")
+            except httpx.HTTPError as e:
+                raise AIServerUnavailable(status_code=502, detail=f"External API call failed: {str(e)}")
+            else:
+                if response.status_code == 200:
+                    return response.json()
+                if response.status_code >= 500 and (response.status_code not in RETRYABLE_STATUS_CODES
+                                                    or attempt == self.max_retries):
+                    raise AIServerUnavailable(status_code=502,
+                                              detail=f"API call failed with status: {response.status_code}")
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    raise HTTPException(status_code=response.status_code,
+                                        detail=f"API call failed with status: {response.status_code}")
+
+            # exponential backoff + jitter
+            await asyncio.sleep(self.backoff * (2 ** attempt) * (1 + random.random()))
+
+    @asynccontextmanager
+    async def stream(self, url: str, *, files=None, data=None,
+                     timeout: float | None = None) -> AsyncIterator[httpx.Response]:
+        """
+        응답 본문을 받는 대로 읽을 수 있는 POST. 본문을 받기 시작하면 다시 보낼 수 없으므로 재시도하지 않는다.
+        본문을 다 읽을 때까지 동시 요청 슬롯을 점유한다.
+        """
+        if self.breaker is not None:
+            self.breaker.before_call()
+        self.active += 1
+        start = time.monotonic()
+        failed = True
+        recorded = False
+        try:
+            client = self.client
+            request_timeout = httpx.Timeout(timeout or self.timeout, connect=self.connect_timeout)
+            async with self._semaphore:
+                try:
+                    request = build_post(client, url, files=files, data=data, timeout=request_timeout)
+                    response = await client.send(request, stream=True)
+                except httpx.TimeoutException as e:
+                    raise AIServerUnavailable(status_code=504, detail=f"External API call timed out: {str(e)}")
+                except httpx.HTTPError as e:
+                    raise AIServerUnavailable(status_code=502, detail=f"External API call failed: {str(e)}")
+                try:
+                    if response.status_code >= 500:
+                        raise AIServerUnavailable(status_code=502,
+                                                  detail=f"API call failed with status: {response.status_code}")
+                    if response.status_code != 200:
+                        raise HTTPException(status_code=response.status_code,
+                                            detail=f"API call failed with status: {response.status_code}")
+                    # 응답 헤더까지의 시간으로 판단한다(본문 길이는 합성할 텍스트 길이에 비례)
+                    if self.breaker is not None:
+                        self.breaker.record(False, time.monotonic() - start)
+                    recorded = True
+                    yield response
+                finally:
+                    await response.aclose()
+        except HTTPException as e:
+            failed = e.status_code >= 500
+            raise
+        finally:
+            self.active -= 1
+            if self.breaker is not None and not recorded:
+                self.breaker.record(failed, time.monotonic() - start)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+ai_client = AIClient(
+    timeout=settings.AI_REQUEST_TIMEOUT,
+    connect_timeout=settings.AI_CONNECT_TIMEOUT,
+    max_connections=settings.AI_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.AI_MAX_KEEPALIVE_CONNECTIONS,
+    max_concurrency=settings.AI_MAX_CONCURRENCY,
+    max_queued=settings.AI_MAX_QUEUED,
+    max_retries=settings.AI_MAX_RETRIES,
+    backoff=settings.AI_RETRY_BACKOFF,
+    breaker=CircuitBreaker(
+        window=settings.AI_BREAKER_WINDOW,
+        min_calls=settings.AI_BREAKER_MIN_CALLS,
+        failure_rate=settings.AI_BREAKER_FAILURE_RATE,
+        slow_call_seconds=settings.AI_BREAKER_SLOW_CALL_SECONDS,
+        slow_call_rate=settings.AI_BREAKER_SLOW_CALL_RATE,
+        open_seconds=settings.AI_BREAKER_OPEN_SECONDS,
+    ),
+)
+
+
+def _fallback_tts(text: str, output_path: str) -> None:
+    # gTTS는 mp3를 돌려주므로 wav로 바꿔 저장
+    mp3_file = utils.temp_text_to_speech(text).file
+    data, rate = sf.read(io.BytesIO(mp3_file.read()))
+    sf.write(output_path, data, rate, format="WAV")
+
+
+def _fallback_stt(audio_file) -> str:
+    audio_file.seek(0)
+    return utils.temp_speech_to_text(audio_file)
 
 
-def send_tts_request(ai_url, files, data):
+async def send_tts_request(ai_url, files, data, *, timeout: float | None = None):
     try:
-        response = requests.post(f"{ai_url}/tts", files=files, data=data)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=f"API call failed with status: {response.status_code}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"External API call failed: {str(e)}")
+        return await ai_client.post(f"{ai_url}/tts", files=files, data=data, timeout=timeout)
+    except AIServerUnavailable:
+        if not settings.AI_FALLBACK_ENABLED:
+            raise
+    # AI 서버 장애: 목소리 복제 없이 기본 음성으로 대체 (결과에 fallback 표시 -> TTS 캐시에 넣지 않음)
+    ai_fallback_total.inc("tts")
+    await run_in_threadpool(_fallback_tts, data["text"], data["output_path"])
+    return {"file_path": data["output_path"], "fallback": True}
 
 
-def send_stt_tts_request(ai_url, files, data):
+async def send_stt_tts_request(ai_url, files, data, *, timeout: float | None = None):
     try:
-        response = requests.post(f"{ai_url}/stt_tts", files=files, data=data)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise HTTPException(status_code=response.status_code, detail=f"API call failed with status: {response.status_code}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"External API call failed: {str(e)}")
+        return await ai_client.post(f"{ai_url}/stt_tts", files=files, data=data, timeout=timeout)
+    except AIServerUnavailable:
+        if not settings.AI_FALLBACK_ENABLED:
+            raise
+    ai_fallback_total.inc("stt_tts")
+    text = await run_in_threadpool(_fallback_stt, files["file"][1])
+    await run_in_threadpool(_fallback_tts, text, data["output_path"])
+    return {"stt_result": {"text": text}, "tts_result": {"file_path": data["output_path"]}, "fallback": True}
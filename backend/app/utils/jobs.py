@@ -0,0 +1,62 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from backend.app.core.config import settings
+from backend.app.utils.utils import get_logger
+
+
+Job = Callable[[], Awaitable[None]]
+
+
+class JobQueue:
+    """
+    프로세스 내 비동기 작업 큐.
+    고정 개수의 워커 태스크가 큐에서 작업을 꺼내 실행하며, 큐가 가득 차면 submit이 QueueFull을 던진다.
+    stop 때 실행 중인 작업은 취소되고(CancelledError), 아직 시작하지 못한 작업은 on_cancel을 대신 실행한다.
+    """
+
+    def __init__(self, *, workers: int, maxsize: int):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._queue: asyncio.Queue[tuple[Job, Job | None]] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # 실행하지 못하고 남은 작업 정리 (예: 대기 중인 DB 행을 failed로)
+        while self._queue is not None and not self._queue.empty():
+            _, on_cancel = self._queue.get_nowait()
+            if on_cancel is None:
+                continue
+            try:
+                await on_cancel()
+            except Exception:
+                get_logger(__name__).exception("background job cancel handler failed")
+
+    def submit(self, job: Job, on_cancel: Job | None = None) -> None:
+        if self._queue is None:
+            raise RuntimeError("JobQueue is not started")
+        self._queue.put_nowait((job, on_cancel))
+
+    def qsize(self) -> int:
+        return self._queue.qsize() if self._queue else 0
+
+    async def _worker(self) -> None:
+        while True:
+            job, _ = await self._queue.get()
+            try:
+                await job()
+            except Exception:
+                get_logger(__name__).exception("background job failed")
+            finally:
+                self._queue.task_done()
+
+
+audio_jobs = JobQueue(workers=settings.AUDIO_JOB_WORKERS, maxsize=settings.AUDIO_JOB_QUEUE_SIZE)
@@ -0,0 +1,182 @@
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+
+import anyio
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from backend.app.core.config import settings
+from backend.app.utils.cache import TTLCache
+
+# (경로, mtime, 크기) -> 파일 내용 기반 ETag. 파일이 바뀌면 key가 달라지므로 따로 무효화하지 않는다
+etag_cache = TTLCache(maxsize=settings.MEDIA_ETAG_CACHE_MAX_ENTRIES, ttl=settings.MEDIA_CACHE_MAX_AGE)
+
+
+class RangeNotSatisfiable(Exception):
+    pass
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """
+    Range 헤더를 (start, end) (end 포함)로 변환. 없거나 해석할 수 없으면 None(전체 전송).
+    여러 구간 요청(multipart/byteranges)은 지원하지 않고 전체를 보낸다.
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start_text, _, end_text = header[len("bytes="):].strip().partition("-")
+    try:
+        if not start_text:
+            # bytes=-500: 마지막 500 bytes
+            length = int(end_text)
+            if length <= 0:
+                raise RangeNotSatisfiable
+            return max(0, size - length), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or start > end:
+        raise RangeNotSatisfiable
+    return start, min(end, size - 1)
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match는 약한 비교(W/ 무시)
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _hash_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(settings.MEDIA_STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def file_etag(path: str, stat_result: os.stat_result) -> str:
+    """
+    파일 내용의 sha256으로 만든 strong ETag. 한 번 계산하면 (경로, mtime, 크기)로 캐시한다.
+    """
+    key = (path, stat_result.st_mtime_ns, stat_result.st_size)
+    etag = etag_cache.get(key)
+    if etag is None:
+        etag = f'"{(await run_in_threadpool(_hash_file, path))[:32]}"'
+        etag_cache.set(key, etag)
+    return etag
+
+
+def _not_modified(request: Request, etag: str, stat_result: os.stat_result) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        modified = datetime.fromtimestamp(int(stat_result.st_mtime), tz=timezone.utc)
+        return since.tzinfo is not None and modified <= since
+    return False
+
+
+def _accel_redirect_path(path: str) -> str | None:
+    # MEDIA_DIR 아래 파일만 nginx internal location으로 넘길 수 있다
+    try:
+        relative = Path(path).resolve().relative_to(Path(settings.MEDIA_DIR).resolve())
+    except ValueError:
+        return None
+    return settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + relative.as_posix()
+
+
+class RangeFileResponse(Response):
+    """
+    파일의 [start, end] 구간을 전송한다.
+    서버가 지원하면 pathsend / zerocopysend 확장으로 Python이 파일 내용을 읽지 않게 한다.
+    """
+
+    def __init__(self, path: str, start: int, end: int, size: int, status_code: int = 200,
+                 headers: dict | None = None, media_type: str | None = None):
+        headers = dict(headers or {})
+        headers["content-length"] = str(end - start + 1)
+        if status_code == 206:
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+        super().__init__(status_code=status_code, headers=headers, media_type=media_type)
+        self.path = path
+        self.start = start
+        self.end = end
+        self.size = size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if scope["method"] == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        is_full = self.start == 0 and self.end == self.size - 1
+        if is_full and "http.response.pathsend" in extensions:
+            await send({"type": "http.response.pathsend", "path": self.path})
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            if "http.response.zerocopysend" in extensions:
+                await send({"type": "http.response.zerocopysend", "file": f.wrapped,
+                            "offset": self.start, "count": self.end - self.start + 1, "more_body": False})
+                return
+
+            await f.seek(self.start)
+            remaining = self.end - self.start + 1
+            while remaining > 0:
+                chunk = await f.read(min(settings.MEDIA_STREAM_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+async def file_response(request: Request, path: str, media_type: str) -> Response:
+    """
+    Range / 조건부 요청(If-None-Match, If-Modified-Since, If-Range)을 처리하는 파일 응답.
+    MEDIA_ACCEL_REDIRECT_PREFIX가 설정되어 있으면 조건부 요청만 여기서 처리하고 전송은 nginx에 맡긴다.
+    """
+    stat_result = await run_in_threadpool(os.stat, path)
+    etag = await file_etag(path, stat_result)
+    headers = {
+        "etag": etag,
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": f"private, max-age={settings.MEDIA_CACHE_MAX_AGE}",
+        "accept-ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, stat_result):
+        return Response(status_code=304, headers=headers)
+
+    if settings.MEDIA_ACCEL_REDIRECT_PREFIX:
+        accel_path = _accel_redirect_path(path)
+        if accel_path:
+            # Range는 nginx가 처리한다. ETag는 nginx가 자체 값으로 덮어쓰므로 Cache-Control만 넘어간다
+            return Response(headers={**headers, "x-accel-redirect": accel_path}, media_type=media_type)
+
+    size = stat_result.st_size
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    # If-Range가 현재 ETag / Last-Modified와 다르면 구간 대신 전체를 보낸다
+    if size > 0 and (if_range is None or if_range in (etag, headers["last-modified"])):
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except RangeNotSatisfiable:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return RangeFileResponse(path, 0, size - 1, size, headers=headers, media_type=media_type)
+    return RangeFileResponse(path, byte_range[0], byte_range[1], size, status_code=206,
+                             headers=headers, media_type=media_type)
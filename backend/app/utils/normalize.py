@@ -0,0 +1,130 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple
+
+import numpy as np
+import soundfile as sf
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import span
+
+
+class NormalizeResult(NamedTuple):
+    status:             str     # ok, unsupported(soundfile로 읽을 수 없음), empty, too_long
+    input_seconds:      float
+    output_seconds:     float
+
+
+def resample_fft(data: np.ndarray, rate: int, target_rate: int) -> np.ndarray:
+    # 주파수 영역에서 자르거나 0을 채운다: 다운샘플 시 나이퀴스트 위 성분이 접히지 않는다
+    # data: (samples,) 또는 (samples, channels), 채널별로 처리
+    length = max(1, round(len(data) * target_rate / rate))
+    spectrum = np.fft.rfft(data, axis=0)
+    return np.fft.irfft(spectrum[:length // 2 + 1], length, axis=0) * (length / len(data))
+
+
+def voiced_range(data: np.ndarray, rate: int, threshold: float, frame_seconds: float = 0.02) -> tuple[int, int]:
+    """
+    프레임 RMS가 threshold 이상인 첫 프레임 ~ 마지막 프레임의 샘플 범위. 없으면 (0, 0)
+    """
+    frame = max(1, int(rate * frame_seconds))
+    frames = len(data) // frame
+    if frames == 0:
+        return 0, 0
+    rms = np.sqrt(np.mean(data[:frames * frame].reshape(frames, frame) ** 2, axis=1))
+    voiced = np.flatnonzero(rms >= threshold)
+    if len(voiced) == 0:
+        return 0, 0
+    return int(voiced[0]) * frame, min(len(data), (int(voiced[-1]) + 1) * frame)
+
+
+def _warm_up() -> None:
+    # 워커 프로세스에서 이 모듈(과 numpy, soundfile) import까지 끝내 둔다
+    return None
+
+
+def normalize_file(path: str, output_path: str, target_rate: int, threshold: float, padding_seconds: float,
+                   min_seconds: float, max_seconds: float) -> NormalizeResult:
+    """
+    워커 프로세스에서 실행: mono 변환 -> 앞뒤 무음 제거 -> 리샘플 후 PCM16 wav로 output_path에 쓴다(원본은 그대로).
+    예외 대신 status를 돌려준다(soundfile 예외는 프로세스 간에 전달되지 않을 수 있다).
+    """
+    try:
+        data, rate = sf.read(path, dtype="float32", always_2d=True)
+    except (RuntimeError, TypeError):
+        return NormalizeResult("unsupported", 0.0, 0.0)
+    input_seconds = len(data) / rate
+    data = data.mean(axis=1)
+
+    start, end = voiced_range(data, rate, threshold)
+    if end - start < min_seconds * rate:
+        return NormalizeResult("empty", input_seconds, 0.0)
+    padding = int(padding_seconds * rate)
+    data = data[max(0, start - padding):min(len(data), end + padding)]
+    if len(data) > max_seconds * rate:
+        return NormalizeResult("too_long", input_seconds, len(data) / rate)
+
+    if rate != target_rate:
+        data = resample_fft(data, rate, target_rate)
+    data = np.clip(data, -1.0, 1.0)
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        sf.write(tmp_path, data, target_rate, format="WAV", subtype="PCM_16")
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return NormalizeResult("ok", input_seconds, len(data) / target_rate)
+
+
+class AudioNormalizer:
+    """
+    업로드 음성 전처리. CPU 작업이므로 별도 프로세스 풀에서 실행한다(workers=0이면 스레드풀).
+    """
+
+    def __init__(self, *, workers: int):
+        self.workers = workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        if self.workers <= 0:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def start(self) -> None:
+        """
+        워커 프로세스를 미리 띄운다(spawn + import). lifespan에서 호출: 첫 요청이 풀 시작을 기다리지 않게
+        """
+        executor = self._get_executor()
+        if executor is not None:
+            for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+
+    async def normalize(self, path: str, output_path: str) -> NormalizeResult:
+        """
+        path의 음성을 정규화해서 output_path에 쓴다. status가 ok가 아니면 output_path는 만들지 않는다.
+        """
+        loop = asyncio.get_running_loop()
+        with span("normalize"):
+            return await loop.run_in_executor(
+                self._get_executor(), normalize_file, path, output_path,
+                settings.AUDIO_TARGET_SAMPLE_RATE, settings.AUDIO_SILENCE_THRESHOLD,
+                settings.AUDIO_TRIM_PADDING_SECONDS, settings.AUDIO_MIN_SECONDS, settings.AUDIO_MAX_SECONDS)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+audio_normalizer = AudioNormalizer(workers=settings.AUDIO_NORMALIZE_WORKERS)
@@ -0,0 +1,152 @@
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from fastapi import HTTPException
+from starlette.requests import HTTPConnection
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import REGISTRY, Counter
+from backend.app.models import User
+
+rate_limited_total = REGISTRY.register(Counter(
+    "eartalk_rate_limited_total", "Requests rejected with 429", ("scope",)))
+
+
+class BucketStore(Protocol):
+    async def take(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        """
+        토큰 cost개를 꺼낸다. 성공하면 0, 부족하면 다시 시도할 수 있을 때까지의 초
+        """
+
+
+class MemoryBucketStore:
+    """
+    프로세스 내 토큰 버킷. gunicorn 워커별로 따로 센다(워커 수만큼 한도가 늘어남).
+    """
+
+    def __init__(self, *, max_keys: int):
+        self.max_keys = max_keys
+        # key -> [남은 토큰, 마지막 갱신 시각]
+        self._buckets: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def take(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [capacity, now]
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            self._buckets.move_to_end(key)
+
+            bucket[0] = min(capacity, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if bucket[0] >= cost:
+                bucket[0] -= cost
+                return 0.0
+            return (cost - bucket[0]) / rate
+
+
+# 조회 + 충전 + 차감을 한 번에 (여러 워커가 동시에 접근해도 원자적)
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local bucket = redis.call("HMGET", KEYS[1], "tokens", "ts")
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "ts", tostring(now))
+redis.call("EXPIRE", KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Redis 호환 서버에 토큰 버킷을 두어 모든 워커/서버가 한도를 공유한다.
+    client는 redis.asyncio.Redis처럼 eval(script, numkeys, *keys_and_args)를 제공하면 된다.
+    """
+
+    def __init__(self, client, *, prefix: str = "eartalk:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def take(self, key: str, rate: float, capacity: float, cost: float) -> float:
+        wait = await self.client.eval(TOKEN_BUCKET_SCRIPT, 1, self.prefix + key, rate, capacity, time.time(), cost)
+        return float(wait.decode() if isinstance(wait, bytes) else wait)
+
+
+def create_bucket_store() -> BucketStore:
+    if settings.RATE_LIMIT_REDIS_URL:
+        # 선택 의존성: Redis를 쓸 때만 필요
+        from redis import asyncio as redis_asyncio
+        return RedisBucketStore(redis_asyncio.from_url(settings.RATE_LIMIT_REDIS_URL))
+    return MemoryBucketStore(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+def client_ip(connection: HTTPConnection) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        # nginx가 덮어쓰는 X-Real-IP (클라이언트가 보낸 값은 nginx에서 교체됨)
+        real_ip = connection.headers.get("x-real-ip")
+        if real_ip:
+            return real_ip
+    return connection.client.host if connection.client else "unknown"
+
+
+class RateLimiter:
+    """
+    비싼 요청(AI 추론)용 토큰 버킷 제한.
+    로그인 사용자는 user별, 비로그인은 IP별로 다른 한도를 쓰고, IP별 전체 한도는 모두에게 적용한다.
+    """
+
+    def __init__(self, store: BucketStore):
+        self.store = store
+
+    def _limits(self, connection: HTTPConnection, user: User | None) -> list[tuple[str, str, float, int]]:
+        ip = client_ip(connection)
+        limits = [("ip", f"ip:{ip}", settings.RATE_LIMIT_IP_RATE, settings.RATE_LIMIT_IP_BURST)]
+        if user is not None:
+            limits.append(("user", f"user:{user.id}", settings.RATE_LIMIT_USER_RATE, settings.RATE_LIMIT_USER_BURST))
+        else:
+            limits.append(("anonymous", f"anon:{ip}", settings.RATE_LIMIT_ANON_RATE, settings.RATE_LIMIT_ANON_BURST))
+        return limits
+
+    def max_cost(self, connection: HTTPConnection, user: User | None) -> int | None:
+        """
+        한 번에 통과할 수 있는 최대 cost(적용되는 burst 중 가장 작은 값). 요청 제한이 꺼져 있으면 None
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return None
+        return min(burst for _, _, _, burst in self._limits(connection, user))
+
+    async def check(self, connection: HTTPConnection, user: User | None, cost: int = 1) -> None:
+        """
+        한도를 넘으면 429 + Retry-After. cost가 burst보다 크면(한 번에 너무 많은 일괄 요청) 기다려도 통과할 수 없으므로 413
+        """
+        if not settings.RATE_LIMIT_ENABLED:
+            return
+        limits = self._limits(connection, user)
+        max_cost = min(burst for _, _, _, burst in limits)
+        if cost > max_cost:
+            raise HTTPException(status_code=413, detail=f"한 번에 최대 {max_cost}개까지 요청할 수 있습니다.")
+        for scope, key, rate, burst in limits:
+            wait = await self.store.take(key, rate, burst, cost)
+            if wait > 0:
+                rate_limited_total.inc(scope)
+                raise HTTPException(status_code=429, detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                                    headers={"Retry-After": str(math.ceil(wait))})
+
+
+audio_rate_limiter = RateLimiter(create_bucket_store())
@@ -0,0 +1,128 @@
+import hashlib
+import os
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+import anyio
+from sqlmodel import Session, select, col
+from watchfiles import awatch
+
+from backend.app.core.config import settings
+from backend.app.models import Audio, AudioStatus
+from backend.app.utils.cache import TTLCache
+
+
+DEFAULT_REF_FILE_NAMES = tuple(
+    f"REF_{gender}_{age_group}.wav" for gender in ("male", "female") for age_group in ("young", "old")
+)
+
+
+class RefAudio(NamedTuple):
+    content:    bytes
+    digest:     str     # content의 sha256: TTS 캐시 키, AI 서버 voice_id (요청마다 다시 해시하지 않도록 읽을 때 한 번 계산)
+
+    @classmethod
+    def from_bytes(cls, content: bytes) -> "RefAudio":
+        return cls(content, hashlib.sha256(content).hexdigest())
+
+
+class DefaultRefAudioRegistry:
+    """
+    기본 ref 음성(REF_{gender}_{age_group}.wav)을 시작 시 한 번 메모리에 올려두는 읽기 전용 레지스트리.
+    bytes는 불변이므로 요청마다 복사 없이 같은 객체를 공유한다.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._files: Mapping[str, RefAudio] = MappingProxyType({})
+
+    def load(self) -> None:
+        files = {}
+        for file_name in DEFAULT_REF_FILE_NAMES:
+            path = os.path.join(self.directory, file_name)
+            if os.path.exists(path):
+                with open(path, "rb") as file:
+                    files[file_name] = RefAudio.from_bytes(file.read())
+        # 통째로 교체하므로 읽는 쪽은 lock 없이 항상 일관된 스냅샷을 본다
+        self._files = MappingProxyType(files)
+
+    def get(self, gender: str, age_group: str) -> RefAudio:
+        file_name = f"REF_{gender}_{age_group}.wav"
+        content = self._files.get(file_name)
+        if content is None:
+            # 아직 로드되지 않았으면 디스크에서 다시 읽는다
+            self.load()
+            content = self._files.get(file_name)
+            if content is None:
+                raise FileNotFoundError(os.path.join(self.directory, file_name))
+        return content
+
+    async def watch(self) -> None:
+        """
+        디렉토리가 바뀌면 다시 로드한다. lifespan에서 백그라운드 태스크로 실행.
+        """
+        async for _ in awatch(self.directory):
+            self.load()
+
+
+default_ref_audio = DefaultRefAudioRegistry(settings.DEFAULT_REF_AUDIO_DIR)
+
+
+# user_id -> (ref로 쓸 녹음 경로, RefAudio). 녹음이 없으면 (None, None)
+user_ref_audio_cache = TTLCache(
+    maxsize=settings.REF_AUDIO_CACHE_MAX_ENTRIES, ttl=settings.REF_AUDIO_CACHE_TTL,
+    max_weight=settings.REF_AUDIO_CACHE_MAX_BYTES, weigh=lambda value: len(value[1].content) if value[1] else 0,
+)
+
+
+def find_latest_recording(session: Session, user_id: int) -> str | None:
+    # (owner_id, recorded, id) 인덱스로 가장 최근 녹음 한 행만 읽는다
+    statement = (select(Audio.original_filepath)
+                 .where(Audio.owner_id == user_id, Audio.recorded == True, Audio.status == AudioStatus.done)
+                 .order_by(col(Audio.id).desc())
+                 .limit(1))
+    original_filepath = session.exec(statement).first()
+    if original_filepath is not None:
+        # 로컬 사본이 없을 수 있다(S3 저장소): 읽을 때 내려받는다
+        return original_filepath
+
+    # recorded 컬럼이 생기기 전에 만든 행(모두 recorded=False): 최신 몇 개 행에서 실제 파일이 있는 행을 찾는다
+    statement = (select(Audio.original_filepath)
+                 .where(Audio.owner_id == user_id, Audio.status == AudioStatus.done)
+                 .order_by(col(Audio.id).desc())
+                 .limit(settings.REF_AUDIO_LOOKUP_LIMIT))
+    for original_filepath in session.exec(statement):
+        if os.path.exists(original_filepath):
+            return original_filepath
+    return None
+
+
+def get_user_ref_audio(session: Session, user_id: int) -> RefAudio | None:
+    """
+    user의 가장 최근 녹음을 ref 음성으로 반환. 녹음이 없으면 None (기본 ref 사용)
+    """
+    cached = user_ref_audio_cache.get(user_id)
+    if cached is not None:
+        return cached[1]
+
+    ref_audio_path = find_latest_recording(session, user_id)
+    ref_audio = None
+    if ref_audio_path:
+        try:
+            if not os.path.exists(ref_audio_path):
+                # storage -> jobs -> utils -> ref_audio 순환 import를 피해 여기서 import
+                from backend.app.utils.storage import storage
+                # run_in_threadpool의 워커 스레드에서 호출된다: 저장소에서 내려받는 건 이벤트 루프에 맡긴다
+                ref_audio_path = anyio.from_thread.run(storage.ensure_local, ref_audio_path)
+            with open(ref_audio_path, "rb") as file:
+                ref_audio = RefAudio.from_bytes(file.read())
+        except FileNotFoundError:
+            ref_audio_path = None
+    user_ref_audio_cache.set(user_id, (ref_audio_path, ref_audio))
+    return ref_audio
+
+
+def invalidate_user_ref_audio(user_id: int | None) -> None:
+    # 새 녹음이 생기면 호출
+    if user_id is not None:
+        user_ref_audio_cache.invalidate(user_id)
@@ -0,0 +1,122 @@
+import os
+import struct
+
+import numpy as np
+import soundfile as sf
+
+from backend.app.utils.normalize import resample_fft
+
+
+class SpeechSegmenter:
+    """
+    실시간으로 들어오는 PCM16 mono 청크를 말이 끊긴 곳(짧은 무음)에서 구간으로 자른다.
+    구간이 min_seconds 이상이고 끝에 silence_seconds 이상 조용하면 자르고, max_seconds가 되면 무조건 자른다.
+    무음만 있는 구간은 AI 서버로 보내지 않는다.
+    """
+
+    FRAME_SECONDS = 0.02
+
+    def __init__(self, sample_rate: int, *, min_seconds: float, max_seconds: float, silence_seconds: float,
+                 silence_threshold: float):
+        self.sample_rate = sample_rate
+        self.min_bytes = int(min_seconds * sample_rate) * 2
+        self.max_bytes = int(max_seconds * sample_rate) * 2
+        self.frame_bytes = max(1, int(self.FRAME_SECONDS * sample_rate)) * 2
+        self.silence_frames = max(1, round(silence_seconds / self.FRAME_SECONDS))
+        self.silence_threshold = silence_threshold
+        self._pending = bytearray()     # 아직 프레임 단위로 분석하지 않은 바이트
+        self._segment = bytearray()
+        self._silent_frames = 0         # 구간 끝에서부터 연속된 무음 프레임 수
+        self._voiced = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """
+        청크를 추가하고 잘린 구간(PCM16 bytes) 목록을 반환
+        """
+        segments = []
+        self._pending += chunk
+        while len(self._pending) >= self.frame_bytes:
+            frame = self._pending[:self.frame_bytes]
+            del self._pending[:self.frame_bytes]
+            self._segment += frame
+
+            samples = np.frombuffer(frame, dtype="<i2").astype(np.float32) / 32768
+            if np.sqrt(np.mean(samples * samples)) < self.silence_threshold:
+                self._silent_frames += 1
+            else:
+                self._silent_frames = 0
+                self._voiced = True
+
+            if ((len(self._segment) >= self.min_bytes and self._silent_frames >= self.silence_frames)
+                    or len(self._segment) >= self.max_bytes):
+                segment = self._cut()
+                if segment is not None:
+                    segments.append(segment)
+        return segments
+
+    def flush(self) -> bytes | None:
+        """
+        스트림 끝: 남은 구간 반환
+        """
+        # 홀수 바이트(샘플 일부)는 버린다
+        self._segment += self._pending[:len(self._pending) // 2 * 2]
+        self._pending.clear()
+        return self._cut()
+
+    def _cut(self) -> bytes | None:
+        segment = bytes(self._segment) if self._voiced else None
+        self._segment.clear()
+        self._silent_frames = 0
+        self._voiced = False
+        return segment
+
+
+def write_pcm_wav(path: str, pcm: bytes, sample_rate: int) -> None:
+    sf.write(path, np.frombuffer(pcm, dtype="<i2"), sample_rate, format="WAV", subtype="PCM_16")
+
+
+def concat_wav(source_paths: list[str], dest_path: str) -> None:
+    """
+    구간별 처리 결과를 하나의 mono wav로 합친다. 샘플레이트가 다르면 첫 파일에 맞춘다.
+    """
+    parts = []
+    rate = None
+    for path in source_paths:
+        data, part_rate = sf.read(path, dtype="float32")
+        if data.ndim > 1:
+            data = data.mean(axis=1)
+        if rate is None:
+            rate = part_rate
+        elif part_rate != rate:
+            data = np.clip(resample_fft(data, part_rate, rate), -1.0, 1.0)
+        parts.append(data)
+
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    try:
+        sf.write(tmp_path, np.concatenate(parts), rate, format="WAV", subtype="PCM_16")
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def fix_wav_header(path: str) -> None:
+    """
+    스트리밍으로 받은 wav는 헤더의 크기 필드가 비어 있을 수 있으므로(0, 0xFFFFFFFF) 실제 파일 크기로 고친다.
+    """
+    size = os.path.getsize(path)
+    with open(path, "r+b") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            return
+        f.seek(4)
+        f.write(struct.pack("<I", size - 8))
+        offset = 12
+        while offset + 8 <= size:
+            f.seek(offset)
+            chunk_id, chunk_size = struct.unpack("<4sI", f.read(8))
+            if chunk_id == b"data":
+                f.seek(offset + 4)
+                f.write(struct.pack("<I", size - offset - 8))
+                return
+            offset += 8 + chunk_size + (chunk_size & 1)
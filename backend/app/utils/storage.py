@@ -0,0 +1,376 @@
+import asyncio
+import hashlib
+import hmac
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+from typing import AsyncIterator, NamedTuple
+from urllib.parse import quote
+
+import httpx
+from fastapi import UploadFile, HTTPException
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.config import settings
+from backend.app.utils.jobs import audio_jobs
+from backend.app.utils.utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class AudioPaths(NamedTuple):
+    original:   str
+    processed:  str
+
+
+class UploadInfo(NamedTuple):
+    size:   int
+    sha256: str
+
+
+def _tmp_path(path: str) -> str:
+    # 같은 디렉토리의 임시 파일 -> os.replace로 원자적으로 교체
+    return f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+
+
+def _remove_if_exists(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class LocalStorage:
+    """
+    MEDIA_DIR 아래 로컬 디스크 저장소.
+    파일은 identifier(UUID) 앞 4글자로 나눈 디렉토리({root}/ab/cd/{identifier}_...)에 저장해서
+    디렉토리 하나에 파일이 몰리지 않게 하고, 이름이 겹치지 않게 한다.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        # 이미 만든 디렉토리는 다시 mkdir 하지 않는다
+        self._known_dirs: set[Path] = set()
+
+    def _ensure_dir(self, dir_path: Path) -> None:
+        if dir_path not in self._known_dirs:
+            dir_path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(dir_path)
+
+    def media_path(self, relative: str) -> str | None:
+        """
+        /media URL의 상대 경로 -> MEDIA_DIR 아래 파일 경로. MEDIA_DIR 밖을 가리키면(../ 등) None
+        """
+        path = os.path.normpath(self.root / relative)
+        if not Path(path).resolve().is_relative_to(self.root.resolve()):
+            return None
+        return path
+
+    def allocate(self, identifier: str) -> AudioPaths:
+        """
+        새 음성의 원본 / 처리 파일 경로
+        """
+        dir_path = self.root / identifier[:2] / identifier[2:4]
+        self._ensure_dir(dir_path)
+        return AudioPaths(
+            original=str(dir_path / f"{identifier}_original.wav"),
+            processed=str(dir_path / f"{identifier}_processed.wav"),
+        )
+
+    async def save_upload(self, upload: UploadFile, file_path: str, max_bytes: int = None) -> UploadInfo:
+        """
+        업로드 파일을 청크 단위로 임시 파일에 저장하면서 크기와 해시를 계산하고, 다 받으면 rename한다.
+        전체 파일을 메모리에 올리지 않으며, 크기 제한을 넘으면 즉시 중단하고 413.
+        """
+        max_bytes = max_bytes or settings.MAX_UPLOAD_BYTES
+        if upload.size is not None and upload.size > max_bytes:
+            raise HTTPException(status_code=413, detail="파일 크기가 너무 큽니다.")
+
+        size = 0
+        digest = hashlib.sha256()
+        tmp_path = _tmp_path(file_path)
+        # 파일 열기 / 쓰기 / rename / 삭제는 모두 스레드에서 (이벤트 루프를 막지 않게)
+        try:
+            with await run_in_threadpool(open, tmp_path, "wb") as f:
+                while chunk := await upload.read(settings.UPLOAD_CHUNK_SIZE):
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise HTTPException(status_code=413, detail="파일 크기가 너무 큽니다.")
+                    digest.update(chunk)
+                    await run_in_threadpool(f.write, chunk)
+            await run_in_threadpool(os.replace, tmp_path, file_path)
+        finally:
+            await run_in_threadpool(_remove_if_exists, tmp_path)
+        return UploadInfo(size=size, sha256=digest.hexdigest())
+
+    async def persist(self, *paths: str) -> None:
+        # 로컬 디스크가 최종 저장소
+        return None
+
+    async def exists(self, path: str) -> bool:
+        return await run_in_threadpool(os.path.exists, path)
+
+    async def ensure_local(self, path: str) -> str:
+        """
+        로컬에서 읽을 수 있는 경로 반환. 없으면 FileNotFoundError
+        """
+        if not await run_in_threadpool(os.path.exists, path):
+            raise FileNotFoundError(path)
+        return path
+
+    async def delete(self, path: str) -> None:
+        await run_in_threadpool(_remove_if_exists, path)
+
+    def start(self) -> None:
+        return None
+
+    async def aclose(self) -> None:
+        return None
+
+
+async def _iter_file(path: str) -> AsyncIterator[bytes]:
+    with await run_in_threadpool(open, path, "rb") as f:
+        while chunk := await run_in_threadpool(f.read, settings.UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+class S3Client:
+    """
+    S3 호환 저장소(AWS S3, MinIO 등)용 최소 클라이언트. path-style 주소, SigV4 서명.
+    본문 해시는 UNSIGNED-PAYLOAD로 보내 파일을 두 번 읽지 않는다.
+    """
+
+    def __init__(self, *, endpoint_url: str, bucket: str, access_key: str, secret_key: str, region: str):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+        self._client: httpx.AsyncClient | None = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=settings.S3_TIMEOUT)
+        return self._client
+
+    def sign(self, method: str, url: httpx.URL, headers: dict[str, str], now: datetime) -> dict[str, str]:
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = amz_date[:8]
+        headers = {**{key.lower(): value.strip() for key, value in headers.items()},
+                   "host": url.netloc.decode(), "x-amz-date": amz_date}
+        headers.setdefault("x-amz-content-sha256", "UNSIGNED-PAYLOAD")
+
+        signed_headers = ";".join(sorted(headers))
+        canonical_headers = "".join(f"{key}:{headers[key]}\n" for key in sorted(headers))
+        canonical_query = "&".join(
+            f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}" for key, value in sorted(url.params.multi_items()))
+        canonical_request = "\n".join([
+            method, quote(url.path, safe="/-_.~"), canonical_query, canonical_headers, signed_headers,
+            headers["x-amz-content-sha256"],
+        ])
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join([
+            "AWS4-HMAC-SHA256", amz_date, scope, hashlib.sha256(canonical_request.encode()).hexdigest(),
+        ])
+
+        key = f"AWS4{self.secret_key}".encode()
+        for part in (date_stamp, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        headers["authorization"] = (f"AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, "
+                                    f"SignedHeaders={signed_headers}, Signature={signature}")
+        return headers
+
+    def _request(self, method: str, key: str, **kwargs):
+        url = httpx.URL(f"{self.endpoint_url}/{self.bucket}/{quote(key, safe='/-_.~')}")
+        headers = self.sign(method, url, kwargs.pop("headers", {}), datetime.now(timezone.utc))
+        return self.client.build_request(method, url, headers=headers, **kwargs)
+
+    async def put_object(self, key: str, file_path: str, content_type: str = "application/octet-stream") -> None:
+        """
+        file_path를 청크 단위로 읽으면서 업로드한다(파일 전체를 메모리에 올리지 않음).
+        """
+        size = await run_in_threadpool(os.path.getsize, file_path)
+        request = self._request("PUT", key, content=_iter_file(file_path),
+                                headers={"content-type": content_type, "content-length": str(size)})
+        response = await self.client.send(request)
+        response.raise_for_status()
+
+    async def download_object(self, key: str, file_path: str) -> bool:
+        """
+        객체를 file_path로 내려받는다(임시 파일 -> rename). 객체가 없으면 False
+        """
+        response = await self.client.send(self._request("GET", key), stream=True)
+        try:
+            if response.status_code == 404:
+                return False
+            response.raise_for_status()
+            tmp_path = _tmp_path(file_path)
+            try:
+                with await run_in_threadpool(open, tmp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(settings.UPLOAD_CHUNK_SIZE):
+                        await run_in_threadpool(f.write, chunk)
+                await run_in_threadpool(os.replace, tmp_path, file_path)
+            finally:
+                await run_in_threadpool(_remove_if_exists, tmp_path)
+            return True
+        finally:
+            await response.aclose()
+
+    async def head_object(self, key: str) -> bool:
+        response = await self.client.send(self._request("HEAD", key))
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    async def delete_object(self, key: str) -> None:
+        response = await self.client.send(self._request("DELETE", key))
+        if response.status_code != 404:
+            response.raise_for_status()
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class S3Storage(LocalStorage):
+    """
+    S3 호환 저장소. AI 서버가 공유 볼륨의 경로에 결과를 쓰므로 처리 중에는 로컬 파일을 쓰고,
+    처리가 끝나면 MEDIA_DIR 기준 상대 경로를 key로 업로드한다.
+    로컬 파일은 캐시 역할이라 지워져도 읽을 때 다시 내려받는다: 업로드했거나 내려받은 사본은
+    크기 합이 local_cache_max_bytes를 넘으면 가장 오래 쓰지 않은 것부터 지운다.
+    """
+
+    def __init__(self, root: str, client: S3Client, *, local_cache_max_bytes: int):
+        super().__init__(root)
+        self.s3 = client
+        self.local_cache_max_bytes = local_cache_max_bytes
+        # 저장소에 있는 파일의 로컬 사본: 경로 -> 크기 (LRU 순서)
+        self._local_copies: OrderedDict[str, int] = OrderedDict()
+        self._local_bytes = 0
+
+    def _forget_local(self, path: str) -> None:
+        size = self._local_copies.pop(path, None)
+        if size is not None:
+            self._local_bytes -= size
+
+    async def _track_local(self, path: str) -> None:
+        """
+        path를 가장 최근에 쓴 로컬 사본으로 기억하고, 한도를 넘으면 오래된 사본을 지운다.
+        """
+        try:
+            size = await run_in_threadpool(os.path.getsize, path)
+        except OSError:
+            return
+        self._forget_local(path)
+        self._local_copies[path] = size
+        self._local_bytes += size
+        evicted = []
+        # 방금 올리거나 내려받은 path는 호출한 쪽이 바로 읽을 수 있으므로 남긴다
+        while len(self._local_copies) > 1 and self._local_bytes > self.local_cache_max_bytes:
+            old_path, old_size = self._local_copies.popitem(last=False)
+            self._local_bytes -= old_size
+            evicted.append(old_path)
+        for old_path in evicted:
+            await super().delete(old_path)
+
+    def object_key(self, path: str) -> str | None:
+        try:
+            return Path(path).resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            # MEDIA_DIR 밖의 파일(AI 서버가 임의 경로에 쓴 경우 등)은 로컬에만 둔다
+            return None
+
+    async def persist(self, *paths: str) -> None:
+        for path in paths:
+            key = self.object_key(path)
+            if key is None or not await run_in_threadpool(os.path.exists, path):
+                continue
+            await self.s3.put_object(key, path, content_type="audio/wav")
+            await self._track_local(path)
+
+    async def exists(self, path: str) -> bool:
+        if await super().exists(path):
+            return True
+        key = self.object_key(path)
+        return key is not None and await self.s3.head_object(key)
+
+    async def ensure_local(self, path: str) -> str:
+        if await super().exists(path):
+            if path in self._local_copies:
+                self._local_copies.move_to_end(path)
+            return path
+        key = self.object_key(path)
+        if key is None:
+            raise FileNotFoundError(path)
+        await run_in_threadpool(self._ensure_dir, Path(path).parent)
+        if not await self.s3.download_object(key, path):
+            raise FileNotFoundError(path)
+        await self._track_local(path)
+        return path
+
+    async def delete(self, path: str) -> None:
+        self._forget_local(path)
+        await super().delete(path)
+        key = self.object_key(path)
+        if key is not None:
+            await self.s3.delete_object(key)
+
+    def start(self) -> None:
+        # lifespan에서 스레드로 호출: httpx 클라이언트(SSL 컨텍스트)를 미리 만든다
+        self.s3.client
+
+    async def aclose(self) -> None:
+        await self.s3.aclose()
+
+
+def create_storage() -> LocalStorage:
+    if settings.MEDIA_STORAGE == "s3":
+        return S3Storage(settings.MEDIA_DIR, S3Client(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.S3_BUCKET,
+            access_key=settings.S3_ACCESS_KEY,
+            secret_key=settings.S3_SECRET_KEY,
+            region=settings.S3_REGION,
+        ), local_cache_max_bytes=settings.S3_LOCAL_CACHE_MAX_BYTES)
+    return LocalStorage(settings.MEDIA_DIR)
+
+
+storage = create_storage()
+_pending_uploads: set[asyncio.Task] = set()
+
+
+def schedule_persist(*paths: str) -> None:
+    """
+    처리가 끝난 파일을 백그라운드 작업 큐에서 저장소로 올린다(로컬 저장소면 아무것도 하지 않음).
+    """
+    if type(storage) is LocalStorage:
+        return
+    try:
+        audio_jobs.submit(partial(storage.persist, *paths), on_cancel=partial(_persist_on_shutdown, *paths))
+    except (asyncio.QueueFull, RuntimeError):
+        # 큐가 가득 차도 업로드는 건너뛰지 않는다
+        task = asyncio.get_running_loop().create_task(storage.persist(*paths))
+        _pending_uploads.add(task)
+        task.add_done_callback(_pending_uploads.discard)
+
+
+async def _persist_on_shutdown(*paths: str) -> None:
+    # 종료 때 큐에 남은 업로드: 건너뛰면 DB 행이 저장소에 없는 객체를 가리키므로 지금 올린다
+    logger.info(f"uploading {len(paths)} file(s) left in the job queue at shutdown")
+    await storage.persist(*paths)
+
+
+async def wait_pending_uploads() -> None:
+    """
+    큐가 가득 차서 따로 시작한 업로드가 끝날 때까지 기다린다. lifespan 종료 때 호출.
+    """
+    if _pending_uploads:
+        await asyncio.gather(*_pending_uploads, return_exceptions=True)
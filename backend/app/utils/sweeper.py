@@ -0,0 +1,344 @@
+"""
+미디어 파일 / Audio 행 정리 작업.
+
+- 행이 없는 파일(AI 호출 실패 등으로 남은 원본, 탈퇴한 사용자의 파일, 쓰다 남은 임시 파일) 삭제
+- 파일이 없는 done 행, 오래 멈춰 있는 queued/running 행은 failed로 표시
+- 익명(owner_id IS NULL) 음성은 ANONYMOUS_AUDIO_RETENTION_DAYS가 지나면 삭제
+
+한 번에 SWEEP_BATCH_SIZE개씩, 배치마다 짧은 트랜잭션으로 처리하고, 실행당 SWEEP_MAX_BATCHES 배치까지만 진행한다.
+다음 실행은 이전에 멈춘 위치(파일 경로 / 행 id)부터 이어서 한다.
+여러 워커(gunicorn)가 같은 MEDIA_DIR을 쓰므로 MEDIA_DIR/.sweep.lock을 잡은 프로세스 하나만 실행하고,
+멈춘 위치도 이 파일에 저장해서 다음에 어느 워커가 실행하든 이어서 한다. 잡지 못한 워커는 이번 실행을 건너뛴다.
+
+    python -m backend.app.utils.sweeper --dry-run
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import os
+import re
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Iterator
+
+from sqlalchemy import func, delete, update
+from sqlmodel import Session, select, col
+from starlette.concurrency import run_in_threadpool
+
+from backend.app.core.database import engine
+from backend.app.core.config import settings
+from backend.app.models import Audio, AudioStatus
+from backend.app.utils.storage import storage
+from backend.app.utils.transcode import FORMATS
+from backend.app.utils.utils import get_logger
+
+logger = get_logger(__name__)
+
+UUID_FILE_NAME = re.compile(r"^([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})_(original|processed)\.")
+VARIANT_EXTENSIONS = tuple(audio_format.extension for audio_format in FORMATS.values())
+# 이 확장자의 파일만 정리 대상 (그 외 파일은 건드리지 않는다)
+MEDIA_EXTENSIONS = (".wav", ".tmp") + VARIANT_EXTENSIONS
+
+# 보고서에 경로를 모두 담지 않고 앞부분만 예시로 남긴다
+REPORT_SAMPLE_SIZE = 20
+
+
+def walk_files(root: str, after: str | None = None, excluded: frozenset[str] = frozenset()) -> Iterator[os.DirEntry]:
+    """
+    root 아래 파일을 경로 순서대로 돌려준다. after가 있으면 그 경로 다음부터.
+    디렉토리는 이름 뒤에 구분자를 붙여 정렬해서 순회 순서와 경로 문자열 순서를 맞춘다.
+    """
+    try:
+        entries = list(os.scandir(root))
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda entry: entry.name + os.sep if entry.is_dir(follow_symlinks=False) else entry.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.path in excluded:
+                continue
+            if after and entry.path + os.sep < after and not after.startswith(entry.path + os.sep):
+                continue
+            yield from walk_files(entry.path, after, excluded)
+        elif entry.is_file(follow_symlinks=False):
+            if after and entry.path <= after:
+                continue
+            if entry.name.endswith(MEDIA_EXTENSIONS):
+                yield entry
+
+
+def _source_path(path: str) -> str:
+    # 압축 변환 파일(.opus, .mp3)은 같은 이름의 처리된 wav에 딸린 파일
+    if path.endswith(VARIANT_EXTENSIONS):
+        return os.path.splitext(path)[0] + ".wav"
+    return path
+
+
+def find_unreferenced(session: Session, paths: list[str]) -> list[str]:
+    """
+    어떤 Audio 행도 가리키지 않는 파일만 골라낸다.
+    처리된 파일은 TTS 캐시로 여러 행이 공유할 수 있으므로 processed_filepath(인덱스)로 확인하고,
+    원본은 파일 이름의 identifier로, 이전 형식(yyyy/mm/dd/시각)의 원본은 original_filepath로 확인한다.
+    """
+    sources = {path: _source_path(path) for path in paths}
+    referenced = set(session.exec(
+        select(Audio.processed_filepath).where(col(Audio.processed_filepath).in_(set(sources.values())))))
+
+    identifiers = {}
+    legacy_originals = []
+    for path, source in sources.items():
+        if source in referenced or not source.endswith("_original.wav"):
+            continue
+        match = UUID_FILE_NAME.match(os.path.basename(source))
+        if match:
+            identifiers[match.group(1)] = source
+        else:
+            legacy_originals.append(source)
+    if identifiers:
+        referenced.update(identifiers[identifier] for identifier in session.exec(
+            select(Audio.identifier).where(col(Audio.identifier).in_(identifiers))))
+    if legacy_originals:
+        referenced.update(session.exec(
+            select(Audio.original_filepath).where(col(Audio.original_filepath).in_(legacy_originals))))
+
+    return [path for path, source in sources.items() if source not in referenced]
+
+
+async def remove_files(paths: list[str]) -> None:
+    for path in paths:
+        try:
+            await storage.delete(path)
+        except Exception:
+            logger.exception(f"failed to delete media file: {path}")
+
+
+async def remove_unreferenced_files(paths: list[str]) -> None:
+    """
+    행을 지운 뒤 다른 행이 참조하지 않는 파일(+ 압축 변환 파일)을 지운다.
+    """
+    paths = [path for path in paths if path]
+
+    def unreferenced(batch: list[str]) -> list[str]:
+        with Session(engine) as session:
+            return find_unreferenced(session, batch)
+
+    for start in range(0, len(paths), settings.SWEEP_BATCH_SIZE):
+        removable = await run_in_threadpool(unreferenced, paths[start:start + settings.SWEEP_BATCH_SIZE])
+        variants = [os.path.splitext(path)[0] + extension
+                    for path in removable if path.endswith("_processed.wav") for extension in VARIANT_EXTENSIONS]
+        await remove_files(removable + [path for path in variants if os.path.exists(path)])
+
+
+class MediaSweeper:
+    def __init__(self, *, root: str, batch_size: int, max_batches: int, grace_period: float,
+                 anonymous_retention_days: int, stale_job_age: float):
+        self.root = os.path.normpath(root)
+        self.batch_size = batch_size
+        self.max_batches = max_batches
+        self.grace_period = grace_period
+        self.anonymous_retention_days = anonymous_retention_days
+        self.stale_job_age = stale_job_age
+        # MEDIA_DIR 아래에 기본 ref 음성이나 로그를 두는 경우 정리 대상에서 제외
+        self.excluded_dirs = frozenset(
+            os.path.normpath(os.path.join(self.root, path)) for path in (settings.DEFAULT_REF_AUDIO_DIR, settings.LOGFILE_ROOT)
+            if path)
+        # 프로세스 간 잠금 + 다음 실행에서 이어서 시작할 위치 (.wav/.tmp가 아니므로 정리 대상이 아니다)
+        self.lock_path = os.path.join(self.root, ".sweep.lock")
+        self._file_cursor: str | None = None
+        self._row_cursor = 0
+
+    def _lock(self) -> int | None:
+        """
+        잠금 파일을 잡고 저장된 위치를 읽는다. 다른 프로세스가 실행 중이면 None
+        """
+        os.makedirs(self.root, exist_ok=True)
+        fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            state = json.loads(os.pread(fd, 4096, 0) or b"{}")
+        except ValueError:
+            state = {}
+        self._file_cursor = state.get("file_cursor")
+        self._row_cursor = state.get("row_cursor", 0)
+        return fd
+
+    def _unlock(self, fd: int, save: bool) -> None:
+        try:
+            if save:
+                state = json.dumps({"file_cursor": self._file_cursor, "row_cursor": self._row_cursor}).encode()
+                os.ftruncate(fd, 0)
+                os.pwrite(fd, state, 0)
+        finally:
+            os.close(fd)  # close하면 flock도 풀린다
+
+    async def run(self, dry_run: bool = False) -> dict | None:
+        """
+        정리 한 번 실행하고 보고서 반환. 다른 프로세스가 실행 중이면 건너뛰고 None
+        """
+        fd = await run_in_threadpool(self._lock)
+        if fd is None:
+            logger.info("media sweep skipped: another process is sweeping")
+            return None
+        try:
+            report = {"dry_run": dry_run, "started_at": datetime.now().isoformat(timespec="seconds")}
+            report["orphan_files"] = await self.sweep_files(dry_run)
+            report["missing_file_rows"] = await self.sweep_rows(dry_run)
+            report["stale_jobs"] = await run_in_threadpool(self.fail_stale_jobs, dry_run)
+            report["expired_anonymous"] = await self.apply_retention(dry_run)
+        finally:
+            # dry-run은 위치를 저장하지 않는다(실제 정리가 건너뛰지 않도록)
+            await run_in_threadpool(self._unlock, fd, not dry_run)
+        logger.info(f"media sweep: {json.dumps(report, ensure_ascii=False)}")
+        return report
+
+    async def sweep_files(self, dry_run: bool) -> dict:
+        """
+        MEDIA_DIR을 이어서 훑으며 행이 없는 파일을 지운다. 방금 쓰인 파일(grace_period 이내)은 건너뛴다.
+        """
+        result = {"scanned": 0, "count": 0, "bytes": 0, "sample": []}
+        files = walk_files(self.root, self._file_cursor, self.excluded_dirs)
+        cutoff = time.time() - self.grace_period
+
+        for _ in range(self.max_batches):
+            batch = await run_in_threadpool(lambda: list(islice(files, self.batch_size)))
+            if not batch:
+                # 끝까지 훑었으면 다음 실행은 처음부터
+                self._file_cursor = None
+                break
+            self._file_cursor = batch[-1].path
+            result["scanned"] += len(batch)
+
+            candidates = {entry.path: entry.stat(follow_symlinks=False) for entry in batch}
+            candidates = {path: stat for path, stat in candidates.items() if stat.st_mtime < cutoff}
+            # 쓰다 남은 임시 파일은 행과 관계없이 삭제
+            leftovers = [path for path in candidates if path.endswith(".tmp")]
+
+            def unreferenced() -> list[str]:
+                with Session(engine) as session:
+                    return find_unreferenced(session, [path for path in candidates if not path.endswith(".tmp")])
+
+            orphans = leftovers + await run_in_threadpool(unreferenced)
+            result["count"] += len(orphans)
+            result["bytes"] += sum(candidates[path].st_size for path in orphans)
+            result["sample"].extend(orphans[:REPORT_SAMPLE_SIZE - len(result["sample"])])
+            if not dry_run:
+                await remove_files(orphans)
+        return result
+
+    async def sweep_rows(self, dry_run: bool) -> dict:
+        """
+        처리된 파일이 없는 done 행을 failed로 표시 (id 순서로 이어서 확인)
+        """
+        result = {"scanned": 0, "count": 0, "sample": []}
+
+        def next_rows() -> list[tuple[int, str, str]]:
+            with Session(engine) as session:
+                return list(session.exec(
+                    select(Audio.id, Audio.identifier, Audio.processed_filepath)
+                    .where(Audio.id > self._row_cursor, Audio.status == AudioStatus.done)
+                    .order_by(col(Audio.id)).limit(self.batch_size)))
+
+        def mark_failed(ids: list[int]) -> None:
+            with Session(engine) as session:
+                session.execute(update(Audio).where(col(Audio.id).in_(ids)).values(status=AudioStatus.failed))
+                session.commit()
+
+        for _ in range(self.max_batches):
+            rows = await run_in_threadpool(next_rows)
+            if not rows:
+                self._row_cursor = 0
+                break
+            self._row_cursor = rows[-1][0]
+            result["scanned"] += len(rows)
+
+            missing = [(audio_id, identifier) for audio_id, identifier, path in rows if not await storage.exists(path)]
+            result["count"] += len(missing)
+            result["sample"].extend(identifier for _, identifier in missing[:REPORT_SAMPLE_SIZE - len(result["sample"])])
+            if missing and not dry_run:
+                await run_in_threadpool(mark_failed, [audio_id for audio_id, _ in missing])
+        return result
+
+    def fail_stale_jobs(self, dry_run: bool) -> dict:
+        """
+        워커가 죽는 등으로 오래 queued/running 상태인 행을 failed로 표시
+        """
+        cutoff = datetime.now() - timedelta(seconds=self.stale_job_age)
+        condition = (col(Audio.status).in_([AudioStatus.queued, AudioStatus.running]), Audio.create_date < cutoff)
+        with Session(engine) as session:
+            if dry_run:
+                count = session.exec(select(func.count()).select_from(Audio).where(*condition)).one()
+            else:
+                count = session.execute(update(Audio).where(*condition).values(status=AudioStatus.failed)).rowcount
+                session.commit()
+        return {"count": count}
+
+    async def apply_retention(self, dry_run: bool) -> dict:
+        """
+        보관 기간이 지난 익명 음성 행과 파일 삭제
+        """
+        result = {"count": 0, "sample": []}
+        if self.anonymous_retention_days <= 0:
+            return result
+        cutoff = datetime.now() - timedelta(days=self.anonymous_retention_days)
+        last_id = 0
+
+        def next_rows() -> list[tuple[int, str, str, str]]:
+            with Session(engine) as session:
+                return list(session.exec(
+                    select(Audio.id, Audio.identifier, Audio.original_filepath, Audio.processed_filepath)
+                    .where(col(Audio.owner_id).is_(None), Audio.create_date < cutoff, Audio.id > last_id)
+                    .order_by(col(Audio.id)).limit(self.batch_size)))
+
+        def delete_rows(ids: list[int]) -> None:
+            with Session(engine) as session:
+                session.execute(delete(Audio).where(col(Audio.id).in_(ids)))
+                session.commit()
+
+        for _ in range(self.max_batches):
+            rows = await run_in_threadpool(next_rows)
+            if not rows:
+                break
+            last_id = rows[-1][0]
+            result["count"] += len(rows)
+            result["sample"].extend(row[1] for row in rows[:REPORT_SAMPLE_SIZE - len(result["sample"])])
+            if not dry_run:
+                await run_in_threadpool(delete_rows, [row[0] for row in rows])
+                await remove_unreferenced_files([path for row in rows for path in row[2:]])
+        return result
+
+    async def run_forever(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.run()
+            except Exception:
+                logger.exception("media sweep failed")
+
+
+media_sweeper = MediaSweeper(
+    root=settings.MEDIA_DIR,
+    batch_size=settings.SWEEP_BATCH_SIZE,
+    max_batches=settings.SWEEP_MAX_BATCHES,
+    grace_period=settings.SWEEP_GRACE_PERIOD,
+    anonymous_retention_days=settings.ANONYMOUS_AUDIO_RETENTION_DAYS,
+    stale_job_age=settings.SWEEP_STALE_JOB_AGE,
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="미디어 파일 / Audio 행 정리")
+    parser.add_argument("--dry-run", action="store_true", help="지우지 않고 대상만 보고")
+    parser.add_argument("--max-batches", type=int, default=None, help="단계별 최대 배치 수")
+    args = parser.parse_args()
+    if args.max_batches is not None:
+        media_sweeper.max_batches = args.max_batches
+    report = asyncio.run(media_sweeper.run(dry_run=args.dry_run))
+    if report is None:
+        raise SystemExit("다른 프로세스가 정리 중입니다.")
+    print(json.dumps(report, ensure_ascii=False, indent=2))
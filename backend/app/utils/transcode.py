@@ -0,0 +1,212 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+import soundfile as sf
+
+from backend.app.core.config import settings
+from backend.app.core.metrics import span
+from backend.app.utils.jobs import audio_jobs
+from backend.app.utils.normalize import resample_fft
+
+
+class AudioFormat(NamedTuple):
+    format:         str
+    subtype:        str
+    extension:      str
+    media_type:     str
+    sample_rates:   tuple[int, ...]
+
+
+# wav는 원본을 그대로 보낸다
+FORMATS = {
+    "opus": AudioFormat("OGG", "OPUS", ".opus", "audio/ogg", (8000, 12000, 16000, 24000, 48000)),
+    "mp3":  AudioFormat("MP3", "MPEG_LAYER_III", ".mp3", "audio/mpeg",
+                        (8000, 11025, 12000, 16000, 22050, 24000, 32000, 44100, 48000)),
+}
+
+
+def variant_path(source_path: str, fmt: str) -> str:
+    # 원본 옆에 같은 이름, 다른 확장자로 저장 (..._processed.wav -> ..._processed.opus)
+    return str(Path(source_path).with_suffix(FORMATS[fmt].extension))
+
+
+def _transcode(source_path: str, dest_path: str, fmt: str) -> int:
+    """
+    워커 프로세스에서 실행: wav -> fmt 변환 후 파일 크기 반환.
+    임시 파일에 쓰고 rename하므로 다른 요청이 쓰다 만 파일을 읽지 않는다.
+    """
+    audio_format = FORMATS[fmt]
+    data, rate = sf.read(source_path, dtype="float32")
+    if rate not in audio_format.sample_rates:
+        target_rate = min(audio_format.sample_rates, key=lambda candidate: abs(candidate - rate))
+        # 44.1kHz -> 48kHz 등. FFT 리샘플은 경계에서 조금 넘칠 수 있으므로 자른다
+        data, rate = np.clip(resample_fft(data, rate, target_rate), -1.0, 1.0), target_rate
+
+    tmp_path = f"{dest_path}.{os.getpid()}.tmp"
+    try:
+        sf.write(tmp_path, data, rate, format=audio_format.format, subtype=audio_format.subtype)
+        os.replace(tmp_path, dest_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return os.path.getsize(dest_path)
+
+
+def _warm_up() -> None:
+    # 워커 프로세스에서 이 모듈(과 numpy, soundfile) import까지 끝내 둔다
+    return None
+
+
+class VariantCache:
+    """
+    변환된 파일(경로 -> 크기) LRU. 항목 수/크기 합을 넘으면 오래된 변환 파일을 디스크에서 지운다.
+    원본 wav는 건드리지 않는다.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, int] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path: str) -> bool:
+        with self._lock:
+            if path in self._entries and os.path.exists(path):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return True
+            if path in self._entries:
+                self._total_bytes -= self._entries.pop(path)
+        # 재시작 전에 만들어 둔 변환 파일은 그대로 다시 등록
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return False
+        self.put(path, size)
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, path: str, size: int) -> None:
+        evicted = []
+        with self._lock:
+            if path in self._entries:
+                self._total_bytes -= self._entries.pop(path)
+            self._entries[path] = size
+            self._total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                old_path, old_size = self._entries.popitem(last=False)
+                self._total_bytes -= old_size
+                self.evictions += 1
+                evicted.append(old_path)
+        for old_path in evicted:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class Transcoder:
+    """
+    압축 포맷 변환. CPU 작업이므로 별도 프로세스 풀에서 실행하고,
+    같은 파일에 대한 동시 요청은 하나의 변환 작업을 기다린다.
+    """
+
+    def __init__(self, *, workers: int, cache: VariantCache):
+        self.workers = workers
+        self.cache = cache
+        self._executor: ProcessPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    def _get_executor(self) -> ProcessPoolExecutor | None:
+        if self.workers <= 0:
+            return None
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def start(self) -> None:
+        """
+        워커 프로세스를 미리 띄운다(spawn + import). lifespan에서 호출: 첫 요청이 풀 시작을 기다리지 않게
+        """
+        executor = self._get_executor()
+        if executor is not None:
+            for future in [executor.submit(_warm_up) for _ in range(self.workers)]:
+                future.result()
+
+    async def _encode(self, source_path: str, dest_path: str, fmt: str) -> None:
+        loop = asyncio.get_running_loop()
+        with span("transcode"):
+            size = await loop.run_in_executor(self._get_executor(), _transcode, source_path, dest_path, fmt)
+        self.cache.put(dest_path, size)
+
+    async def get_variant(self, source_path: str, fmt: str) -> str:
+        """
+        fmt 변환 파일 경로 반환. 없으면 변환한다.
+        """
+        dest_path = variant_path(source_path, fmt)
+        if self.cache.get(dest_path):
+            return dest_path
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(source_path)
+
+        future = self._inflight.get(dest_path)
+        if future is None:
+            future = asyncio.ensure_future(self._encode(source_path, dest_path, fmt))
+            self._inflight[dest_path] = future
+            future.add_done_callback(lambda _: self._inflight.pop(dest_path, None))
+        # 요청 하나가 취소되어도 변환은 계속해서 다른 요청이 결과를 쓸 수 있게 한다
+        await asyncio.shield(future)
+        return dest_path
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+
+transcoder = Transcoder(
+    workers=settings.TRANSCODE_WORKERS,
+    cache=VariantCache(max_entries=settings.TRANSCODE_CACHE_MAX_ENTRIES,
+                       max_bytes=settings.TRANSCODE_CACHE_MAX_BYTES),
+)
+
+
+def schedule_preencode(source_path: str) -> None:
+    """
+    TRANSCODE_PREENCODE_FORMATS에 지정된 포맷을 백그라운드 작업 큐에서 미리 변환한다.
+    큐가 가득 차 있으면 건너뛰고, 첫 재생 요청 때 변환한다.
+    """
+    for fmt in settings.TRANSCODE_PREENCODE_FORMATS:
+        try:
+            audio_jobs.submit(partial(transcoder.get_variant, source_path, fmt))
+        except (asyncio.QueueFull, RuntimeError):
+            return
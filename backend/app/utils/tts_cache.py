@@ -0,0 +1,80 @@
+import hashlib
+import os
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from backend.app.core.config import settings
+
+
+def normalize_text(text: str) -> str:
+    # 유니코드 정규화(NFC) + 공백 정리
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class TTSCache:
+    """
+    (정규화된 텍스트, ref 음성) -> 이미 합성된 processed wav 경로.
+    파일은 MEDIA_DIR에 그대로 두고 경로만 기억하며, 항목 수/파일 크기 합 기준으로 LRU 제거한다.
+    """
+
+    def __init__(self, *, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(text: str, ref_digest: str) -> str:
+        # ref_digest: ref 음성의 sha256 (RefAudio.digest)
+        text_hash = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+        return f"{text_hash}:{ref_digest}"
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not os.path.exists(entry[0]):
+                # 파일이 지워졌으면 무효
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, file_path: str) -> None:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (file_path, size)
+            self._total_bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: str) -> None:
+        _, size = self._entries.pop(key)
+        self._total_bytes -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+tts_cache = TTSCache(max_entries=settings.TTS_CACHE_MAX_ENTRIES, max_bytes=settings.TTS_CACHE_MAX_BYTES)
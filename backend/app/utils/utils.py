@@ -1,14 +1,18 @@
+import atexit
 import hashlib
 import io
+import json
 import logging
 import logging.handlers
 import os
+import queue
 import secrets
 import string
 import smtplib
+import threading
 import uuid
+from contextvars import ContextVar
 from datetime import datetime
-from pathlib import Path
 
 import speech_recognition as sr
 from fastapi import UploadFile
@@ -19,6 +23,7 @@ from email.message import EmailMessage
 from ssl import create_default_context
 
 from backend.app.models import User
+from backend.app.utils.ref_audio import RefAudio, default_ref_audio
 
 
 def generate_random_string(length: str = 8) -> str:
@@ -36,33 +41,7 @@ def get_hashed_folder_name(id: int) -> str:
     return hashlib.sha256(str(id).encode()).hexdigest()
 
 
-# 저장할 파일 경로 생성
-def create_file_path(create_date: datetime):
-    # 인자로 받은 create_date를 yyyy/mm/dd/hhmmssSSS 형식으로 변환
-    formatted_time = create_date.strftime("%Y/%m/%d/%H%M%S%f")
-
-    # 디렉토리 경로 생성 (yyyy/mm/dd)
-    dir_path = Path(settings.MEDIA_DIR) / "/".join(formatted_time.split("/")[:-1])
-    dir_path.mkdir(parents=True, exist_ok=True)  # 디렉토리 없으면 생성
-
-    # 파일 전체 경로 생성 (원본 파일과 처리된 파일 두 가지)
-    original_file_name = f"{formatted_time}_original.wav"
-    processed_file_name = f"{formatted_time}_processed.wav"
-
-    # 짧은 파일명 생성 (hhmmssSSS)
-    short_original_file_name = f"{create_date.strftime('%H%M%S%f')}_original.wav"
-    short_processed_file_name = f"{create_date.strftime('%H%M%S%f')}_processed.wav"
-
-    # 파일 전체 경로와 짧은 파일명 리턴
-    return {
-        "original_file_path": dir_path / original_file_name,
-        "processed_file_path": dir_path / processed_file_name,
-        "short_original_file_name": short_original_file_name,
-        "short_processed_file_name": short_processed_file_name
-    }
-
-
-def get_default_ref_audio(user: User) -> bytes:
+def get_default_ref_audio(user: User) -> RefAudio:
     current_year = datetime.now().year
     birth_year = int(user.birthyear)  # 문자열을 정수로 변환
     age = current_year - birth_year
@@ -70,11 +49,8 @@ def get_default_ref_audio(user: User) -> bytes:
     age_group = "young" if age <= 29 else "old"
     gender = "male" if user.sex else "female"
 
-    full_file_path = os.path.join(settings.DEFAULT_REF_AUDIO_DIR, f"REF_{gender}_{age_group}.wav")
-
-    with open(full_file_path, "rb") as file:
-        file_content = file.read()
-    return file_content  # 파일 내용을 반환 (바이너리 데이터)
+    # 시작 시 메모리에 올려둔 기본 ref 음성 (디스크 I/O 없음)
+    return default_ref_audio.get(gender, age_group)
 
 
 def temp_speech_to_text(audio) -> str:
@@ -124,48 +100,120 @@ def send_email_for_password(*, receiver_email: str, new_password: str) -> None:
         server.send_message(msg)  # 메시지 전송
 
 
-def get_logger(name=None):
-    # 현재 날짜에 해당하는 폴더 경로 생성
-    date_str = datetime.now().strftime("%Y%m%d")
-    log_dir = os.path.join(settings.LOGFILE_ROOT, date_str)
+# 요청별 ID (RequestIDMiddleware에서 설정). 로그 레코드에 함께 남긴다
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
 
-    # 폴더가 없으면 생성
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener: logging.handlers.QueueListener | None = None
+_log_listener_lock = threading.Lock()
 
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.INFO)
 
-    # 핸들러가 중복으로 추가되지 않도록 확인
-    if not logger.hasHandlers():
-        # log format
-        formatter = logging.Formatter("%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - %(message)s")
+class RequestIDFilter(logging.Filter):
+    # 로그를 남기는 스레드에서 request_id를 레코드에 복사 (listener 스레드에는 contextvar가 없음)
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
 
-        # log 파일에 기록 (일별 생성)
-        console = logging.StreamHandler()
-        timedfilehandler_info = logging.handlers.TimedRotatingFileHandler(
-            filename=os.path.join(log_dir, "apiLog_info_{:%Y%m%d}.log".format(datetime.now())),
-            when="midnight", interval=1, encoding="utf-8")
-        timedfilehandler_error = logging.handlers.TimedRotatingFileHandler(
-            filename=os.path.join(log_dir, "apiLog_error_{:%Y%m%d}.log".format(datetime.now())),
-            when="midnight", interval=1, encoding="utf-8")
 
-        timedfilehandler_info.setFormatter(formatter)
-        timedfilehandler_error.setFormatter(formatter)
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time":         datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level":        record.levelname,
+            "logger":       record.name,
+            "location":     f"{record.filename}:{record.lineno}",
+            "request_id":   getattr(record, "request_id", "-"),
+            "message":      record.getMessage(),
+        }
+        return json.dumps(data, ensure_ascii=False)
+
+
+class DailyFileHandler(logging.Handler):
+    """
+    LOGFILE_ROOT/yyyymmdd/apiLog_{kind}_yyyymmdd.log 에 기록.
+    레코드 시각 기준으로 날짜가 바뀌면 새 폴더/파일로 넘어간다. listener 스레드에서만 호출된다.
+    """
+
+    def __init__(self, root: str, kind: str, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.root = root
+        self.kind = kind
+        self._date_str = None
+        self._stream = None
+
+    def _open(self, date_str: str) -> None:
+        if self._stream:
+            self._stream.close()
+        log_dir = os.path.join(self.root, date_str)
+        os.makedirs(log_dir, exist_ok=True)
+        self._stream = open(os.path.join(log_dir, f"apiLog_{self.kind}_{date_str}.log"), "a", encoding="utf-8")
+        self._date_str = date_str
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            date_str = datetime.fromtimestamp(record.created).strftime("%Y%m%d")
+            if date_str != self._date_str:
+                self._open(date_str)
+            self._stream.write(self.format(record) + "\n")
+            self._stream.flush()
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        super().close()
+
+
+def _start_log_listener() -> None:
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
 
-        # level 설정
+        console = logging.StreamHandler()
         console.setLevel(logging.INFO)
-        timedfilehandler_info.setLevel(logging.INFO)
-        timedfilehandler_error.setLevel(logging.ERROR)
+        console.setFormatter(logging.Formatter(
+            "%(asctime)s - %(levelname)s - [%(filename)s:%(lineno)d] - [%(request_id)s] - %(message)s"))
+
+        # 실제 파일 쓰기는 listener 스레드에서만 일어난다
+        info_handler = DailyFileHandler(settings.LOGFILE_ROOT, "info", logging.INFO)
+        error_handler = DailyFileHandler(settings.LOGFILE_ROOT, "error", logging.ERROR)
+        info_handler.setFormatter(JSONFormatter())
+        error_handler.setFormatter(JSONFormatter())
 
-        # format
-        console.setFormatter(formatter)
-        timedfilehandler_info.setFormatter(formatter)
-        timedfilehandler_error.setFormatter(formatter)
+        _log_listener = logging.handlers.QueueListener(
+            _log_queue, console, info_handler, error_handler, respect_handler_level=True)
+        _log_listener.start()
+        atexit.register(stop_log_listener)
 
-        # add handler
-        logger.addHandler(console)
-        logger.addHandler(timedfilehandler_info)
-        logger.addHandler(timedfilehandler_error)
 
-    return logger
\ No newline at end of file
+def stop_log_listener() -> None:
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            # 큐에 남은 레코드를 모두 기록한 뒤 종료
+            _log_listener.stop()
+            for handler in _log_listener.handlers:
+                handler.close()
+            _log_listener = None
+
+
+def get_logger(name=None):
+    """
+    요청 스레드는 큐에 넣기만 하고, 콘솔/파일 기록은 백그라운드 listener 스레드가 한다.
+    """
+    _start_log_listener()
+
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+
+    # 핸들러가 중복으로 추가되지 않도록 확인
+    if not any(isinstance(handler, logging.handlers.QueueHandler) for handler in logger.handlers):
+        queue_handler = logging.handlers.QueueHandler(_log_queue)
+        queue_handler.addFilter(RequestIDFilter())
+        logger.addHandler(queue_handler)
+        logger.propagate = False
+
+    return logger
@@ -0,0 +1,124 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException
+
+from backend.app.core.config import settings
+from backend.app.utils.api_client import AIServerUnavailable, ai_client
+from backend.app.utils.ref_audio import RefAudio
+from backend.app.utils.utils import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+# AI 서버 /voices가 없을 때의 응답
+UNSUPPORTED_STATUS_CODES = {404, 405, 501}
+# /tts에 보낸 voice_id를 AI 서버가 지운 경우(재등록 필요)
+VOICE_GONE_STATUS_CODE = 410
+
+
+class VoiceRegistry:
+    """
+    ref 음성 -> AI 서버에 등록된 voice_id.
+    voice_id는 ref 내용의 sha256이므로 같은 ref는 어느 워커에서 등록해도 같은 id가 되고, 등록은 멱등이다.
+    AI 서버가 voice_id를 지웠으면(410) 다시 등록하고 한 번 더 보낸다.
+    /voices가 없다는 응답을 받으면 retry_seconds 동안은 파일을 보내고, 그 뒤 다시 등록해 본다
+    (AI 서버가 backend보다 늦게 배포되었거나 일시적인 라우팅 오류일 수 있다).
+    """
+
+    def __init__(self, *, max_entries: int, retry_seconds: float):
+        self.max_entries = max_entries
+        self.retry_seconds = retry_seconds
+        self.supported: bool | None = None  # 마지막 등록 시도 결과
+        self._unsupported_until = 0.0      # time.monotonic() 기준
+        self.hits = 0
+        self.misses = 0
+        self.reregistrations = 0
+        self._registered: OrderedDict[str, None] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    async def _register(self, ref_audio: RefAudio) -> str | None:
+        voice_id = ref_audio.digest
+        try:
+            await ai_client.post(f"{settings.AI_REQUEST_URL}/voices",
+                                 files={'file': ('ref.wav', ref_audio.content, 'audio/wav')}, data={'voice_id': voice_id})
+        except HTTPException as e:
+            if e.status_code not in UNSUPPORTED_STATUS_CODES:
+                raise
+            logger.info(f"AI server does not support /voices, sending ref audio for {self.retry_seconds:g}s")
+            self.supported = False
+            self._unsupported_until = time.monotonic() + self.retry_seconds
+            return None
+        self.supported = True
+        with self._lock:
+            self._registered[voice_id] = None
+            while len(self._registered) > self.max_entries:
+                self._registered.popitem(last=False)
+        return voice_id
+
+    async def ensure(self, ref_audio: RefAudio) -> str | None:
+        """
+        ref를 등록하고 voice_id(= ref_audio.digest) 반환. 등록을 쓸 수 없으면 None (파일을 보내야 함)
+        """
+        if not settings.VOICE_REGISTRY_ENABLED or time.monotonic() < self._unsupported_until:
+            return None
+        voice_id = ref_audio.digest
+        with self._lock:
+            if voice_id in self._registered:
+                self._registered.move_to_end(voice_id)
+                self.hits += 1
+                return voice_id
+            self.misses += 1
+
+        # 같은 ref에 대한 동시 등록은 하나만 보낸다
+        future = self._inflight.get(voice_id)
+        if future is None:
+            future = asyncio.ensure_future(self._register(ref_audio))
+            self._inflight[voice_id] = future
+            future.add_done_callback(lambda _: self._inflight.pop(voice_id, None))
+        return await asyncio.shield(future)
+
+    def forget(self, voice_id: str) -> None:
+        with self._lock:
+            self._registered.pop(voice_id, None)
+
+    async def send(self, ref_audio: RefAudio, request: Callable[[dict | None, dict], Awaitable[T]]) -> T:
+        """
+        request(files, ref_data)로 TTS 요청. 등록된 ref면 files=None, ref_data={"voice_id"}, 아니면 ref 파일을 보낸다.
+        """
+        try:
+            voice_id = await self.ensure(ref_audio)
+        except AIServerUnavailable:
+            # 등록 실패는 파일을 보내는 요청에 맡긴다(fallback 처리 포함)
+            voice_id = None
+        if voice_id is not None:
+            try:
+                return await request(None, {'voice_id': voice_id})
+            except HTTPException as e:
+                if e.status_code != VOICE_GONE_STATUS_CODE:
+                    raise
+            # AI 서버가 ref를 지웠다: 다시 등록하고 한 번 더
+            self.forget(voice_id)
+            self.reregistrations += 1
+            voice_id = await self.ensure(ref_audio)
+            if voice_id is not None:
+                return await request(None, {'voice_id': voice_id})
+        return await request({'file': ('ref.wav', ref_audio.content, 'audio/wav')}, {})
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._registered),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reregistrations": self.reregistrations,
+            }
+
+
+voice_registry = VoiceRegistry(max_entries=settings.VOICE_REGISTRY_MAX_ENTRIES,
+                               retry_seconds=settings.VOICE_REGISTRY_RETRY_SECONDS)
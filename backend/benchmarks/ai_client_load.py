@@ -0,0 +1,94 @@
+"""
+AI 서버 클라이언트 부하 테스트.
+
+로컬 대역 서버(fake_ai_server)를 띄우고, 기존 방식(async 핸들러 안에서 blocking requests.post)과
+AIClient(비동기 + 커넥션 풀) 방식의 처리량과 이벤트 루프 지연을 비교한다.
+
+    python -m backend.benchmarks.ai_client_load --requests 200 --concurrency 32
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import threading
+import time
+
+import requests
+import uvicorn
+
+from backend.app.utils.api_client import AIClient
+from backend.benchmarks.fake_ai_server import app as fake_app
+
+
+def start_fake_server(port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(fake_app, port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    # 이벤트 루프가 막히면 sleep이 예정보다 늦게 깨어난다
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(name: str, call, total: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop))
+
+    async def one(i: int):
+        async with semaphore:
+            await call(i)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    lag = await lag_task
+    print(f"{name:<10} {total / elapsed:8.1f} req/s   total {elapsed:6.2f}s   max loop lag {lag * 1000:8.1f}ms")
+
+
+async def main(args) -> None:
+    url = f"http://127.0.0.1:{args.port}"
+    output_dir = tempfile.mkdtemp()
+
+    def payload(i: int):
+        files = {"file": ("ref.wav", b"\x00" * 1024, "audio/wav")}
+        data = {"text": "안녕하세요", "output_path": os.path.join(output_dir, f"{i}.wav")}
+        return files, data
+
+    async def blocking_call(i: int):
+        files, data = payload(i)
+        requests.post(f"{url}/tts", files=files, data=data).json()
+
+    client = AIClient(
+        timeout=30, connect_timeout=5, max_connections=args.concurrency,
+        max_keepalive_connections=args.concurrency, max_concurrency=args.concurrency, max_queued=args.requests,
+        max_retries=2, backoff=0.1,
+    )
+
+    async def async_call(i: int):
+        files, data = payload(i)
+        await client.post(f"{url}/tts", files=files, data=data)
+
+    await run("blocking", blocking_call, args.requests, args.concurrency)
+    await run("async", async_call, args.requests, args.concurrency)
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    start_fake_server(args.port)
+    asyncio.run(main(args))
@@ -0,0 +1,162 @@
+"""
+동시성 벤치마크.
+
+AI 서버 대역(fake_ai_server)을 띄우고, /audio 요청(텍스트 TTS, 음성 업로드 STT+TTS)이 몰리는 동안
+가벼운 요청(/users/me)의 지연과 이벤트 루프 지연이 요청이 없을 때와 비슷하게 유지되는지 확인한다.
+async 라우트 안의 DB/파일 작업이 이벤트 루프를 막으면 /users/me p99와 loop lag가 크게 늘어난다.
+임시 SQLite DB를 쓰므로 별도 설정 없이 실행할 수 있고, --db-latency로 원격 DB(MySQL)의 왕복 지연을 흉내 낸다.
+
+    python -m backend.benchmarks.concurrency_bench --audios 200 --concurrency 16 --db-latency 0.005
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+for key in ("MEDIA_DIR", "LOGFILE_ROOT", "DEFAULT_REF_AUDIO_DIR"):
+    os.environ.setdefault(key, TMP_DIR)
+for key in ("SECRET_KEY", "SMTP_SERVER", "SENDER_EMAIL", "SENDER_PASSWORD", "AI_REQUEST_URL", "MEDIA_URL"):
+    os.environ.setdefault(key, "bench")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def make_wav(seconds: float = 1.0, rate: int = 16000) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        # 무음이면 전처리에서 거절되므로 440Hz 톤
+        f.writeframes((np.sin(np.arange(int(rate * seconds)) * 2 * np.pi * 440 / rate) * 8000).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+
+async def measure_loop_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - start - interval)
+    return worst
+
+
+async def run(client, headers: dict, audios: int, concurrency: int, duration: float) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    me_latencies, audio_latencies, statuses = [], [], []
+    done = asyncio.Event()
+    upload = make_wav()
+
+    async def create_audio(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            if i % 2:
+                response = await client.post("/api/audio", headers=headers, data={"input_text": f"안녕하세요 {i}"})
+            else:
+                response = await client.post("/api/audio", headers=headers,
+                                             files={"audio": ("bench.wav", upload, "audio/wav")})
+            audio_latencies.append(time.perf_counter() - start)
+            statuses.append(response.status_code)
+
+    async def me():
+        while not done.is_set():
+            start = time.perf_counter()
+            response = await client.get("/api/users/me", headers=headers)
+            me_latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+            await asyncio.sleep(0.01)
+
+    lag_task = asyncio.create_task(measure_loop_lag(done))
+    me_task = asyncio.create_task(me())
+    start = time.perf_counter()
+    if audios:
+        await asyncio.gather(*(create_audio(i) for i in range(audios)))
+    else:
+        await asyncio.sleep(duration)
+    elapsed = time.perf_counter() - start
+    done.set()
+    await me_task
+    return {
+        "elapsed": elapsed,
+        "me": me_latencies,
+        "audio": audio_latencies,
+        "errors": sum(status != 200 for status in statuses),
+        "lag": await lag_task,
+    }
+
+
+async def main(args) -> None:
+    import httpx
+    from sqlalchemy import event
+    from sqlmodel import SQLModel
+
+    from backend.app.core.config import settings
+    from backend.app.core.database import engine
+    from backend.app.main import app
+    from backend.app.utils.api_client import ai_client
+    from backend.app.utils.ref_audio import DEFAULT_REF_FILE_NAMES, default_ref_audio
+
+    for file_name in DEFAULT_REF_FILE_NAMES:
+        with open(os.path.join(settings.DEFAULT_REF_AUDIO_DIR, file_name), "wb") as f:
+            f.write(make_wav())
+    default_ref_audio.load()
+    settings.AI_REQUEST_URL = f"http://127.0.0.1:{args.port}"
+    settings.RATE_LIMIT_ENABLED = False
+    ai_client.max_queued = args.audios
+
+    SQLModel.metadata.create_all(engine)
+    if args.db_latency:
+        event.listen(engine, "before_cursor_execute", lambda *_: time.sleep(args.db_latency))
+    transport = httpx.ASGITransport(app=app)
+    # 실제 서버처럼 lifespan(프로세스 풀 시작, 작업 큐 등)을 실행한다
+    async with app.router.lifespan_context(app), \
+            httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await client.post("/api/users/signup", json={
+            "email": "bench@example.com", "password": "password1", "verify_password": "password1",
+            "birthyear": "1990", "sex": True,
+        })
+        response = await client.post("/api/login/access-token",
+                                     data={"username": "bench@example.com", "password": "password1"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        idle = await run(client, headers, 0, args.concurrency, args.idle_seconds)
+        loaded = await run(client, headers, args.audios, args.concurrency, 0)
+
+        for name, result in (("idle", idle), ("audio", loaded)):
+            line = (f"{name:<6} /users/me p50 {statistics.median(result['me']) * 1000:7.1f}ms  "
+                    f"p99 {percentile(result['me'], 0.99) * 1000:7.1f}ms  "
+                    f"max loop lag {result['lag'] * 1000:7.1f}ms")
+            if result["audio"]:
+                line += (f"  /audio {len(result['audio']) / result['elapsed']:6.1f}/s  "
+                         f"p50 {statistics.median(result['audio']) * 1000:7.1f}ms  errors {result['errors']}")
+            print(line)
+
+
+
+if __name__ == "__main__":
+    from backend.benchmarks.fake_ai_server import start_in_subprocess
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--audios", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--idle-seconds", type=float, default=2.0)
+    parser.add_argument("--db-latency", type=float, default=0.005)
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    fake_server = start_in_subprocess(args.port)
+    try:
+        asyncio.run(main(args))
+    finally:
+        fake_server.terminate()
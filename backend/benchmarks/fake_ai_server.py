@@ -0,0 +1,111 @@
+"""
+부하 테스트용 AI 모델 서버 대역(stand-in).
+
+실제 GPU 추론 대신 FAKE_AI_LATENCY 초만큼 기다린 뒤 짧은 무음 wav를 output_path에 기록한다.
+/tts에 stream=true를 보내면 파일 대신 wav를 조금씩 나눠 chunked 응답으로 보낸다.
+FAKE_AI_LATENCY_PER_MB를 주면 /stt_tts, /tts는 업로드 크기에 비례해 더 기다린다(전송 + 추론 시간 흉내).
+POST /voices로 ref 음성을 등록하면 /tts에 파일 대신 voice_id를 보낼 수 있다.
+등록된 음성은 FAKE_AI_MAX_VOICES개까지 보관하고, 지워진(모르는) voice_id에는 410을 돌려준다.
+
+    uvicorn backend.benchmarks.fake_ai_server:app --port 9000
+"""
+import asyncio
+import os
+import socket
+import struct
+import subprocess
+import sys
+import time
+import wave
+from collections import OrderedDict
+from typing import Annotated
+
+from fastapi import FastAPI, File, Form, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
+
+FAKE_AI_LATENCY = float(os.getenv("FAKE_AI_LATENCY", "0.2"))
+FAKE_AI_LATENCY_PER_MB = float(os.getenv("FAKE_AI_LATENCY_PER_MB", "0"))
+FAKE_AI_MAX_VOICES = int(os.getenv("FAKE_AI_MAX_VOICES", "1000"))
+SAMPLE_RATE = 22050
+
+app = FastAPI()
+voices: OrderedDict[str, bytes] = OrderedDict()
+
+
+def write_silence(path: str, seconds: float = 0.5) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(b"\x00\x00" * int(SAMPLE_RATE * seconds))
+
+
+async def stream_silence(seconds: float = 0.5, chunks: int = 5):
+    # 전체 길이를 모르는 스트리밍 wav: 크기 필드는 0xFFFFFFFF
+    yield (b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+           + b"fmt " + struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+           + b"data" + struct.pack("<I", 0xFFFFFFFF))
+    for _ in range(chunks):
+        await asyncio.sleep(FAKE_AI_LATENCY / chunks)
+        yield b"\x00\x00" * int(SAMPLE_RATE * seconds / chunks)
+
+
+@app.post("/tts")
+async def tts(
+    text:           Annotated[str, Form()],
+    output_path:    Annotated[str, Form()],
+    file:           Annotated[UploadFile | None, File()] = None,
+    voice_id:       Annotated[str | None, Form()] = None,
+    stream:         Annotated[bool, Form()] = False,
+):
+    if voice_id is not None:
+        if voice_id not in voices:
+            raise HTTPException(status_code=410, detail="unknown voice_id")
+        voices.move_to_end(voice_id)
+    elif file is not None:
+        content = await file.read()
+        await asyncio.sleep(len(content) / 1024 / 1024 * FAKE_AI_LATENCY_PER_MB)
+    if stream:
+        return StreamingResponse(stream_silence(), media_type="audio/wav")
+    await asyncio.sleep(FAKE_AI_LATENCY)
+    write_silence(output_path)
+    return {"file_path": output_path}
+
+
+@app.post("/voices")
+async def register_voice(
+    voice_id:       Annotated[str, Form()],
+    file:           Annotated[UploadFile, File()],
+):
+    content = await file.read()
+    await asyncio.sleep(len(content) / 1024 / 1024 * FAKE_AI_LATENCY_PER_MB)
+    voices[voice_id] = content
+    while len(voices) > FAKE_AI_MAX_VOICES:
+        voices.popitem(last=False)
+    return {"voice_id": voice_id}
+
+
+@app.post("/stt_tts")
+async def stt_tts(
+    output_path:    Annotated[str, Form()],
+    file:           Annotated[UploadFile, File()],
+):
+    content = await file.read()
+    await asyncio.sleep(FAKE_AI_LATENCY + len(content) / 1024 / 1024 * FAKE_AI_LATENCY_PER_MB)
+    write_silence(output_path)
+    return {"stt_result": {"text": "안녕하세요"}, "tts_result": {"file_path": output_path}}
+
+
+def start_in_subprocess(port: int) -> subprocess.Popen:
+    """
+    벤치마크용: 별도 프로세스로 띄운다(같은 프로세스의 스레드로 띄우면 GIL을 나눠 써서 측정이 흔들린다).
+    """
+    process = subprocess.Popen([sys.executable, "-m", "uvicorn", "backend.benchmarks.fake_ai_server:app",
+                                "--port", str(port), "--log-level", "warning"])
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return process
+        except OSError:
+            time.sleep(0.05)
@@ -0,0 +1,49 @@
+"""
+S3 호환 저장소 대역(stand-in). MEDIA_STORAGE=s3 동작을 로컬에서 확인할 때 사용한다.
+
+path-style PUT / GET / HEAD / DELETE만 지원하고, 객체는 FAKE_S3_DIR 아래 파일로 저장한다.
+서명은 검증하지 않고 SigV4 Authorization 헤더가 있는지만 확인한다.
+
+    FAKE_S3_DIR=/tmp/fake-s3 uvicorn backend.benchmarks.fake_s3_server:app --port 9100
+    MEDIA_STORAGE=s3 S3_ENDPOINT_URL=http://127.0.0.1:9100 S3_BUCKET=eartalk S3_ACCESS_KEY=x S3_SECRET_KEY=y
+"""
+import os
+from pathlib import Path
+
+from fastapi import FastAPI, HTTPException, Request, Response
+from starlette.responses import FileResponse
+
+FAKE_S3_DIR = Path(os.getenv("FAKE_S3_DIR", "/tmp/fake-s3"))
+
+app = FastAPI()
+
+
+def object_path(request: Request, bucket: str, key: str) -> Path:
+    if not request.headers.get("authorization", "").startswith("AWS4-HMAC-SHA256 "):
+        raise HTTPException(status_code=403, detail="AccessDenied")
+    path = (FAKE_S3_DIR / bucket / key).resolve()
+    if not path.is_relative_to(FAKE_S3_DIR.resolve()):
+        raise HTTPException(status_code=400, detail="InvalidKey")
+    return path
+
+
+@app.put("/{bucket}/{key:path}")
+async def put_object(request: Request, bucket: str, key: str):
+    path = object_path(request, bucket, key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(await request.body())
+    return Response(status_code=200)
+
+
+@app.api_route("/{bucket}/{key:path}", methods=["GET", "HEAD"])
+async def get_object(request: Request, bucket: str, key: str):
+    path = object_path(request, bucket, key)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail="NoSuchKey")
+    return FileResponse(path)
+
+
+@app.delete("/{bucket}/{key:path}")
+async def delete_object(request: Request, bucket: str, key: str):
+    object_path(request, bucket, key).unlink(missing_ok=True)
+    return Response(status_code=204)
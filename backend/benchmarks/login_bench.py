@@ -0,0 +1,95 @@
+"""
+로그인 지연 벤치마크.
+
+bcrypt를 요청 스레드에서 바로 실행할 때(PASSWORD_HASH_WORKERS=0)와 프로세스 풀에서 실행할 때의
+로그인 p50/p99와, 로그인 폭주 중 가벼운 요청(/users/me)의 지연을 비교한다.
+임시 SQLite DB를 쓰므로 별도 설정 없이 실행할 수 있다.
+
+    python -m backend.benchmarks.login_bench --logins 200 --concurrency 50 --workers 4
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+for key in ("MEDIA_DIR", "LOGFILE_ROOT", "DEFAULT_REF_AUDIO_DIR"):
+    os.environ.setdefault(key, TMP_DIR)
+for key in ("SECRET_KEY", "SMTP_SERVER", "SENDER_EMAIL", "SENDER_PASSWORD", "AI_REQUEST_URL", "MEDIA_URL"):
+    os.environ.setdefault(key, "bench")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+async def run(client, token: str, logins: int, concurrency: int) -> tuple[list[float], list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    login_latencies, me_latencies = [], []
+    done = asyncio.Event()
+
+    async def login():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/login/access-token",
+                                         data={"username": "bench@example.com", "password": "password1"})
+            login_latencies.append(time.perf_counter() - start)
+            assert response.status_code in (200, 503), response.text
+
+    async def me():
+        while not done.is_set():
+            start = time.perf_counter()
+            await client.get("/api/users/me", headers={"Authorization": f"Bearer {token}"})
+            me_latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(0.01)
+
+    me_task = asyncio.create_task(me())
+    await asyncio.gather(*(login() for _ in range(logins)))
+    done.set()
+    await me_task
+    return login_latencies, me_latencies
+
+
+async def main(args) -> None:
+    import httpx
+    from sqlmodel import SQLModel
+
+    from backend.app.core import security
+    from backend.app.core.config import settings
+    from backend.app.core.database import engine
+    from backend.app.main import app
+
+    SQLModel.metadata.create_all(engine)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/users/signup", json={
+            "email": "bench@example.com", "password": "password1", "verify_password": "password1",
+            "birthyear": "1990", "sex": True,
+        })
+        response = await client.post("/api/login/access-token",
+                                     data={"username": "bench@example.com", "password": "password1"})
+        token = response.json()["access_token"]
+
+        for name, workers in (("inline", 0), ("pool", args.workers)):
+            settings.PASSWORD_HASH_WORKERS = workers
+            start = time.perf_counter()
+            login_latencies, me_latencies = await run(client, token, args.logins, args.concurrency)
+            elapsed = time.perf_counter() - start
+            print(f"{name:<7} logins {args.logins / elapsed:6.1f}/s  "
+                  f"login p50 {statistics.median(login_latencies) * 1000:7.1f}ms  "
+                  f"p99 {percentile(login_latencies, 0.99) * 1000:7.1f}ms  "
+                  f"/users/me p99 {percentile(me_latencies, 0.99) * 1000:7.1f}ms")
+
+    security.shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    asyncio.run(main(parser.parse_args()))
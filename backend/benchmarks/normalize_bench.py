@@ -0,0 +1,129 @@
+"""
+업로드 음성 전처리 벤치마크.
+
+브라우저 녹음과 비슷한 음성(48kHz stereo, 앞뒤 무음)을 POST /audio로 올려
+전처리를 끈 경우와 켠 경우의 AI 서버로 보내는 크기와 요청 지연(p50/p99)을 비교한다.
+AI 서버 대역은 업로드 크기에 비례해 더 기다린다(--latency-per-mb, 전송 + 추론 시간 흉내).
+임시 SQLite DB를 쓰므로 별도 설정 없이 실행할 수 있다.
+
+    python -m backend.benchmarks.normalize_bench --uploads 100 --concurrency 8 --workers 2
+"""
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import soundfile as sf
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+for key in ("MEDIA_DIR", "LOGFILE_ROOT", "DEFAULT_REF_AUDIO_DIR"):
+    os.environ.setdefault(key, TMP_DIR)
+for key in ("SECRET_KEY", "SMTP_SERVER", "SENDER_EMAIL", "SENDER_PASSWORD", "AI_REQUEST_URL", "MEDIA_URL"):
+    os.environ.setdefault(key, "bench")
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def make_recording(seconds: float, rate: int = 48000, silence: float = 1.0) -> bytes:
+    # 말소리 대신 진폭이 변하는 잡음 + 앞뒤 무음, stereo
+    rng = np.random.default_rng(0)
+    speech = rng.normal(0, 0.1, int(rate * seconds)) * np.abs(np.sin(np.linspace(0, 20, int(rate * seconds))))
+    data = np.concatenate([np.zeros(int(rate * silence)), speech, np.zeros(int(rate * silence))])
+    buffer = io.BytesIO()
+    sf.write(buffer, np.stack([data, data], axis=1), rate, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+async def run(client, headers: dict, upload: bytes, uploads: int, concurrency: int,
+              sent_bytes: list[int]) -> list[float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.post("/api/audio", headers=headers,
+                                         files={"audio": ("recording.wav", upload, "audio/wav")})
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+
+    await asyncio.gather(*(one() for _ in range(uploads)))
+    return latencies
+
+
+async def main(args) -> None:
+    import httpx
+    from sqlmodel import SQLModel
+
+    from backend.app.core import security
+    from backend.app.core.config import settings
+    from backend.app.core.database import engine
+    from backend.app.main import app
+    from backend.app.utils.api_client import ai_client
+    from backend.app.utils.normalize import audio_normalizer
+
+    settings.AI_REQUEST_URL = f"http://127.0.0.1:{args.port}"
+    # AI 서버로 보낸 파일 크기 (전처리를 켜면 정규화된 임시 파일, 끄면 원본)
+    sent_bytes = []
+    post = ai_client.post
+
+    async def measured_post(url, *, files=None, **kwargs):
+        if files:
+            sent_bytes.append(os.fstat(files["file"][1].fileno()).st_size)
+        return await post(url, files=files, **kwargs)
+
+    ai_client.post = measured_post
+    settings.RATE_LIMIT_ENABLED = False
+    ai_client.max_queued = args.uploads
+    audio_normalizer.workers = args.workers
+
+    SQLModel.metadata.create_all(engine)
+    upload = make_recording(args.seconds)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        await client.post("/api/users/signup", json={
+            "email": "bench@example.com", "password": "password1", "verify_password": "password1",
+            "birthyear": "1990", "sex": True,
+        })
+        response = await client.post("/api/login/access-token",
+                                     data={"username": "bench@example.com", "password": "password1"})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        for name, enabled in (("raw", False), ("normalized", True)):
+            settings.AUDIO_NORMALIZE_ENABLED = enabled
+            sent_bytes.clear()
+            latencies = await run(client, headers, upload, args.uploads, args.concurrency, sent_bytes)
+            print(f"{name:<11} upload {len(upload) / 1024:7.1f}KB  sent to AI {statistics.mean(sent_bytes) / 1024:7.1f}KB  "
+                  f"p50 {statistics.median(latencies) * 1000:7.1f}ms  p99 {percentile(latencies, 0.99) * 1000:7.1f}ms")
+
+    await ai_client.aclose()
+    audio_normalizer.shutdown()
+    security.shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    from backend.benchmarks.fake_ai_server import start_in_subprocess
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uploads", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--latency-per-mb", type=float, default=0.5)
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+
+    os.environ["FAKE_AI_LATENCY_PER_MB"] = str(args.latency_per_mb)
+    fake_server = start_in_subprocess(args.port)
+    try:
+        asyncio.run(main(args))
+    finally:
+        fake_server.terminate()
@@ -0,0 +1,99 @@
+"""
+녹음 내역 텍스트 검색 벤치마크.
+
+한 사용자에게 --rows개, 다른 사용자들에게 --other-rows개의 문장을 넣고
+전문 검색(GET /users/me/audios/search)과 기존 목록의 q 필터(LIKE '%q%')의 지연(p50/p99)을 비교한다.
+목록의 q 필터는 최신순으로 20개를 찾으면 멈추므로 흔한 단어에서 빠르지만, 드물거나 없는 단어는 사용자의 행을 모두 읽는다.
+임시 SQLite DB(FTS5)를 쓰므로 별도 설정 없이 실행할 수 있다.
+
+    python -m backend.benchmarks.search_bench --rows 5000 --other-rows 50000
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+TMP_DIR = tempfile.mkdtemp()
+os.environ["SQLALCHEMY_DATABASE_URL"] = f"sqlite:///{TMP_DIR}/bench.db"
+for key in ("MEDIA_DIR", "LOGFILE_ROOT", "DEFAULT_REF_AUDIO_DIR"):
+    os.environ.setdefault(key, TMP_DIR)
+for key in ("SECRET_KEY", "SMTP_SERVER", "SENDER_EMAIL", "SENDER_PASSWORD", "AI_REQUEST_URL", "MEDIA_URL"):
+    os.environ.setdefault(key, "bench")
+
+
+def make_vocabulary(size: int, rng: random.Random) -> list[str]:
+    # 2~4음절 단어. 실제 발화처럼 앞쪽 단어일수록 자주 나온다(Zipf)
+    return ["".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4))) for _ in range(size)]
+
+
+def percentile(values: list[float], p: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def sentences(count: int, owner_id: int, vocabulary: list[str], weights: list[float],
+              rng: random.Random) -> list[dict]:
+    start = datetime(2024, 1, 1)
+    return [{
+        "text": " ".join(rng.choices(vocabulary, weights, k=rng.randint(2, 8))),
+        "original_filepath": "", "processed_filepath": "",
+        "identifier": f"{owner_id}-{i}", "owner_id": owner_id, "create_date": start + timedelta(minutes=i),
+        "status": "done",
+    } for i in range(count)]
+
+
+def main(args) -> None:
+    from sqlmodel import Session, SQLModel
+
+    from backend.app import crud
+    from backend.app.core.database import engine
+    from backend.app.models import User
+
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(0)
+    vocabulary = make_vocabulary(args.vocabulary, rng)
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    # 흔한 단어 ~ 드문 단어, 두 단어, 없는 단어
+    queries = {
+        "common": vocabulary[0], "mid": vocabulary[50], "rare": vocabulary[-1],
+        "two words": f"{vocabulary[3]} {vocabulary[7]}", "no match": "없는말입니다",
+    }
+    with Session(engine) as session:
+        users = [User(email=f"bench{i}@example.com", birthyear="1990", sex=True, hashed_password="x")
+                 for i in range(args.other_users + 1)]
+        session.add_all(users)
+        session.commit()
+        user_ids = [user.id for user in users]
+        crud.bulk_create_audios(session=session, rows=sentences(args.rows, user_ids[0], vocabulary, weights, rng))
+        per_user = args.other_rows // max(1, args.other_users)
+        for owner_id in user_ids[1:]:
+            crud.bulk_create_audios(session=session, rows=sentences(per_user, owner_id, vocabulary, weights, rng))
+
+        search = {
+            "search": lambda q: crud.search_audios(session=session, owner_id=user_ids[0], q=q, limit=20),
+            "like": lambda q: crud.get_audio_page(session=session, owner_id=user_ids[0], limit=20, q=q),
+        }
+        for label, q in queries.items():
+            line = f"{label:<10}"
+            for name, run in search.items():
+                latencies = []
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    run(q)
+                    latencies.append(time.perf_counter() - start)
+                line += (f"  {name} p50 {statistics.median(latencies) * 1000:6.2f}ms "
+                         f"p99 {percentile(latencies, 0.99) * 1000:6.2f}ms")
+            print(line)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--other-rows", type=int, default=50000)
+    parser.add_argument("--other-users", type=int, default=100)
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=50)
+    main(parser.parse_args())
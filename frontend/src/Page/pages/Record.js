@@ -4,56 +4,61 @@ import logo from '../URL/EarTalkLOGO.png';
 import '../css/Record.css';
 import { AuthContext } from '../../App';
 
+const PAGE_SIZE = 8;
+
 const Record = () => {
   const { isAuthenticated } = useContext(AuthContext);
-  const [wavFiles, setWavFiles] = useState([]);
   const [visibleFiles, setVisibleFiles] = useState([]);
-  const [showMore, setShowMore] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
   const navigate = useNavigate();
   const currentAudioRef = useRef(null); 
 
+  const fetchPage = (cursor) => {
+    const params = new URLSearchParams({ limit: PAGE_SIZE });
+    if (cursor) {
+      params.set("cursor", cursor);
+    }
+    fetch(`api/users/me/audios?${params}`, {
+      method: "GET",
+      headers: {
+        Authorization: `Bearer ${sessionStorage.getItem("authToken")}`,
+      },
+    })
+      .then((response) => {
+        if (response.status === 403) {
+          navigate('/Login');
+          throw new Error('토큰이 유효하지 않음');
+        }
+        return response.json();
+      })
+      .then((data) => {
+        if (data && data.data) {
+          const files = data.data.map(file => ({
+            name: file.original_filepath,
+            text: file.text || "텍스트가 없습니다.",
+            date: new Date(file.created_at).toLocaleDateString(),
+            url: file.processed_filepath
+          }));
+          setVisibleFiles(prevFiles => (cursor ? [...prevFiles, ...files] : files));
+          setNextCursor(data.next_cursor);
+        } else {
+          console.error("Failed to load audio files");
+        }
+      })
+      .catch((error) => console.error("Error:", error));
+  };
+
   useEffect(() => {
     if (!isAuthenticated) {
       navigate("/login");
     } else {
-      fetch("api/users/me/audios", {
-        method: "GET",
-        headers: {
-          Authorization: `Bearer ${sessionStorage.getItem("authToken")}`,
-        },
-      })
-        .then((response) => {
-          if (response.status === 403) {
-            navigate('/Login');
-            throw new Error('토큰이 유효하지 않음');
-          }
-          return response.json();
-        })
-        .then((data) => {
-          if (data && data.data) {
-            const files = data.data.map(file => ({
-              name: file.original_filepath,
-              text: file.text || "텍스트가 없습니다.",
-              date: new Date(file.created_at).toLocaleDateString(),
-              url: file.processed_filepath
-            }));
-            setWavFiles(files);
-            setVisibleFiles(files.slice(0, 8));
-          } else {
-            console.error("Failed to load audio files");
-          }
-        })
-        .catch((error) => console.error("Error:", error));
+      fetchPage(null);
     }
   }, [isAuthenticated, navigate]);
 
   const handleShowMore = () => {
-    const nextFiles = wavFiles.slice(visibleFiles.length, visibleFiles.length + 8);
-    setVisibleFiles(prevFiles => [...prevFiles, ...nextFiles]);
-
-    if (visibleFiles.length + nextFiles.length >= wavFiles.length) {
-      setShowMore(false);
-    }
+    // 서버에서 다음 페이지를 이어서 불러온다
+    fetchPage(nextCursor);
   };
 
   const handleLogoClick = () => {
@@ -95,7 +100,7 @@ const Record = () => {
         ) : (
           <p className="no-files">녹음된 파일이 없습니다.</p>
         )}
-        {showMore && visibleFiles.length < wavFiles.length && (
+        {nextCursor && (
           <button className="show-more-button" onClick={handleShowMore}>
             더보기
           </button>